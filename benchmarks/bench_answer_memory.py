@@ -0,0 +1,69 @@
+"""Compare the memory held by query results as dictionaries and as an AnswerTable.
+
+Answers are generated locally, so no server is needed. Run from the repository root:
+
+    $ python -m benchmarks.bench_answer_memory --answers 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import concept_pb2
+from concept_pb2 import Concept, ConceptId
+from grakn.client import _AnswerTableBuilder, _parse_page
+from grakn_pb2 import Answer, QueryResult
+
+
+def make_page(answers: int, distinct_attributes: int) -> Tuple[List[QueryResult], Dict[str, str], Dict[str, Any]]:
+    """Make answers of the form `$p isa $t, has name $n`, with the labels and values of their concepts"""
+    results = []
+    for i in range(answers):
+        answer = Answer(answer={
+            'p': Concept(id=ConceptId(value=f'V{i}'), baseType=concept_pb2.Entity),
+            't': Concept(id=ConceptId(value='T1'), baseType=concept_pb2.EntityType),
+            'n': Concept(id=ConceptId(value=f'A{i % distinct_attributes}'), baseType=concept_pb2.Attribute),
+        })
+        results.append(QueryResult(answer=answer))
+
+    labels = {'T1': 'person'}
+    values = {f'A{i}': f'name-{i}' for i in range(distinct_attributes)}
+    return results, labels, values
+
+
+def measure(parse: Callable[[], Any]) -> Tuple[int, float]:
+    """Return the bytes still allocated by the parsed result, and the seconds taken to parse it"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    parsed = parse()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return size, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--answers', type=int, default=100000, help='number of answers to parse')
+    parser.add_argument('--distinct-attributes', type=int, default=1000, help='number of distinct attribute values')
+    args = parser.parse_args()
+
+    results, labels, values = make_page(args.answers, args.distinct_attributes)
+
+    def parse_compact() -> Any:
+        builder = _AnswerTableBuilder()
+        return builder.table(builder.parse_page(results, labels, values))
+
+    dicts_size, dicts_time = measure(lambda: _parse_page(results, labels, values))
+    compact_size, compact_time = measure(parse_compact)
+
+    for name, size, elapsed in [('dicts', dicts_size, dicts_time), ('compact', compact_size, compact_time)]:
+        print(f'{name:<8} {size / 2 ** 20:8.1f}MiB {size / args.answers:8.1f}B/answer {elapsed:8.3f}s')
+    print(f'compact results use {compact_size / dicts_size:.0%} of the memory of dicts')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Compare the request stream behind each transaction against the previous multiprocessing implementation.
+
+Run from the repository root:
+
+    $ python -m benchmarks.bench_blocking_iter --count 100000
+"""
+import argparse
+import threading
+import time
+from multiprocessing import Queue
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+
+from grakn.blocking_iter import BlockingIter
+
+T = TypeVar('T')
+
+
+class MultiprocessingBlockingIter(Generic[T]):
+    """The original `BlockingIter`, backed by a `multiprocessing.Queue`"""
+
+    def __init__(self) -> None:
+        self._queue: Queue[Optional[T]] = Queue()
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        elem = self._queue.get(block=True)
+        if elem is None:
+            raise StopIteration()
+        else:
+            return elem
+
+    def add(self, elem: T) -> None:
+        self._queue.put(elem)
+
+    def close(self) -> None:
+        self._queue.put(None)
+
+
+def _make_request() -> Any:
+    try:
+        from grakn_pb2 import TxRequest, ExecQuery, Query
+    except ImportError:
+        # generated protobuf modules are not available, so measure with an equivalent sized payload
+        return b'match $x isa person; get;' * 4
+    return TxRequest(execQuery=ExecQuery(query=Query(value='match $x isa person; get;')))
+
+
+def run(make_iter: Callable[[], Any], count: int) -> float:
+    """Time `count` elements passing from a producer thread to a consumer thread
+
+    :return: the elapsed wall time in seconds
+    """
+    elems = make_iter()
+    request = _make_request()
+
+    def produce() -> None:
+        for _ in range(count):
+            elems.add(request)
+        elems.close()
+
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce)
+    producer.start()
+    consumed = sum(1 for _ in elems)
+    producer.join()
+    elapsed = time.perf_counter() - start
+
+    assert consumed == count
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000, help='number of requests to pass through each stream')
+    parser.add_argument('--maxsize', type=int, default=1024, help='capacity of the bounded stream')
+    args = parser.parse_args()
+
+    implementations = [
+        ('multiprocessing', MultiprocessingBlockingIter),
+        ('threaded', BlockingIter),
+        (f'threaded (maxsize={args.maxsize})', lambda: BlockingIter(args.maxsize)),
+    ]
+
+    baseline = None
+    for name, make_iter in implementations:
+        elapsed = run(make_iter, args.count)
+        baseline = baseline or elapsed
+        per_request = elapsed / args.count * 1e6
+        print(f'{name:<32} {elapsed:8.3f}s {per_request:8.2f}us/request {baseline / elapsed:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare the throughput of streaming large results with and without compression.
+
+The synthetic engine runs in this process, so no Grakn server is needed. Run from the repository root:
+
+    $ python -m benchmarks.bench_compression --answers 20000 --value-size 1000
+
+Each answer has an entity, its type and an attribute whose value is at least `--value-size` characters. The engine
+compresses its responses and the client its requests with each algorithm in turn. Over loopback, compression only
+costs CPU time, so it shows the overhead; the saving in bytes is what matters over a slower network.
+"""
+import argparse
+import statistics
+import time
+
+import grakn
+from benchmarks.engine import RESOLUTION_HEAVY, SyntheticEngine
+from grakn.channel import ChannelOptions
+from grakn.instrumentation import Stats
+
+
+def stream(client: grakn.Client, answers: int, page_size: int, prefetch: int) -> float:
+    """Return the seconds taken to stream the answers to one query, with the values of their attributes"""
+    start = time.perf_counter()
+    query = f'match $x isa person, has name $n; limit {answers}; get;'
+    for _ in client.execute_iter(query, page_size=page_size, prefetch=prefetch):
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--answers', type=int, default=20000, help='number of answers to stream')
+    parser.add_argument('--value-size', type=int, default=1000, help='least characters in each attribute value')
+    parser.add_argument('--page-size', type=int, default=1000, help='answers received before resolving concepts')
+    parser.add_argument('--prefetch', type=int, default=32, help='answers requested ahead of receiving them')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each algorithm, of which the median is kept')
+    parser.add_argument('--port', type=int, default=48557, help='port for the synthetic engine')
+    args = parser.parse_args()
+
+    baseline = None
+
+    for compression in (None, 'gzip', 'deflate'):
+        with SyntheticEngine(args.port, answer_mix=RESOLUTION_HEAVY, compression=compression,
+                             value_size=args.value_size) as engine:
+            stats = Stats()
+            client = grakn.Client(uri=engine.uri, keyspace='benchmark', listener=stats,
+                                  channel_options=ChannelOptions(compression=compression))
+            seconds = statistics.median(stream(client, args.answers, args.page_size, args.prefetch)
+                                        for _ in range(args.repeat))
+
+        response_bytes = sum(stage['response_bytes'] for stage in stats.summary().values()) / args.repeat
+        rate = args.answers / seconds
+        baseline = baseline or rate
+        print(f'{compression or "none":<8} {rate:>12,.0f} answers/s {seconds:8.3f}s {rate / baseline - 1:+8.1%} '
+              f'{response_bytes / 2 ** 20:8.1f}MiB uncompressed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare threads that each open a transaction with threads that share one multiplexed transaction.
+
+The synthetic engine runs in this process, so no Grakn server is needed. Run from the repository root:
+
+    $ python -m benchmarks.bench_multiplex --threads 16 --latency 0.002
+
+Each thread runs `--queries` short read queries. With a transaction per thread, every thread opens its own stream and
+waits for its Open round trip; a multiplexed transaction opens one stream, which all the threads share.
+"""
+import argparse
+import statistics
+import time
+from concurrent import futures
+
+import grakn
+from benchmarks.engine import RESOLUTION_HEAVY, SyntheticEngine
+
+_QUERY = 'match $x isa person, has name $n; limit 5; get;'
+
+
+def per_thread(client: grakn.Client, threads: int, queries: int) -> float:
+    def work(_: int) -> None:
+        with client.open(tx_type='read') as tx:
+            for _ in range(queries):
+                tx.execute(_QUERY)
+
+    start = time.perf_counter()
+    with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, range(threads)))
+    return time.perf_counter() - start
+
+
+def multiplexed(client: grakn.Client, threads: int, queries: int) -> float:
+    start = time.perf_counter()
+    with client.open(tx_type='read', multiplexed=True) as tx:
+        def work(_: int) -> None:
+            for _ in range(queries):
+                tx.execute(_QUERY)
+
+        with futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(work, range(threads)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16, help='threads running queries at once')
+    parser.add_argument('--queries', type=int, default=20, help='queries run by each thread')
+    parser.add_argument('--latency', type=float, default=0.002, help='seconds the engine takes to answer a request')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each mode, of which the median is kept')
+    parser.add_argument('--port', type=int, default=48557, help='port for the synthetic engine')
+    args = parser.parse_args()
+
+    with SyntheticEngine(args.port, latency=args.latency, answer_mix=RESOLUTION_HEAVY) as engine:
+        client = grakn.Client(uri=engine.uri, keyspace='benchmark')
+        total = args.threads * args.queries
+
+        for name, run in (('per-thread', per_thread), ('multiplexed', multiplexed)):
+            seconds = statistics.median(run(client, args.threads, args.queries) for _ in range(args.repeat))
+            streams = args.threads if run is per_thread else 1
+            print(f'{name:<12} {total / seconds:>10,.0f} queries/s {seconds:8.3f}s {streams:>4} streams')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Measure the import time of the package and the latency of a first query from a fresh process.
+
+The steps are importing `grakn`, loading `grakn.Client` with gRPC and the protobuf modules, creating a client, which
+waits for its channel to connect unless it connects lazily, and executing a first query.
+
+The synthetic engine runs in this process, and each measurement runs in a new Python process so nothing is already
+imported or connected. Run from the repository root:
+
+    $ python -m benchmarks.bench_startup --max-import-ms 50
+
+With `--max-import-ms`, the exit status is 1 if importing the package takes longer, such as when a change makes
+`import grakn` load gRPC again.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchmarks.engine import SyntheticEngine
+
+# run in a fresh process, printing the seconds taken by each step as JSON
+_FIRST_QUERY = '''
+import json, sys, time
+start = time.perf_counter()
+import grakn
+imported = time.perf_counter()
+Client = grakn.Client
+loaded = time.perf_counter()
+client = Client(uri=sys.argv[1], keyspace='benchmark', lazy_connect=sys.argv[2] == 'lazy')
+created = time.perf_counter()
+client.execute('match $x isa person; limit 10; get;')
+executed = time.perf_counter()
+print(json.dumps({'import': imported - start, 'load_client': loaded - imported, 'create': created - loaded,
+                  'first_query': executed - created, 'total': executed - start}))
+'''
+
+
+def run(uri: str, mode: str) -> Dict[str, float]:
+    environment = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    output = subprocess.run([sys.executable, '-c', _FIRST_QUERY, uri, mode], env=environment, check=True,
+                            stdout=subprocess.PIPE).stdout
+    return json.loads(output)
+
+
+def median(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    return {step: statistics.median(run[step] for run in runs) for step in runs[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='processes started for each mode, of which the median '
+                                                                'is kept')
+    parser.add_argument('--port', type=int, default=48557, help='port for the synthetic engine')
+    parser.add_argument('--max-import-ms', type=float, help='fail if importing the package takes longer')
+    args = parser.parse_args()
+
+    results = {}
+
+    with SyntheticEngine(args.port) as engine:
+        for mode in ('eager', 'lazy'):
+            results[mode] = median([run(engine.uri, mode) for _ in range(args.repeat)])
+            timings = ' '.join(f'{step} {seconds * 1000:7.1f}ms' for step, seconds in results[mode].items())
+            print(f'{mode:<6} {timings}', file=sys.stderr)
+
+    json.dump(results, sys.stdout, indent=2, sort_keys=True)
+    print()
+
+    import_ms = statistics.median(result['import'] for result in results.values()) * 1000
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f'import took {import_ms:.1f}ms, more than {args.max_import_ms}ms', file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""A synthetic Grakn engine for benchmarks, which answers any query without storing anything.
+
+See `tests.mock_engine.SyntheticAnswers` for how queries are answered.
+"""
+from typing import Dict, Optional
+
+from grakn.channel import ChannelOptions
+from tests.mock_engine import GrpcServer, ID_ONLY, MockGraknServicer, RESOLUTION_HEAVY, SyntheticAnswers
+
+__all__ = ['ID_ONLY', 'RESOLUTION_HEAVY', 'SyntheticEngine']
+
+
+class SyntheticEngine:
+    """Serves synthetic answers on a local port for the duration of a `with` statement
+
+    Requests are neither logged nor recorded, so memory use does not grow with the number of requests. Responses are
+    compressed with `compression`, such as 'gzip', if given.
+    """
+
+    def __init__(self, port: int = 48557, latency: float = 0, answer_mix: Optional[Dict[str, int]] = None,
+                 compression: Optional[str] = None, value_size: int = 0) -> None:
+        self.answers = SyntheticAnswers(answer_mix, value_size=value_size)
+        self.servicer = MockGraknServicer(self.answers, latency=latency, record=False)
+        self.uri = f'localhost:{port}'
+        self._port = port
+        self._compression = ChannelOptions(compression=compression).grpc_compression()
+        self._server: Optional[GrpcServer] = None
+
+    def __enter__(self) -> 'SyntheticEngine':
+        self._server = GrpcServer(self.servicer, self._port, self._compression)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._server.stop()
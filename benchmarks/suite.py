@@ -0,0 +1,177 @@
+"""Measure the throughput of the client against a synthetic engine, and compare it with an earlier run.
+
+The engine runs in this process, so no Grakn server is needed. Run from the repository root:
+
+    $ python -m benchmarks.suite --output before.json
+    $ python -m benchmarks.suite --baseline before.json --max-regression 0.1
+
+Each benchmark reports a rate, where higher is better. With `--baseline`, the exit status is 1 if any benchmark is
+slower than the baseline by more than `--max-regression`. Rates are only comparable between runs on the same machine
+with the same `--latency`.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import grpc
+
+import grakn
+from benchmarks.engine import ID_ONLY, RESOLUTION_HEAVY, SyntheticEngine
+
+
+class Benchmark(NamedTuple):
+    name: str
+    unit: str
+    answer_mix: Dict[str, int]
+    run: Callable[[grakn.Client], int]
+
+
+def query_throughput(queries: int) -> Callable[[grakn.Client], int]:
+    """Execute aggregate queries one after another, each in its own transaction"""
+    def run(client: grakn.Client) -> int:
+        for _ in range(queries):
+            client.execute('match $x isa person; aggregate count;')
+        return queries
+    return run
+
+
+def streaming(answers: int, page_size: int = 1000, prefetch: int = 32) -> Callable[[grakn.Client], int]:
+    """Stream the answers to one query"""
+    def run(client: grakn.Client) -> int:
+        query = f'match $x isa person; limit {answers}; get;'
+        return sum(1 for _ in client.execute_iter(query, page_size=page_size, prefetch=prefetch))
+    return run
+
+
+def bulk_insert(queries: int, batch_size: int = 100, concurrency: int = 4) -> Callable[[grakn.Client], int]:
+    """Load insert queries in batches, with several transactions at once"""
+    def run(client: grakn.Client) -> int:
+        inserts = (f'insert $x isa person, has name "person-{i}";' for i in range(queries))
+        return client.load(inserts, batch_size=batch_size, concurrency=concurrency).loaded
+    return run
+
+
+def concurrent_clients(queries: int, concurrency: int = 8) -> Callable[[grakn.Client], int]:
+    """Execute short queries from several threads at once"""
+    def run(client: grakn.Client) -> int:
+        results = client.execute_all(('match $x isa person; limit 10; get;' for _ in range(queries)),
+                                     concurrency=concurrency)
+        return sum(len(executed.result) for executed in results)
+    return run
+
+
+def benchmarks(scale: str) -> List[Benchmark]:
+    sizes = [10 ** 3, 10 ** 4] if scale == 'quick' else [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+    queries = 200 if scale == 'quick' else 2000
+
+    return [
+        Benchmark('query_throughput', 'queries/s', ID_ONLY, query_throughput(queries)),
+        *[Benchmark(f'stream_{size}', 'answers/s', ID_ONLY, streaming(size)) for size in sizes],
+        Benchmark(f'resolution_heavy_{sizes[-1]}', 'answers/s', RESOLUTION_HEAVY, streaming(sizes[-1])),
+        Benchmark('bulk_insert', 'queries/s', ID_ONLY, bulk_insert(queries * 10)),
+        Benchmark('concurrent_clients', 'answers/s', ID_ONLY, concurrent_clients(queries)),
+    ]
+
+
+def measure(benchmark: Benchmark, engine: SyntheticEngine, client: grakn.Client, repeat: int) -> Dict[str, float]:
+    """Run a benchmark `repeat` times, reporting the median rate so one slow run does not decide the result"""
+    engine.answers.mix = benchmark.answer_mix
+    rates = []
+    seconds = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = benchmark.run(client)
+        elapsed = time.perf_counter() - start
+        rates.append(count / elapsed)
+        seconds.append(elapsed)
+
+    return {'rate': statistics.median(rates), 'unit': benchmark.unit, 'seconds': statistics.median(seconds),
+            'count': count}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            max_regression: float) -> List[str]:
+    """Return the names of benchmarks that are slower than the baseline by more than `max_regression`"""
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        change = result['rate'] / baseline[name]['rate'] - 1
+        regressed = change < -max_regression
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<24} {change:+8.1%}{"  REGRESSION" if regressed else ""}', file=sys.stderr)
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=['quick', 'full'], default='quick',
+                        help='quick streams up to 10^4 answers, full up to 10^6')
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds between each request and response')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each benchmark, of which the median is kept')
+    parser.add_argument('--only', nargs='*', help='names of the benchmarks to run')
+    parser.add_argument('--port', type=int, default=48557, help='port for the synthetic engine')
+    parser.add_argument('--output', help='file to write the results to as JSON, instead of stdout')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.1,
+                        help='fraction a rate can drop below the baseline before failing')
+    args = parser.parse_args()
+
+    selected = [benchmark for benchmark in benchmarks(args.scale) if not args.only or benchmark.name in args.only]
+    results = {}
+
+    with SyntheticEngine(args.port, latency=args.latency / 1000) as engine:
+        client = grakn.Client(uri=engine.uri, keyspace='benchmark')
+
+        for benchmark in selected:
+            results[benchmark.name] = measure(benchmark, engine, client, args.repeat)
+            result = results[benchmark.name]
+            print(f'{benchmark.name:<24} {result["rate"]:>14,.0f} {result["unit"]:<10} {result["seconds"]:8.3f}s',
+                  file=sys.stderr)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'grpc': grpc.__version__,
+            'platform': platform.platform(),
+            'scale': args.scale,
+            'latency_ms': args.latency,
+            'repeat': args.repeat,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    regressions: Optional[List[str]] = None
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        for setting in ('scale', 'latency_ms'):
+            if baseline['meta'].get(setting) != report['meta'][setting]:
+                print(f'warning: baseline was run with a different {setting}', file=sys.stderr)
+
+        regressions = compare(results, baseline['results'], args.max_regression)
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,58 @@
-from grakn.client import Client, GraknError
+"""Grakn python client.
+
+The names and submodules below are imported when first used, so importing the package does not load gRPC or the
+protobuf modules until a client needs them.
+"""
+import importlib
+import sys
+import types
+from typing import Any, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grakn.channel import ChannelOptions
+    from grakn.client import Client, GraknError
+    from grakn.cluster import ClusterClient
+    from grakn.pool import ClientPool
+    from grakn.retry import RetryPolicy
+    from grakn.template import Template
+
+# the module that defines each name exported by the package
+_EXPORTS = {
+    'ChannelOptions': 'grakn.channel',
+    'Client': 'grakn.client',
+    'GraknError': 'grakn.client',
+    'ClientPool': 'grakn.pool',
+    'Template': 'grakn.template',
+    'RetryPolicy': 'grakn.retry',
+    'ClusterClient': 'grakn.cluster',
+}
+
+__all__ = list(_EXPORTS)
+
+# submodules are exported as themselves, so `grakn.client` can be used after `import grakn`
+_EXPORTS.update((submodule, f'grakn.{submodule}') for submodule in (
+    'aio', 'answer', 'blocking_iter', 'cache', 'channel', 'client', 'cluster', 'columnar', 'dump', 'executor',
+    'instrumentation', 'loader', 'pool', 'retry', 'template'))
+
+
+class _LazyModule(types.ModuleType):
+    """The package, which imports each exported name on first access
+
+    Setting the class of the module works on Python 3.6, which does not call a module-level `__getattr__`.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        module = _EXPORTS.get(name)
+        if module is None:
+            raise AttributeError(f'module {self.__name__!r} has no attribute {name!r}')
+
+        imported = importlib.import_module(module)
+        value = imported if module == f'{self.__name__}.{name}' else getattr(imported, name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(super().__dir__()) | set(_EXPORTS))
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -0,0 +1,390 @@
+"""Grakn python client for asyncio, using gRPC's asyncio API."""
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple
+
+import grpc
+import grpc.aio
+
+import concept_pb2 as grpc_concept
+import grakn_pb2 as grpc_grakn
+import grakn_pb2_grpc
+from grakn.cache import LRUCache
+from grakn.channel import ChannelOptions
+from grakn.client import Client, GraknError, _BaseGraknTx, _GET_LABEL, _GET_VALUE, _RESOLVE_PAGE_SIZE, \
+    _concept_method_requests, _concepts_to_resolve, _convert_value, _exec_query_request, _open_request, _parse_result, \
+    _query_tx_type, _raise_grpc_error
+from grakn.instrumentation import Listener, TxRecorder
+from grakn_pb2 import TxRequest, TxResponse
+from iterator_pb2 import Next, Stop, IteratorId
+
+
+async def _write(call: grpc.aio.StreamStreamCall, request: TxRequest) -> None:
+    try:
+        await call.write(request)
+    except grpc.RpcError as e:
+        _raise_grpc_error(e)
+
+
+async def _read(call: grpc.aio.StreamStreamCall) -> TxResponse:
+    try:
+        response = await call.read()
+    except grpc.RpcError as e:
+        _raise_grpc_error(e)
+
+    if response is grpc.aio.EOF:
+        raise ConnectionError('the server closed the transaction')
+
+    return response
+
+
+class _Exchange:
+    """Holds the lock of a transaction for one exchange of requests and responses with the server
+
+    If the exchange is cancelled part way, responses to its requests may still be on their way, and would be taken for
+    the responses to the next exchange, so the transaction is closed instead.
+    """
+
+    def __init__(self, tx: 'AsyncGraknTx') -> None:
+        self._tx = tx
+
+    async def __aenter__(self) -> None:
+        await self._tx._lock.acquire()
+        if self._tx._interrupted:
+            self._tx._lock.release()
+            raise GraknError('the transaction was closed, as an exchange with the server was cancelled part way')
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            self._tx._interrupted = True
+            self._tx._closed = True
+        self._tx._lock.release()
+
+
+class AsyncGraknTx(_BaseGraknTx):
+    """A transaction against a knowledge graph. The transaction ends when its surrounding context closes.
+
+    Each exchange with the server holds a lock, so the transaction can be shared by several tasks. If a task is
+    cancelled during an exchange, such as by `asyncio.wait_for`, the transaction is closed, and every later call on it
+    raises a GraknError.
+
+    Labels of schema concepts are cached in `label_cache` for the lifetime of the transaction.
+
+    Queries keep up to `prefetch` `Next` requests in flight while receiving answers, unless they specify otherwise.
+    """
+
+    def __init__(self, call: grpc.aio.StreamStreamCall, shared_label_cache: Optional[LRUCache[str, str]] = None,
+                 prefetch: int = 1, tx_type: str = 'write', recorder: Optional[TxRecorder] = None) -> None:
+        super().__init__(shared_label_cache, prefetch, tx_type=tx_type, recorder=recorder)
+        self._call = call
+        self._lock = asyncio.Lock()
+        self._interrupted = False
+
+    def _exchange(self) -> _Exchange:
+        return _Exchange(self)
+
+    async def _send(self, request: TxRequest) -> None:
+        if self._recorder is not None:
+            self._recorder.sent(request)
+        await _write(self._call, request)
+
+    async def _receive(self) -> TxResponse:
+        response = await _read(self._call)
+        if self._recorder is not None:
+            self._recorder.received(response)
+        return response
+
+    async def execute(self, query: str, *, infer: Optional[bool] = None, prefetch: Optional[int] = None) -> Any:
+        """Execute a Graql query against the knowledge base
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param prefetch: how many answers to request ahead of receiving them
+        :return: a list of query results
+
+        :raises: GraknError, GraknConnectionError
+        """
+        response = await self._exec_query(query, infer)
+
+        if response.HasField('done'):
+            return
+        elif response.HasField('queryResult'):
+            async with self._exchange():
+                return (await self._parse_results([response.queryResult]))[0]
+        elif response.HasField('iteratorId'):
+            results = self._iterate_results(response.iteratorId, _RESOLVE_PAGE_SIZE, prefetch or self.prefetch)
+            return [result async for result in results]
+
+    async def execute_iter(self, query: str, *, infer: Optional[bool] = None, page_size: int = 1,
+                           prefetch: Optional[int] = None) -> AsyncIterator[Any]:
+        """Execute a Graql query against the knowledge base, receiving its results as they are consumed
+
+        The query is sent when the first result is requested. Only one page of answers, plus any answers requested
+        ahead, is held in memory at a time. If the returned iterator is closed with `aclose` before it is exhausted,
+        the server is told to stop producing answers.
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param page_size: how many answers to receive before resolving the labels and values of their concepts
+        :param prefetch: how many answers to request ahead of receiving them
+        :return: an asynchronous iterator of query results
+
+        :raises: GraknError, GraknConnectionError
+        """
+        response = await self._exec_query(query, infer)
+
+        if response.HasField('queryResult'):
+            async with self._exchange():
+                results = await self._parse_results([response.queryResult])
+            yield results[0]
+        elif response.HasField('iteratorId'):
+            results = self._iterate_results(response.iteratorId, page_size, prefetch or self.prefetch)
+            try:
+                async for result in results:
+                    yield result
+            finally:
+                # closing an asynchronous generator does not close the one it is iterating over
+                await results.aclose()
+
+    async def _exec_query(self, query: str, infer: Optional[bool]) -> TxResponse:
+        self._on_query(query)
+        async with self._exchange():
+            await self._send(_exec_query_request(query, infer))
+            return await self._receive()
+
+    async def _iterate_results(self, iterator_id: IteratorId, page_size: int, prefetch: int) -> AsyncIterator[Any]:
+        next_request = TxRequest(next=Next(iteratorId=iterator_id))
+        query_results: Deque[grpc_grakn.QueryResult] = deque()
+        read_ahead = max(page_size, prefetch)
+        exhausted = False
+
+        try:
+            while True:
+                async with self._exchange():
+                    in_flight = 0
+
+                    while len(query_results) < page_size and not exhausted:
+                        # refill the window of next requests as answers arrive
+                        while in_flight < prefetch and len(query_results) + in_flight < read_ahead:
+                            await self._send(next_request)
+                            in_flight += 1
+
+                        exhausted = not await self._receive_query_result(query_results)
+                        in_flight -= 1
+
+                    # responses to concept methods queue behind any answers still in flight, so receive those first
+                    while in_flight > 0:
+                        exhausted = not await self._receive_query_result(query_results) or exhausted
+                        in_flight -= 1
+
+                    page = [query_results.popleft() for _ in range(min(page_size, len(query_results)))]
+                    results = await self._parse_results(page)
+
+                for result in results:
+                    yield result
+
+                if exhausted and not query_results:
+                    return
+        except GeneratorExit:
+            # once the transaction is closed, the server has already released the iterator
+            if not exhausted and not self._closed:
+                async with self._exchange():
+                    await self._send(TxRequest(stop=Stop(iteratorId=iterator_id)))
+                    await self._receive()
+            raise
+
+    async def _receive_query_result(self, query_results: Deque[grpc_grakn.QueryResult]) -> bool:
+        """Receive the response to a next request, returning False if the iterator is exhausted"""
+        response = await self._receive()
+
+        if response.HasField('done'):
+            return False
+        else:
+            query_results.append(response.queryResult)
+            return True
+
+    async def _parse_results(self, results: List[grpc_grakn.QueryResult]) -> List[Any]:
+        """Parse a page of query results, resolving the labels and values of all their concepts together"""
+        label_cids, value_cids = _concepts_to_resolve(results)
+        labels, values = await self._get_labels_and_values(label_cids, value_cids)
+
+        if self._recorder is None:
+            return [_parse_result(result, labels, values) for result in results]
+
+        start = time.perf_counter()
+        parsed = [_parse_result(result, labels, values) for result in results]
+        self._recorder.parsed(time.perf_counter() - start)
+        return parsed
+
+    async def _get_labels_and_values(self, label_cids: Iterable[grpc_concept.ConceptId],
+                                     value_cids: Iterable[grpc_concept.ConceptId]) -> Tuple[Dict[str, str],
+                                                                                          Dict[str, Any]]:
+        """Return the labels and values of the distinct concepts, sending every request before waiting for any
+        response"""
+        labels, uncached_cids = self._cached_labels(label_cids)
+        label_requests = _concept_method_requests(uncached_cids, _GET_LABEL)
+        value_requests = _concept_method_requests(value_cids, _GET_VALUE)
+
+        for request in itertools.chain(label_requests.values(), value_requests.values()):
+            await self._send(request)
+
+        # responses arrive in the same order the requests were sent
+        for cid in label_requests:
+            labels[cid] = (await self._receive()).conceptResponse.label.value
+            self._cache_label(cid, labels[cid])
+
+        values = {cid: _convert_value((await self._receive()).conceptResponse.attributeValue) for cid in value_requests}
+        return labels, values
+
+    async def commit(self) -> None:
+        """Commit the transaction. A read transaction has nothing to commit, so this does nothing."""
+        if self.tx_type == 'read':
+            return
+
+        async with self._exchange():
+            await self._send(TxRequest(commit=grpc_grakn.Commit()))
+            await self._receive()
+        self._on_commit()
+
+
+class AsyncGraknTxContext:
+    """Contains an AsyncGraknTx. This should be used in an `async with` statement in order to retrieve it"""
+
+    def __init__(self, keyspace: str, channel: grpc.aio.Channel, stub: grakn_pb2_grpc.GraknStub, timeout,
+                 label_cache: Optional[LRUCache[str, str]] = None, prefetch: int = 1, tx_type: str = 'write',
+                 listener: Optional[Listener] = None, channel_options: Optional[ChannelOptions] = None) -> None:
+        self._open_request = _open_request(keyspace, tx_type)
+        self._call_options = channel_options.call_options() if channel_options is not None else {}
+        self._listener = listener
+        self._tx_type = tx_type
+        self._keyspace = keyspace
+        self._channel = channel
+        self._stub = stub
+        self._timeout = timeout
+        self._label_cache = label_cache
+        self._prefetch = prefetch
+
+    async def __aenter__(self) -> AsyncGraknTx:
+        # wait for connection to be ready
+        try:
+            await asyncio.wait_for(self._channel.channel_ready(), self._timeout)
+        except asyncio.TimeoutError as e:
+            raise ConnectionError from e
+
+        self._call = self._stub.Tx(timeout=self._timeout, **self._call_options)
+        recorder = TxRecorder(self._listener, self._keyspace, self._tx_type) if self._listener is not None else None
+        self._tx = AsyncGraknTx(self._call, self._label_cache, self._prefetch, self._tx_type, recorder)
+        await self._tx._send(self._open_request)
+
+        # wait for response from "open"
+        await self._tx._receive()
+
+        return self._tx
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self._tx._closed = True
+        if self._tx._interrupted:
+            # responses may still be on their way, so the stream cannot be ended cleanly
+            self._call.cancel()
+            if self._tx._recorder is not None:
+                self._tx._recorder.close()
+            return
+
+        # we finish writing and wait for the end of the stream. This tells gRPC we are done
+        try:
+            await self._call.done_writing()
+            await self._call.read()
+        except grpc.RpcError as e:
+            _raise_grpc_error(e)
+        finally:
+            if self._tx._recorder is not None:
+                self._tx._recorder.close()
+
+
+class AsyncClient:
+    """Asyncio client to a Grakn knowledge base, identified by a uri and a keyspace.
+
+    The connection is made when the first transaction is opened, which waits up to `timeout` seconds for it.
+    `label_cache_size`, `prefetch`, `listener` and `channel_options` are the same as those of `Client`. Results are
+    not cached and failed queries are not retried, so `result_cache_size`, `result_cache_ttl`, `retry` and
+    `lazy_connect` are not accepted.
+    """
+
+    def __init__(self, uri: str = Client.DEFAULT_URI, keyspace: str = Client.DEFAULT_KEYSPACE, *,
+                 timeout: int = Client.DEFAULT_TIMEOUT, label_cache_size: int = 0, prefetch: int = 1,
+                 listener: Optional[Listener] = None, channel_options: Optional[ChannelOptions] = None) -> None:
+        self.channel_options = channel_options if channel_options is not None else ChannelOptions()
+        self._channel = grpc.aio.insecure_channel(uri, options=self.channel_options.grpc_options(),
+                                                  compression=self.channel_options.grpc_compression())
+        self._stub = grakn_pb2_grpc.GraknStub(self._channel)
+        self._timeout = timeout
+        self.uri = uri
+        self.keyspace = keyspace
+        self.prefetch = prefetch
+        self.listener = listener
+        self.label_cache: Optional[LRUCache[str, str]] = LRUCache(label_cache_size) if label_cache_size > 0 else None
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        await self.close()
+
+    async def execute(self, query: str, *, infer: Optional[bool] = None, prefetch: Optional[int] = None,
+                      tx_type: Optional[str] = None) -> Any:
+        """Execute and commit a Graql query against the knowledge base
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param prefetch: how many answers to request ahead of receiving them
+        :param tx_type: 'read', 'write' or 'batch'. By default, a read transaction unless the query can write
+        :return: a list of query results
+
+        :raises: GraknError, GraknConnectionError
+        """
+        async with self.open(tx_type=_query_tx_type(query, tx_type)) as tx:
+            result = await tx.execute(query, infer=infer, prefetch=prefetch)
+            await tx.commit()
+        return result
+
+    async def execute_iter(self, query: str, *, infer: Optional[bool] = None, page_size: int = 1,
+                           prefetch: Optional[int] = None, tx_type: Optional[str] = None) -> AsyncIterator[Any]:
+        """Execute and commit a Graql query against the knowledge base, receiving its results as they are consumed
+
+        The transaction stays open while the returned iterator is in use, and is only committed once it is exhausted.
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param page_size: how many answers to receive before resolving the labels and values of their concepts
+        :param prefetch: how many answers to request ahead of receiving them
+        :param tx_type: 'read', 'write' or 'batch'. By default, a read transaction unless the query can write
+        :return: an asynchronous iterator of query results
+
+        :raises: GraknError, GraknConnectionError
+        """
+        async with self.open(tx_type=_query_tx_type(query, tx_type)) as tx:
+            results = tx.execute_iter(query, infer=infer, page_size=page_size, prefetch=prefetch)
+            try:
+                async for result in results:
+                    yield result
+            finally:
+                await results.aclose()
+            await tx.commit()
+
+    def open(self, *, tx_type: str = 'write') -> AsyncGraknTxContext:
+        """Open a transaction
+
+        :param tx_type: 'read', 'write' or 'batch'. Queries in a read transaction cannot write, and are not committed
+        :return: an AsyncGraknTxContext that can be opened using an `async with` statement
+
+        :raises: ValueError if `tx_type` is not a type of transaction
+        """
+        return AsyncGraknTxContext(self.keyspace, self._channel, self._stub, timeout=self._timeout,
+                                   label_cache=self.label_cache, prefetch=self.prefetch, tx_type=tx_type,
+                                   listener=self.listener, channel_options=self.channel_options)
+
+    async def close(self) -> None:
+        """Close the connection to the knowledge base"""
+        await self._channel.close()
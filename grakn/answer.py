@@ -0,0 +1,115 @@
+"""Compact representations of the answers to a query."""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+class Concept:
+    """A concept in an answer. `label` is None unless it is a schema concept, and `value` is None unless it is an
+    attribute."""
+
+    __slots__ = ('id', 'base_type', 'label', 'value')
+
+    def __init__(self, id: str, base_type: int, label: Optional[str] = None, value: Any = None) -> None:
+        self.id = id
+        self.base_type = base_type
+        self.label = label
+        self.value = value
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Concept) and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f'Concept({self.to_dict()})'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary `GraknTx.execute` returns for a concept"""
+        concept_dict = {'id': self.id}
+
+        if self.label is not None:
+            concept_dict['label'] = self.label
+
+        if self.value is not None:
+            concept_dict['value'] = self.value
+
+        return concept_dict
+
+
+class LazyConcept(Concept):
+    """A Concept whose label or value is fetched from its transaction when first read
+
+    Reading the label or value of one lazy concept fetches those of every lazy concept of the transaction that has
+    not been fetched yet, together. They can only be fetched while the transaction is open.
+    """
+
+    # the label and value are kept apart from those of Concept, which the properties below hide
+    __slots__ = ('_label', '_value', '_fetch')
+
+    def __init__(self, id: str, base_type: int, fetch: Callable[[], None]) -> None:
+        self.id = id
+        self.base_type = base_type
+        self._label: Optional[str] = None
+        self._value: Any = None
+        self._fetch: Optional[Callable[[], None]] = fetch
+
+    @property
+    def label(self) -> Optional[str]:
+        if self._fetch is not None:
+            self._fetch()
+        return self._label
+
+    @property
+    def value(self) -> Any:
+        if self._fetch is not None:
+            self._fetch()
+        return self._value
+
+    @property
+    def fetched(self) -> bool:
+        """Whether the label and value have been fetched"""
+        return self._fetch is None
+
+    def __repr__(self) -> str:
+        if not self.fetched:
+            return f'LazyConcept(id={self.id!r}, fetched=False)'
+        return f'LazyConcept({self.to_dict()})'
+
+    def _fetched(self, label: Optional[str], value: Any) -> None:
+        self._label = label
+        self._value = value
+        self._fetch = None
+
+
+class AnswerTable(Sequence[Tuple[Concept, ...]]):
+    """The answers to a query, as one tuple of concepts per answer in the order of the variables in `header`
+
+    A concept that appears in several answers is the same Concept object in each of them.
+    """
+
+    __slots__ = ('header', 'rows')
+
+    def __init__(self, header: Tuple[str, ...], rows: List[Tuple[Concept, ...]]) -> None:
+        self.header = header
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        return self.rows[index]
+
+    def __iter__(self) -> Iterator[Tuple[Concept, ...]]:
+        return iter(self.rows)
+
+    def __repr__(self) -> str:
+        return f'AnswerTable(header={self.header}, rows={len(self.rows)})'
+
+    def column(self, var: str) -> List[Concept]:
+        """Return the concept of the variable in every answer"""
+        position = self.header.index(var)
+        return [row[position] for row in self.rows]
+
+    def to_dicts(self) -> List[Dict[str, Dict[str, Any]]]:
+        """Convert to the list of dictionaries `GraknTx.execute` returns for the answers"""
+        return [{var: concept.to_dict() for var, concept in zip(self.header, row)} for row in self.rows]
@@ -1,14 +1,19 @@
-from multiprocessing import Queue
+from queue import Queue
 from typing import Generic, Optional, Iterator, TypeVar
 
 T = TypeVar('T')
 
 
 class BlockingIter(Generic[T]):
-    """An iterator that blocks until an element is available"""
+    """An iterator that blocks until an element is available
 
-    def __init__(self) -> None:
-        self._queue: Queue[Optional[T]] = Queue()
+    Elements are handed between threads of the same process, so they are never serialized.
+
+    :param maxsize: if positive, `add` blocks while this many elements are waiting to be consumed
+    """
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._queue: Queue[Optional[T]] = Queue(maxsize)
 
     def __iter__(self) -> Iterator[T]:
         return self
@@ -0,0 +1,71 @@
+"""Caches used to avoid repeating requests to a Grakn knowledge base."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """A thread-safe cache that evicts the least recently used entry when full, and counts hits and misses
+
+    Expired entries count as misses, and as evictions when they are removed.
+
+    :param maxsize: the maximum number of entries, or None for no limit
+    :param ttl: seconds before an entry expires, or None for entries that never expire
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value for the key, or None if there is none"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            else:
+                self.misses += 1
+                return None
+
+    def put(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """Cache a value, evicting the least recently used entry if the cache is full
+
+        :param generation: only cache the value if the cache has not been cleared since `generation` was read
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
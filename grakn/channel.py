@@ -0,0 +1,180 @@
+"""Tuning of the gRPC channels to a Grakn knowledge base, and of the transactions called over them."""
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import grpc
+
+# the longest to wait for gRPC to stop watching the state of a channel, which it checks every 0.2 seconds
+_SETTLE_TIMEOUT = 1.0
+
+_COMPRESSION = {
+    None: grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+
+
+class ChannelOptions(NamedTuple):
+    """Options for the channels of a client, and for each transaction it opens
+
+    Any option left as None keeps the default of gRPC, which limits received messages to 4 MB and sends no keepalive
+    pings.
+
+    `keepalive_time` is the seconds a connection can be idle before it is pinged, and `keepalive_timeout` the seconds
+    to wait for the ping to be answered before closing the connection. Keepalive stops firewalls and load balancers
+    from dropping idle connections, such as those of a pool's warm transactions, but a server may close connections
+    that ping more often than it allows. Connections with no open transactions are only pinged if
+    `keepalive_without_calls`.
+
+    `compression` is 'gzip' or 'deflate', and compresses the requests of every transaction. Responses are compressed
+    if the server is configured to compress them.
+
+    If `wait_for_ready`, opening a transaction waits for the channel to connect, up to the timeout of the transaction,
+    instead of failing at once while the server is unavailable.
+    """
+    max_send_message_length: Optional[int] = None
+    max_receive_message_length: Optional[int] = None
+    keepalive_time: Optional[float] = None
+    keepalive_timeout: Optional[float] = None
+    keepalive_without_calls: bool = False
+    compression: Optional[str] = None
+    wait_for_ready: Optional[bool] = None
+
+    def grpc_options(self) -> List[Tuple[str, Any]]:
+        """Return the options to create a gRPC channel with"""
+        options: List[Tuple[str, Any]] = []
+
+        if self.max_send_message_length is not None:
+            options.append(('grpc.max_send_message_length', self.max_send_message_length))
+
+        if self.max_receive_message_length is not None:
+            options.append(('grpc.max_receive_message_length', self.max_receive_message_length))
+
+        if self.keepalive_time is not None:
+            options.append(('grpc.keepalive_time_ms', int(self.keepalive_time * 1000)))
+
+        if self.keepalive_timeout is not None:
+            options.append(('grpc.keepalive_timeout_ms', int(self.keepalive_timeout * 1000)))
+
+        if self.keepalive_without_calls:
+            options.append(('grpc.keepalive_permit_without_calls', 1))
+
+        return options
+
+    def grpc_compression(self) -> grpc.Compression:
+        """Return the gRPC compression algorithm of the requests
+
+        :raises: ValueError if `compression` is not a supported algorithm
+        """
+        try:
+            return _COMPRESSION[self.compression]
+        except KeyError:
+            raise ValueError(f'compression must be gzip or deflate, but was {self.compression!r}') from None
+
+    def call_options(self) -> Dict[str, Any]:
+        """Return the keyword arguments to call `Tx` with"""
+        return {'wait_for_ready': self.wait_for_ready, 'compression': self.grpc_compression()}
+
+
+def insecure_channel(uri: str, options: ChannelOptions,
+                     extra_options: Optional[List[Tuple[str, Any]]] = None) -> grpc.Channel:
+    """Create a channel to a uri with the given options, and any extra gRPC options"""
+    return grpc.insecure_channel(uri, options=options.grpc_options() + (extra_options or []),
+                                 compression=options.grpc_compression())
+
+
+def close_channel(channel: grpc.Channel, *ready: Optional[grpc.Future]) -> None:
+    """Cancel the ready futures of a channel, and close it once gRPC has stopped watching its state
+
+    While any future watches a channel, and for up to 0.2 seconds after the last is cancelled, a gRPC thread polls
+    the state of the channel. Closing the channel while it does raises an exception in that thread.
+    """
+    for future in ready:
+        if future is not None:
+            future.cancel()
+
+    state = getattr(channel, '_connectivity_state', None)
+    deadline = time.monotonic() + _SETTLE_TIMEOUT
+    while state is not None and state.polling and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    channel.close()
+
+
+def cancel_call(call: Any) -> None:
+    """Cancel a call, even one that has received its status without completing its other operations
+
+    gRPC can receive the status of a call started on a connection the server has just closed, yet never complete the
+    call's other operations, so a thread waiting for a response to it waits forever. `cancel` does nothing once a
+    call has its status, so its operations are cancelled on the call gRPC made for it instead.
+    """
+    if not call.cancel():
+        core_call = getattr(call, '_call', None)
+        if core_call is not None:
+            core_call.cancel(grpc.StatusCode.CANCELLED.value[0], 'Locally cancelled by application!')
+
+
+class CallWatchdog:
+    """Cancels calls that are still watched a while after their deadline, from one thread shared by every call
+
+    Watching a call takes no thread of its own, so it is cheap enough to do for every transaction.
+
+    :param grace: seconds past the deadline of a call to wait before cancelling it
+    """
+
+    def __init__(self, grace: float) -> None:
+        self.grace = grace
+        self._condition = threading.Condition()
+        self._deadlines: List[Tuple[float, int]] = []
+        self._calls: Dict[int, Any] = {}
+        self._keys = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, call: Any, timeout: float) -> int:
+        """Cancel a call if it is still watched `grace` seconds after `timeout`, returning the key to unwatch it by"""
+        deadline = time.monotonic() + timeout + self.grace
+        with self._condition:
+            key = next(self._keys)
+            self._calls[key] = call
+            heapq.heappush(self._deadlines, (deadline, key))
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='grakn-call-watchdog', daemon=True)
+                self._thread.start()
+            elif self._deadlines[0][1] == key:
+                self._condition.notify()
+        return key
+
+    def unwatch(self, key: int) -> None:
+        with self._condition:
+            self._calls.pop(key, None)
+
+            # the deadlines of unwatched calls are dropped once they outnumber those of watched calls
+            if len(self._deadlines) > 2 * len(self._calls) + 100:
+                self._deadlines = [entry for entry in self._deadlines if entry[1] in self._calls]
+                heapq.heapify(self._deadlines)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                # as well as when they come up
+                while self._deadlines and self._deadlines[0][1] not in self._calls:
+                    heapq.heappop(self._deadlines)
+
+                if not self._deadlines:
+                    self._condition.wait()
+                    continue
+
+                deadline, key = self._deadlines[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+
+                heapq.heappop(self._deadlines)
+                call = self._calls.pop(key)
+
+            cancel_call(call)
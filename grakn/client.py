@@ -1,19 +1,87 @@
 """Grakn python client."""
+import itertools
 import json
-from typing import Any, Optional, Iterator, Dict, List
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Iterator, Iterable, Deque, Dict, List, Tuple, Union, TYPE_CHECKING
 
 import grpc
 
 import concept_pb2 as grpc_concept
 import grakn_pb2 as grpc_grakn
 import grakn_pb2_grpc
+from grakn.answer import AnswerTable, Concept, LazyConcept
 from grakn.blocking_iter import BlockingIter
+from grakn.cache import LRUCache
+from grakn.channel import CallWatchdog, ChannelOptions, close_channel, insecure_channel
+from grakn.columnar import ColumnBuilder, Columns
+from grakn.instrumentation import Listener, TxRecorder
+from grakn.retry import RetryPolicy, run_in_transaction
 from grakn_pb2 import TxRequest, TxResponse
-from iterator_pb2 import Next, IteratorId
+from iterator_pb2 import Next, Stop, IteratorId
+
+if TYPE_CHECKING:
+    from grakn.executor import ExecutedQuery
+    from grakn.loader import BatchResult, LoadReport
 
 _SCHEMA_CONCEPT_BASE_TYPES = {grpc_concept.MetaType, grpc_concept.RelationshipType, grpc_concept.AttributeType,
                               grpc_concept.EntityType, grpc_concept.Role, grpc_concept.Rule}
 
+_SCHEMA_QUERY_KEYWORDS = ('define', 'undefine')
+
+_GET_LABEL = grpc_concept.ConceptMethod(getLabel=grpc_concept.Unit())
+_GET_VALUE = grpc_concept.ConceptMethod(getValue=grpc_concept.Unit())
+
+# the types of transaction that can be opened, by name
+_TX_TYPES = {'read': grpc_grakn.Read, 'write': grpc_grakn.Write, 'batch': grpc_grakn.Batch}
+
+# a query that may change the knowledge base, so invalidates the results of other queries when committed
+_WRITE_QUERY_PATTERN = re.compile(r'\b(insert|delete|define|undefine)\b')
+
+# parses a page of query results, given the labels and values of their concepts
+_PageParser = Callable[[List[grpc_grakn.QueryResult], Dict[str, str], Dict[str, Any]], List[Any]]
+
+# how many answers have their concepts resolved together
+_RESOLVE_PAGE_SIZE = 1000
+
+# cancels the call of a transaction whose open response has not arrived by a second past its deadline
+_OPEN_WATCHDOG = CallWatchdog(grace=1.0)
+
+
+def _is_schema_query(query: str) -> bool:
+    return query.lstrip().startswith(_SCHEMA_QUERY_KEYWORDS)
+
+
+def _is_write_query(query: str) -> bool:
+    return _WRITE_QUERY_PATTERN.search(query) is not None
+
+
+def _query_tx_type(query: str, tx_type: Optional[str]) -> str:
+    """Return the type of transaction to execute a query in, which is a read transaction unless it may write"""
+    if tx_type is not None:
+        return tx_type
+    return 'write' if _is_write_query(query) else 'read'
+
+
+def _execute_cached(result_cache: Optional[LRUCache[Tuple, Any]], key: Tuple, query: str,
+                    execute: Callable[[], Any]) -> Any:
+    """Return the cached result of a read query, or execute it and cache its result"""
+    if result_cache is None or _is_write_query(query):
+        return execute()
+
+    result = result_cache.get(key)
+
+    if result is None:
+        # a write committed while the query runs may not be reflected in its result, so it is not cached
+        generation = result_cache.generation
+        result = execute()
+        result_cache.put(key, result, generation)
+
+    return result
+
 
 def _next_response(responses: Iterator[TxResponse]) -> TxResponse:
     try:
@@ -22,180 +90,931 @@ def _next_response(responses: Iterator[TxResponse]) -> TxResponse:
         _raise_grpc_error(e)
 
 
-class GraknTx:
-    """A transaction against a knowledge graph. The transaction ends when its surrounding context closes."""
+def _open_request(keyspace: str, tx_type: str = 'write') -> TxRequest:
+    if tx_type not in _TX_TYPES:
+        raise ValueError(f'tx_type must be one of {", ".join(_TX_TYPES)}, but was {tx_type!r}')
+
+    keyspace = grpc_grakn.Keyspace(value=keyspace)
+    return TxRequest(open=grpc_grakn.Open(keyspace=keyspace, txType=_TX_TYPES[tx_type]))
+
+
+def _exec_query_request(query: str, infer: Optional[bool]) -> TxRequest:
+    grpc_infer = grpc_grakn.Infer(value=infer) if infer is not None else None
+    return TxRequest(execQuery=grpc_grakn.ExecQuery(query=grpc_grakn.Query(value=query), infer=grpc_infer))
+
+
+def _concept_method_requests(cids: Iterable[grpc_concept.ConceptId],
+                             concept_method: grpc_concept.ConceptMethod) -> Dict[str, TxRequest]:
+    """Return a request to run the concept method on each distinct concept, keyed by concept id"""
+    return {cid.value: TxRequest(runConceptMethod=grpc_grakn.RunConceptMethod(id=cid, conceptMethod=concept_method))
+            for cid in cids}
+
+
+def _concepts_to_resolve(results: List[grpc_grakn.QueryResult]) -> Tuple[List[grpc_concept.ConceptId],
+                                                                          List[grpc_concept.ConceptId]]:
+    """Return the ids of the concepts in the results that need a label, and of those that need a value"""
+    concepts = [concept for result in results for concept in result.answer.answer.values()]
+    label_cids = [concept.id for concept in concepts if concept.baseType in _SCHEMA_CONCEPT_BASE_TYPES]
+    value_cids = [concept.id for concept in concepts if concept.baseType == grpc_concept.Attribute]
+    return label_cids, value_cids
+
+
+def _parse_page(results: List[grpc_grakn.QueryResult], labels: Dict[str, str], values: Dict[str, Any]) -> List[Any]:
+    return [_parse_result(result, labels, values) for result in results]
+
+
+def _parse_result(result: grpc_grakn.QueryResult, labels: Dict[str, str], values: Dict[str, Any]) -> Any:
+    if result.HasField('otherResult'):
+        return json.loads(result.otherResult)
+    else:
+        answer = result.answer.answer
+        return {var: _parse_concept(answer[var], labels, values) for var in answer}
+
+
+def _parse_concept(concept: grpc_concept.Concept, labels: Dict[str, str], values: Dict[str, Any]) -> Dict:
+    concept_dict = {'id': concept.id.value}
+
+    if concept.baseType in _SCHEMA_CONCEPT_BASE_TYPES:
+        concept_dict['label'] = labels[concept.id.value]
+
+    if concept.baseType == grpc_concept.Attribute:
+        concept_dict['value'] = values[concept.id.value]
+
+    return concept_dict
+
+
+def _convert_value(value: grpc_concept.AttributeValue) -> Any:
+    if value.HasField('string'):
+        return value.string
+    elif value.HasField('boolean'):
+        return value.boolean
+    elif value.HasField('integer'):
+        return value.integer
+    elif value.HasField('long'):
+        return value.long
+    elif value.HasField('float'):
+        return value.float
+    elif value.HasField('double'):
+        return value.double
+    elif value.HasField('date'):
+        return value.date
+
+
+class _AnswerTableBuilder:
+    """Parses pages of query results into the rows of an AnswerTable, sharing a Concept between the rows it is in"""
+
+    def __init__(self) -> None:
+        self.header: Optional[Tuple[str, ...]] = None
+        self._concepts: Dict[str, Concept] = {}
+
+    def parse_page(self, results: List[grpc_grakn.QueryResult], labels: Dict[str, str],
+                   values: Dict[str, Any]) -> List[Tuple[Concept, ...]]:
+        rows = []
+
+        for result in results:
+            answer = result.answer.answer
+            if self.header is None:
+                self.header = tuple(answer)
+            rows.append(tuple(self._concept(answer[var], labels, values) for var in self.header))
+
+        return rows
+
+    def _concept(self, concept: grpc_concept.Concept, labels: Dict[str, str], values: Dict[str, Any]) -> Concept:
+        cid = concept.id.value
+        parsed = self._concepts.get(cid)
+
+        if parsed is None:
+            parsed = Concept(cid, concept.baseType, labels.get(cid), values.get(cid))
+            self._concepts[cid] = parsed
+
+        return parsed
+
+    def table(self, rows: List[Tuple[Concept, ...]]) -> AnswerTable:
+        return AnswerTable(self.header or (), rows)
+
+
+class _LazyAnswerBuilder:
+    """Parses pages of query results into answers of Concept handles, without the labels or values of the concepts
+
+    Answers are tuples in the order of `header` if `compact`, or dictionaries otherwise. A concept that appears in
+    several answers is the same handle in each of them.
+    """
+
+    def __init__(self, handle: Callable[[grpc_concept.Concept], Concept], compact: bool) -> None:
+        self.header: Optional[Tuple[str, ...]] = None
+        self._handle = handle
+        self._compact = compact
+        self._concepts: Dict[str, Concept] = {}
+
+    def parse_page(self, results: List[grpc_grakn.QueryResult], labels: Dict[str, str],
+                   values: Dict[str, Any]) -> List[Any]:
+        parsed = []
+
+        for result in results:
+            if result.HasField('otherResult'):
+                parsed.append(json.loads(result.otherResult))
+                continue
+
+            answer = result.answer.answer
+            if not self._compact:
+                parsed.append({var: self._concept(answer[var]) for var in answer})
+                continue
+
+            if self.header is None:
+                self.header = tuple(answer)
+            parsed.append(tuple(self._concept(answer[var]) for var in self.header))
+
+        return parsed
+
+    def table(self, rows: List[Tuple[Concept, ...]]) -> AnswerTable:
+        return AnswerTable(self.header or (), rows)
+
+    def _concept(self, concept: grpc_concept.Concept) -> Concept:
+        handle = self._concepts.get(concept.id.value)
+
+        if handle is None:
+            handle = self._concepts[concept.id.value] = self._handle(concept)
+
+        return handle
+
+
+class _BaseGraknTx:
+    """The state of a transaction that does not depend on how it talks to the server"""
+
+    def __init__(self, shared_label_cache: Optional[LRUCache[str, str]], prefetch: int,
+                 result_cache: Optional[LRUCache[Tuple, Any]] = None, tx_type: str = 'write',
+                 recorder: Optional[TxRecorder] = None) -> None:
+        self.tx_type = tx_type
+        self.prefetch = prefetch
+        self.label_cache: LRUCache[str, str] = LRUCache()
+        self._shared_label_cache = shared_label_cache
+        self._result_cache = result_cache
+        self._schema_modified = False
+        self._data_modified = False
+        self._closed = False
+        self._recorder = recorder
 
-    def __init__(self, requests: BlockingIter[TxRequest], responses: Iterator[TxResponse]) -> None:
+    def _on_query(self, query: str) -> None:
+        if _is_schema_query(query):
+            self._schema_modified = True
+            self.label_cache.clear()
+
+        if _is_write_query(query):
+            self._data_modified = True
+
+    def _on_commit(self) -> None:
+        if self._data_modified:
+            if self._result_cache is not None:
+                self._result_cache.clear()
+            self._data_modified = False
+
+        if self._schema_modified:
+            if self._shared_label_cache is not None:
+                self._shared_label_cache.clear()
+            self._schema_modified = False
+
+    def _cached_labels(self, cids: Iterable[grpc_concept.ConceptId]) -> Tuple[Dict[str, str],
+                                                                               List[grpc_concept.ConceptId]]:
+        """Return the cached labels of the distinct concepts, and the ids of the concepts without one"""
+        labels = {}
+        uncached_cids = []
+
+        for cid in {cid.value: cid for cid in cids}.values():
+            label = self._cached_label(cid.value)
+            if label is not None:
+                labels[cid.value] = label
+            else:
+                uncached_cids.append(cid)
+
+        return labels, uncached_cids
+
+    def _cached_label(self, cid: str) -> Optional[str]:
+        label = self.label_cache.get(cid)
+
+        if label is None and self._shared_label_cache is not None:
+            label = self._shared_label_cache.get(cid)
+            if label is not None:
+                self.label_cache.put(cid, label)
+
+        return label
+
+    def _cache_label(self, cid: str, label: str) -> None:
+        self.label_cache.put(cid, label)
+        # labels seen after an uncommitted schema change may not be visible to other transactions
+        if self._shared_label_cache is not None and not self._schema_modified:
+            self._shared_label_cache.put(cid, label)
+
+
+class GraknTx(_BaseGraknTx):
+    """A transaction against a knowledge graph. The transaction ends when its surrounding context closes.
+
+    Labels of schema concepts are cached in `label_cache` for the lifetime of the transaction.
+
+    Queries keep up to `prefetch` `Next` requests in flight while receiving answers, unless they specify otherwise.
+
+    Lazy queries return Concept handles without fetching the labels and values of their concepts. Reading the label
+    or value of a handle fetches those of every handle of the transaction still missing them, in one batch.
+    """
+
+    def __init__(self, requests: BlockingIter[TxRequest], responses: Iterator[TxResponse],
+                 shared_label_cache: Optional[LRUCache[str, str]] = None, prefetch: int = 1,
+                 result_cache: Optional[LRUCache[Tuple, Any]] = None, tx_type: str = 'write',
+                 recorder: Optional[TxRecorder] = None) -> None:
+        super().__init__(shared_label_cache, prefetch, result_cache, tx_type, recorder)
         self._requests = requests
         self._responses = responses
+        self._unfetched: List[Tuple[LazyConcept, grpc_concept.ConceptId]] = []
+        self._read_ahead: Optional[Callable[[], None]] = None
+
+    def _send(self, request: TxRequest) -> None:
+        if self._recorder is not None:
+            self._recorder.sent(request)
+        self._requests.add(request)
 
     def _next_response(self) -> TxResponse:
-        return _next_response(self._responses)
+        response = _next_response(self._responses)
+        if self._recorder is not None:
+            self._recorder.received(response)
+        return response
 
-    def execute(self, query: str, *, infer: Optional[bool] = None) -> Any:
+    def execute(self, query: str, *, infer: Optional[bool] = None, prefetch: Optional[int] = None,
+                compact: bool = False, lazy: bool = False) -> Any:
         """Execute a Graql query against the knowledge base
 
         :param query: the Graql query string to execute against the knowledge base
         :param infer: enable inference
+        :param prefetch: how many answers to request ahead of receiving them
+        :param compact: return answers as an AnswerTable, rather than a list of dictionaries
+        :param lazy: return answers of Concept handles, whose labels and values are only fetched when first read
         :return: a list of query results
 
         :raises: GraknError, GraknConnectionError
         """
-        grpc_infer = grpc_grakn.Infer(value=infer) if infer is not None else None
-        request = TxRequest(execQuery=grpc_grakn.ExecQuery(query=grpc_grakn.Query(value=query), infer=grpc_infer))
-        self._requests.add(request)
-
-        response = self._next_response()
+        response = self._exec_query(query, infer)
+        builder = self._builder(compact, lazy)
+        parse_page = builder.parse_page if builder is not None else _parse_page
 
         if response.HasField('done'):
             return
         elif response.HasField('queryResult'):
-            return self._parse_result(response.queryResult)
+            if compact and response.queryResult.HasField('answer'):
+                return builder.table(self._parse_results([response.queryResult], parse_page, not lazy))
+            return self._parse_results([response.queryResult], parse_page if lazy else _parse_page, not lazy)[0]
+        elif response.HasField('iteratorId'):
+            page_size = _RESOLVE_PAGE_SIZE
+            results = list(self._iterate_results(response.iteratorId, page_size, prefetch or self.prefetch, parse_page,
+                                                 not lazy))
+            return builder.table(results) if compact else results
+
+    def execute_columns(self, query: str, *, infer: Optional[bool] = None, prefetch: Optional[int] = None) -> Columns:
+        """Execute a Graql query against the knowledge base, collecting its answers into columns
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param prefetch: how many answers to request ahead of receiving them
+        :return: the ids, labels and values of the concepts of each variable, as columns
+
+        :raises: GraknError, GraknConnectionError
+        """
+        response = self._exec_query(query, infer)
+        builder = ColumnBuilder()
+
+        if response.HasField('queryResult'):
+            self._parse_results([response.queryResult], builder.parse_page)
         elif response.HasField('iteratorId'):
-            return self._collect_results(response.iteratorId)
+            results = self._iterate_results(response.iteratorId, _RESOLVE_PAGE_SIZE, prefetch or self.prefetch,
+                                            builder.parse_page)
+            for _ in results:
+                pass
+
+        return builder.build()
+
+    def execute_iter(self, query: str, *, infer: Optional[bool] = None, page_size: int = 1,
+                     prefetch: Optional[int] = None, lazy: bool = False) -> Iterator[Any]:
+        """Execute a Graql query against the knowledge base, receiving its results as they are consumed
 
-    def _collect_results(self, iterator_id: IteratorId) -> List[Any]:
-        query_results = []
+        Only one page of answers, plus any answers requested ahead, is held in memory at a time. If the returned
+        iterator is closed before it is exhausted, the server is told to stop producing answers.
 
-        while True:
-            next_request = TxRequest(next=Next(iteratorId=iterator_id))
-            self._requests.add(next_request)
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param page_size: how many answers to receive before resolving the labels and values of their concepts
+        :param prefetch: how many answers to request ahead of receiving them
+        :param lazy: yield answers of Concept handles, whose labels and values are only fetched when first read
+        :return: an iterator of query results
+
+        :raises: GraknError, GraknConnectionError
+        """
+        response = self._exec_query(query, infer)
+        return self._iterate_response(response, page_size, prefetch or self.prefetch, lazy)
+
+    def execute_batch(self, queries: Iterable[str], *, infer: Optional[bool] = None) -> int:
+        """Execute many Graql queries against the knowledge base, without parsing their results
+
+        Every query is sent before waiting for any response, then the answers of all of them are requested together,
+        so the whole batch takes a few round trips rather than a few per query.
+
+        :param queries: the Graql query strings to execute against the knowledge base
+        :param infer: enable inference
+        :return: the number of answers to all the queries
+
+        :raises: GraknError, GraknConnectionError
+        """
+        self._receive_read_ahead()
+        sent = 0
+        for query in queries:
+            self._on_query(query)
+            self._send(_exec_query_request(query, infer))
+            sent += 1
+
+        iterator_ids = []
+        answers = 0
+
+        for _ in range(sent):
             response = self._next_response()
+            if response.HasField('iteratorId'):
+                iterator_ids.append(response.iteratorId)
+            elif response.HasField('queryResult'):
+                answers += 1
 
-            if response.HasField('done'):
-                break
-            else:
-                query_results.append(response.queryResult)
+        # an insert query only takes effect as its answers are iterated, so every iterator must be exhausted
+        while iterator_ids:
+            for iterator_id in iterator_ids:
+                self._send(TxRequest(next=Next(iteratorId=iterator_id)))
 
-        return [self._parse_result(query_result) for query_result in query_results]
+            responses = [self._next_response() for _ in iterator_ids]
+            iterator_ids = [iterator_id for iterator_id, response in zip(iterator_ids, responses)
+                            if not response.HasField('done')]
+            answers += len(iterator_ids)
 
-    def _parse_result(self, result: grpc_grakn.QueryResult) -> Any:
-        if result.HasField('otherResult'):
-            return json.loads(result.otherResult)
-        else:
-            answer = result.answer.answer
-            return {var: self._parse_concept(answer[var]) for var in answer}
+        return answers
 
-    def _parse_concept(self, concept: grpc_concept.Concept) -> Dict:
-        concept_dict = {'id': concept.id.value}
+    def _exec_query(self, query: str, infer: Optional[bool]) -> TxResponse:
+        self._on_query(query)
+        self._receive_read_ahead()
+        self._send(_exec_query_request(query, infer))
+        return self._next_response()
 
-        if concept.baseType in _SCHEMA_CONCEPT_BASE_TYPES:
-            concept_dict['label'] = self._get_label(concept.id)
+    def _iterate_response(self, response: TxResponse, page_size: int, prefetch: int,
+                          lazy: bool = False) -> Iterator[Any]:
+        parse_page = self._builder(False, lazy).parse_page if lazy else _parse_page
 
-        if concept.baseType == grpc_concept.Attribute:
-            concept_dict['value'] = self._get_value(concept.id)
+        if response.HasField('queryResult'):
+            yield self._parse_results([response.queryResult], parse_page, not lazy)[0]
+        elif response.HasField('iteratorId'):
+            yield from self._iterate_results(response.iteratorId, page_size, prefetch, parse_page, not lazy)
 
-        return concept_dict
+    def _builder(self, compact: bool, lazy: bool) -> Optional[Union[_AnswerTableBuilder, _LazyAnswerBuilder]]:
+        if lazy:
+            return _LazyAnswerBuilder(self._concept_handle, compact)
+        return _AnswerTableBuilder() if compact else None
 
-    def _get_label(self, cid: grpc_concept.ConceptId) -> str:
-        concept_method = grpc_concept.ConceptMethod(getLabel=grpc_concept.Unit())
-        request = TxRequest(runConceptMethod=grpc_grakn.RunConceptMethod(id=cid, conceptMethod=concept_method))
-        self._requests.add(request)
-        response = self._next_response()
-        return response.conceptResponse.label.value
+    def _iterate_results(self, iterator_id: IteratorId, page_size: int, prefetch: int,
+                         parse_page: _PageParser = _parse_page, resolve: bool = True) -> Iterator[Any]:
+        next_request = TxRequest(next=Next(iteratorId=iterator_id))
+        query_results: Deque[grpc_grakn.QueryResult] = deque()
+        read_ahead = max(page_size, prefetch)
+        in_flight = 0
+        exhausted = False
 
-    def _get_value(self, cid: grpc_concept.ConceptId) -> Any:
-        concept_method = grpc_concept.ConceptMethod(getValue=grpc_concept.Unit())
-        request = TxRequest(runConceptMethod=grpc_grakn.RunConceptMethod(id=cid, conceptMethod=concept_method))
-        self._requests.add(request)
+        def request_more() -> None:
+            nonlocal in_flight
+            while not exhausted and in_flight < prefetch and len(query_results) + in_flight < read_ahead:
+                self._send(next_request)
+                in_flight += 1
+            self._read_ahead = receive_in_flight
+
+        def receive() -> None:
+            nonlocal in_flight, exhausted
+            exhausted = not self._receive_query_result(query_results) or exhausted
+            in_flight -= 1
+
+        def receive_in_flight() -> None:
+            while in_flight > 0:
+                receive()
+
+        try:
+            while True:
+                # only one iterator of the transaction has next requests in flight at a time
+                if self._read_ahead is not receive_in_flight:
+                    self._receive_read_ahead()
+
+                request_more()
+                while len(query_results) < page_size and in_flight > 0:
+                    receive()
+                    # one more next request for each answer received, until the iterator is done
+                    request_more()
+
+                page = [query_results.popleft() for _ in range(min(page_size, len(query_results)))]
+                yield from self._parse_results(page, parse_page, resolve)
+
+                if exhausted and not query_results:
+                    return
+        except GeneratorExit:
+            # once the transaction is closed, the server has already released the iterator
+            if not exhausted and not self._closed:
+                self._stop_iterator(iterator_id)
+            raise
+
+    def _receive_read_ahead(self) -> None:
+        """Receive the answers still in flight of the iterator reading ahead, as the responses to any other request
+        queue behind them"""
+        receive = self._read_ahead
+        if receive is not None:
+            self._read_ahead = None
+            receive()
+
+    def _receive_query_result(self, query_results: Deque[grpc_grakn.QueryResult]) -> bool:
+        """Receive the response to a next request, returning False if the iterator is exhausted"""
         response = self._next_response()
-        return self._convert_value(response.conceptResponse.attributeValue)
-
-    def _convert_value(self, value: grpc_concept.AttributeValue) -> Any:
-        if value.HasField('string'):
-            return value.string
-        elif value.HasField('boolean'):
-            return value.boolean
-        elif value.HasField('integer'):
-            return value.integer
-        elif value.HasField('long'):
-            return value.long
-        elif value.HasField('float'):
-            return value.float
-        elif value.HasField('double'):
-            return value.double
-        elif value.HasField('date'):
-            return value.date
+
+        if response.HasField('done'):
+            return False
+        else:
+            query_results.append(response.queryResult)
+            return True
+
+    def _stop_iterator(self, iterator_id: IteratorId) -> None:
+        self._receive_read_ahead()
+        self._send(TxRequest(stop=Stop(iteratorId=iterator_id)))
+        self._next_response()
+
+    def _parse_results(self, results: List[grpc_grakn.QueryResult], parse_page: _PageParser = _parse_page,
+                       resolve: bool = True) -> List[Any]:
+        """Parse a page of query results, resolving the labels and values of all their concepts together unless
+        `resolve` is False"""
+        if resolve:
+            label_cids, value_cids = _concepts_to_resolve(results)
+            labels, values = self._get_labels_and_values(label_cids, value_cids)
+        else:
+            labels, values = {}, {}
+
+        if self._recorder is None:
+            return parse_page(results, labels, values)
+
+        start = time.perf_counter()
+        parsed = parse_page(results, labels, values)
+        self._recorder.parsed(time.perf_counter() - start)
+        return parsed
+
+    def _concept_handle(self, concept: grpc_concept.Concept) -> Concept:
+        """Return a handle to a concept, which fetches its label or value when first read if it has one"""
+        if concept.baseType not in _SCHEMA_CONCEPT_BASE_TYPES and concept.baseType != grpc_concept.Attribute:
+            return Concept(concept.id.value, concept.baseType)
+
+        handle = LazyConcept(concept.id.value, concept.baseType, self._fetch_concepts)
+        self._unfetched.append((handle, concept.id))
+        return handle
+
+    def _fetch_concepts(self) -> None:
+        """Fetch the labels and values of every lazy concept of the transaction that is missing them"""
+        if self._closed:
+            raise GraknError('the transaction of the concept is closed, so its label and value cannot be fetched')
+
+        unfetched = self._unfetched
+        labels, values = self._get_labels_and_values(
+            (cid for handle, cid in unfetched if handle.base_type in _SCHEMA_CONCEPT_BASE_TYPES),
+            (cid for handle, cid in unfetched if handle.base_type == grpc_concept.Attribute))
+        self._unfetched = []
+
+        for handle, cid in unfetched:
+            handle._fetched(labels.get(cid.value), values.get(cid.value))
+
+    def _get_labels_and_values(self, label_cids: Iterable[grpc_concept.ConceptId],
+                               value_cids: Iterable[grpc_concept.ConceptId]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """Return the labels and values of the distinct concepts, sending every request before waiting for any
+        response"""
+        labels, uncached_cids = self._cached_labels(label_cids)
+        label_requests = _concept_method_requests(uncached_cids, _GET_LABEL)
+        value_requests = _concept_method_requests(value_cids, _GET_VALUE)
+
+        if label_requests or value_requests:
+            self._receive_read_ahead()
+        for request in itertools.chain(label_requests.values(), value_requests.values()):
+            self._send(request)
+
+        # responses arrive in the same order the requests were sent
+        for cid in label_requests:
+            labels[cid] = self._next_response().conceptResponse.label.value
+            self._cache_label(cid, labels[cid])
+
+        values = {cid: _convert_value(self._next_response().conceptResponse.attributeValue) for cid in value_requests}
+        return labels, values
 
     def commit(self) -> None:
-        """Commit the transaction."""
-        self._requests.add(TxRequest(commit=grpc_grakn.Commit()))
+        """Commit the transaction. A read transaction has nothing to commit, so this does nothing."""
+        if self.tx_type == 'read':
+            return
+
+        self._receive_read_ahead()
+        self._send(TxRequest(commit=grpc_grakn.Commit()))
         self._next_response()
+        self._on_commit()
+
+    def _close(self) -> None:
+        self._closed = True
+        self._requests.close()
+
+
+class _ResponseDispatcher:
+    """Receives the responses of a Tx stream on a thread of its own, completing the future of each request with them
+
+    The server answers the requests of a transaction in the order they were sent, so each response completes the
+    oldest future without one.
+    """
+
+    def __init__(self, requests: BlockingIter[TxRequest], responses: Iterator[TxResponse],
+                 recorder: Optional[TxRecorder] = None) -> None:
+        self._requests = requests
+        self._responses = responses
+        self._recorder = recorder
+        self._lock = threading.Lock()
+        self._waiting: Deque[Future] = deque()
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._receive, name='grakn-tx-responses', daemon=True)
+        self._thread.start()
+
+    def send(self, request: TxRequest) -> Future:
+        """Send a request, returning a future of its response"""
+        future: Future = Future()
+
+        # requests are sent in the order their futures are queued, even when sent by many threads
+        with self._lock:
+            if self._error is not None:
+                future.set_exception(self._error)
+                return future
+
+            if self._recorder is not None:
+                self._recorder.sent(request)
+            self._waiting.append(future)
+            self._requests.add(request)
+
+        return future
+
+    def close(self) -> None:
+        """Close the stream, failing any request sent afterwards"""
+        with self._lock:
+            if self._error is None:
+                self._error = GraknError('the transaction is closed')
+            self._requests.close()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until the server has closed the stream"""
+        self._thread.join(timeout)
+
+    def _receive(self) -> None:
+        try:
+            for response in self._responses:
+                if self._recorder is not None:
+                    self._recorder.received(response)
+                with self._lock:
+                    future = self._waiting.popleft()
+                future.set_result(response)
+            error: Exception = GraknError('the transaction is closed')
+        except grpc.RpcError as e:
+            try:
+                _raise_grpc_error(e)
+            except Exception as raised:
+                error = raised
+
+        with self._lock:
+            self._error = self._error or error
+            waiting, self._waiting = self._waiting, deque()
+
+        for future in waiting:
+            future.set_exception(error)
+
+
+class MultiplexedGraknTx(GraknTx):
+    """A GraknTx that many threads can use at once, sharing one stream to the server
+
+    A thread of the transaction receives every response, and hands it to the thread that sent its request. Each thread
+    receives the responses to its own requests in the order it sent them, so the queries, iterators and lazy concepts
+    of many threads can be in progress together.
+
+    If the server fails the transaction, every thread waiting on it, and any that uses it afterwards, raises the error.
+    Queries still in progress on other threads when the transaction is committed fail once it closes.
+    """
+
+    def __init__(self, requests: BlockingIter[TxRequest], responses: Iterator[TxResponse],
+                 shared_label_cache: Optional[LRUCache[str, str]] = None, prefetch: int = 1,
+                 result_cache: Optional[LRUCache[Tuple, Any]] = None, tx_type: str = 'write',
+                 recorder: Optional[TxRecorder] = None) -> None:
+        self._thread_state = threading.local()
+        super().__init__(requests, responses, shared_label_cache, prefetch, result_cache, tx_type, recorder)
+        self._dispatcher = _ResponseDispatcher(requests, responses, recorder)
+        self._fetch_lock = threading.Lock()
+
+    @property  # type: ignore
+    def _read_ahead(self) -> Optional[Callable[[], None]]:
+        """Receives the answers in flight of an iterator of the current thread, as each thread has its own responses"""
+        return getattr(self._thread_state, 'read_ahead', None)
+
+    @_read_ahead.setter
+    def _read_ahead(self, receive: Optional[Callable[[], None]]) -> None:
+        self._thread_state.read_ahead = receive
+
+    def _pending(self) -> Deque[Future]:
+        """Return the futures of the responses the current thread has not received yet"""
+        pending = getattr(self._thread_state, 'pending', None)
+        if pending is None:
+            pending = self._thread_state.pending = deque()
+        return pending
+
+    def _send(self, request: TxRequest) -> None:
+        self._pending().append(self._dispatcher.send(request))
+
+    def _next_response(self) -> TxResponse:
+        return self._pending().popleft().result()
+
+    def _close(self) -> None:
+        self._closed = True
+        self._dispatcher.close()
+
+    def _concept_handle(self, concept: grpc_concept.Concept) -> Concept:
+        with self._fetch_lock:
+            return super()._concept_handle(concept)
+
+    def _fetch_concepts(self) -> None:
+        # handles created by other threads while fetching would be forgotten when the fetched handles are cleared
+        with self._fetch_lock:
+            super()._fetch_concepts()
 
 
 class GraknTxContext:
     """Contains a GraknTx. This should be used in a `with` statement in order to retrieve the GraknTx"""
 
-    def __init__(self, keyspace: str, stub: grakn_pb2_grpc.GraknStub, timeout) -> None:
+    def __init__(self, keyspace: str, stub: grakn_pb2_grpc.GraknStub, timeout,
+                 label_cache: Optional[LRUCache[str, str]] = None, prefetch: int = 1,
+                 result_cache: Optional[LRUCache[Tuple, Any]] = None, tx_type: str = 'write',
+                 listener: Optional[Listener] = None, channel_options: Optional[ChannelOptions] = None,
+                 multiplexed: bool = False) -> None:
+        open_request = _open_request(keyspace, tx_type)
+        call_options = channel_options.call_options() if channel_options is not None else {}
+        self._recorder = TxRecorder(listener, keyspace, tx_type) if listener is not None else None
         self._requests: BlockingIter = BlockingIter()
 
         try:
-            self._responses: Iterator[TxResponse] = stub.Tx(self._requests, timeout=timeout)
+            self._responses: Iterator[TxResponse] = stub.Tx(self._requests, timeout=timeout, **call_options)
         except grpc.RpcError as e:
             _raise_grpc_error(e)
 
-        request = TxRequest(open=grpc_grakn.Open(keyspace=grpc_grakn.Keyspace(value=keyspace), txType=grpc_grakn.Write))
-        self._requests.add(request)
-
-        # wait for response from "open"
-        _next_response(self._responses)
+        tx_class = MultiplexedGraknTx if multiplexed else GraknTx
+        self._tx = tx_class(self._requests, self._responses, label_cache, prefetch, result_cache, tx_type,
+                            self._recorder)
+        self._tx._send(open_request)
 
-        self._tx = GraknTx(self._requests, self._responses)
+        # wait for response from "open". gRPC can miss the deadline of a call started as the server goes away
+        watched = _OPEN_WATCHDOG.watch(self._responses, timeout) if timeout else None
+        try:
+            self._tx._next_response()
+        finally:
+            if watched is not None:
+                _OPEN_WATCHDOG.unwatch(watched)
 
     def __enter__(self) -> GraknTx:
         return self._tx
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        self._requests.close()
-        # we ask for another response. This tells gRPC we are done
+        self._tx._close()
         try:
-            _next_response(self._responses)
+            if isinstance(self._tx, MultiplexedGraknTx):
+                # the stream is already being read until the server closes it
+                self._tx._dispatcher.join()
+            else:
+                # we ask for another response. This tells gRPC we are done
+                _next_response(self._responses)
         except StopIteration:
             pass
+        finally:
+            if self._recorder is not None:
+                self._recorder.close()
 
 
-class Client:
-    """Client to a Grakn knowledge base, identified by a uri and a keyspace."""
-
-    DEFAULT_URI: str = 'localhost:48555'
-    DEFAULT_KEYSPACE: str = 'grakn'
-    DEFAULT_TIMEOUT = 60
+class _BaseClient:
+    """The queries of a client that do not depend on how it opens transactions
 
-    def __init__(self, uri: str = DEFAULT_URI, keyspace: str = DEFAULT_KEYSPACE, *,
-                 timeout: int = DEFAULT_TIMEOUT) -> None:
-        channel = grpc.insecure_channel(uri)
+    Subclasses provide `open`, `_before_retry` and the `keyspace`, `result_cache` and `retry` attributes.
+    """
 
-        # wait for connection to be ready
-        try:
-            grpc.channel_ready_future(channel).result(timeout)
-        except grpc.FutureTimeoutError as e:
-            raise ConnectionError from e
+    keyspace: str
+    result_cache: Optional[LRUCache[Tuple, Any]]
+    retry: Optional[RetryPolicy]
 
-        self._stub = grakn_pb2_grpc.GraknStub(channel)
-        self._timeout = timeout
-        self.uri = uri
-        self.keyspace = keyspace
+    def open(self, *, timeout: Optional[float] = None, tx_type: str = 'write') -> Any:
+        raise NotImplementedError
 
-    def execute(self, query: str, *, infer: Optional[bool] = None) -> Any:
+    def execute(self, query: str, *, infer: Optional[bool] = None, prefetch: Optional[int] = None,
+                timeout: Optional[float] = None, compact: bool = False, lazy: bool = False, cache: bool = True,
+                tx_type: Optional[str] = None) -> Any:
         """Execute and commit a Graql query against the knowledge base
 
         :param query: the Graql query string to execute against the knowledge base
         :param infer: enable inference
+        :param prefetch: how many answers to request ahead of receiving them
+        :param timeout: seconds before the transaction is abandoned, instead of the timeout of the client
+        :param compact: return answers as an AnswerTable, rather than a list of dictionaries
+        :param lazy: return answers of Concept handles without their labels and values. The transaction is closed on
+            return, so only the ids and base types of the concepts can be read
+        :param cache: use `result_cache`, if the client has one
+        :param tx_type: 'read', 'write' or 'batch'. By default, a read transaction unless the query can write
         :return: a list of query results
 
         :raises: GraknError, GraknConnectionError
         """
-        with self.open() as tx:
-            result = tx.execute(query, infer=infer)
+        def execute() -> Any:
+            return self._run(lambda tx: tx.execute(query, infer=infer, prefetch=prefetch, compact=compact, lazy=lazy),
+                             timeout, _query_tx_type(query, tx_type))
+
+        result_cache = self.result_cache if cache else None
+        return _execute_cached(result_cache, (self.keyspace, query, infer, compact, lazy), query, execute)
+
+    def execute_columns(self, query: str, *, infer: Optional[bool] = None, prefetch: Optional[int] = None,
+                        timeout: Optional[float] = None, tx_type: Optional[str] = None) -> Columns:
+        """Execute and commit a Graql query against the knowledge base, collecting its answers into columns
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param prefetch: how many answers to request ahead of receiving them
+        :param timeout: seconds before the transaction is abandoned, instead of the timeout of the client
+        :param tx_type: 'read', 'write' or 'batch'. By default, a read transaction unless the query can write
+        :return: the ids, labels and values of the concepts of each variable, as columns
+
+        :raises: GraknError, GraknConnectionError
+        """
+        return self._run(lambda tx: tx.execute_columns(query, infer=infer, prefetch=prefetch),
+                         timeout, _query_tx_type(query, tx_type))
+
+    def execute_iter(self, query: str, *, infer: Optional[bool] = None, page_size: int = 1,
+                     prefetch: Optional[int] = None, lazy: bool = False,
+                     tx_type: Optional[str] = None) -> Iterator[Any]:
+        """Execute and commit a Graql query against the knowledge base, receiving its results as they are consumed
+
+        The transaction stays open while the returned iterator is in use, and is only committed once it is exhausted.
+
+        :param query: the Graql query string to execute against the knowledge base
+        :param infer: enable inference
+        :param page_size: how many answers to receive before resolving the labels and values of their concepts
+        :param prefetch: how many answers to request ahead of receiving them
+        :param lazy: yield answers of Concept handles, whose labels and values are only fetched when first read, until
+            the iterator is exhausted
+        :param tx_type: 'read', 'write' or 'batch'. By default, a read transaction unless the query can write
+        :return: an iterator of query results
+
+        :raises: GraknError, GraknConnectionError
+        """
+        with self.open(tx_type=_query_tx_type(query, tx_type)) as tx:
+            yield from tx.execute_iter(query, infer=infer, page_size=page_size, prefetch=prefetch, lazy=lazy)
             tx.commit()
-        return result
 
-    def open(self) -> GraknTxContext:
+    def load(self, queries: Iterable[str], *, batch_size: int = 1000, concurrency: int = 1,
+             infer: Optional[bool] = None, on_batch: Optional[Callable[['BatchResult'], None]] = None) -> 'LoadReport':
+        """Execute and commit many Graql queries, in batches that each have their own transaction
+
+        See `grakn.loader.load`.
+        """
+        from grakn.loader import load
+        return load(self, queries, batch_size=batch_size, concurrency=concurrency, infer=infer, on_batch=on_batch)
+
+    def execute_all(self, queries: Iterable[str], *, concurrency: int = 4, ordered: bool = True,
+                    max_in_flight: Optional[int] = None, infer: Optional[bool] = None,
+                    timeout: Optional[float] = None) -> Iterator['ExecutedQuery']:
+        """Execute and commit many independent Graql queries at once, each in its own transaction
+
+        See `grakn.executor.execute_all`.
+        """
+        from grakn.executor import execute_all
+        return execute_all(self, queries, concurrency=concurrency, ordered=ordered, max_in_flight=max_in_flight,
+                           infer=infer, timeout=timeout)
+
+    def _run(self, operation: Callable[[GraknTx], Any], timeout: Optional[float], tx_type: str) -> Any:
+        """Run an operation in a new transaction and commit it, retrying it under the retry policy of the client"""
+        return run_in_transaction(self.retry, lambda: self.open(timeout=timeout, tx_type=tx_type), operation,
+                                  before_retry=self._before_retry)
+
+    def _before_retry(self) -> None:
+        """Prepare to retry an operation that failed with a ConnectionError"""
+        raise NotImplementedError
+
+
+class Client(_BaseClient):
+    """Client to a Grakn knowledge base, identified by a uri and a keyspace.
+
+    If `label_cache_size` is positive, labels of schema concepts are cached in `label_cache` and shared by every
+    transaction opened by the client. The cache is cleared whenever a `define` or `undefine` query is committed.
+
+    `prefetch` is how many answers a query requests ahead of receiving them. Raising it trades a few wasted
+    `Next` requests at the end of each result for fewer round trips while receiving it.
+
+    If `result_cache_size` is positive, the results of read queries passed to `execute` are cached in
+    `result_cache`, for up to `result_cache_ttl` seconds if given. The cache is cleared whenever a transaction opened
+    by the client commits an `insert`, `delete`, `define` or `undefine` query. Writes made by other clients are only
+    seen once cached results expire. Cached results are shared by every caller, so should not be modified.
+
+    Queries that cannot write, such as `match ... get` and aggregate queries, are executed in a read transaction,
+    which is not committed, unless another `tx_type` is given.
+
+    If a `listener` is given, such as a `grakn.instrumentation.Stats`, it receives the timing and size of every
+    request made by the transactions of the client, and the totals of each transaction.
+
+    If a `retry` policy is given, `execute` and `execute_columns` retry a query that fails with a ConnectionError,
+    over a new channel if the old one does not recover. A query is not retried once its commit has been sent, as it
+    may have been committed, so only reads are retried after any failure.
+
+    `channel_options` tune the channel and the calls of its transactions, such as message size limits, keepalive and
+    compression. See `grakn.channel.ChannelOptions`.
+
+    By default, creating a client waits up to `timeout` seconds for its channel to connect. If `lazy_connect`, the
+    channel connects in the background instead, and the first transaction waits for it only if it is not connected
+    by then, until `timeout` seconds after the client was created.
+    """
+
+    DEFAULT_URI: str = 'localhost:48555'
+    DEFAULT_KEYSPACE: str = 'grakn'
+    DEFAULT_TIMEOUT = 60
+
+    def __init__(self, uri: str = DEFAULT_URI, keyspace: str = DEFAULT_KEYSPACE, *,
+                 timeout: int = DEFAULT_TIMEOUT, label_cache_size: int = 0, prefetch: int = 1,
+                 result_cache_size: int = 0, result_cache_ttl: Optional[float] = None,
+                 listener: Optional[Listener] = None, retry: Optional[RetryPolicy] = None,
+                 channel_options: Optional[ChannelOptions] = None, lazy_connect: bool = False) -> None:
+        self.channel_options = channel_options if channel_options is not None else ChannelOptions()
+        self._channel = insecure_channel(uri, self.channel_options)
+        self._connecting: Optional[Tuple[grpc.Future, float]] = None
+
+        ready = grpc.channel_ready_future(self._channel)
+        if lazy_connect:
+            self._connecting = (ready, time.monotonic() + timeout)
+        else:
+            # wait for connection to be ready
+            try:
+                ready.result(timeout)
+            except grpc.FutureTimeoutError as e:
+                raise ConnectionError from e
+
+        self._stub = grakn_pb2_grpc.GraknStub(self._channel)
+        self._timeout = timeout
+        self.uri = uri
+        self.retry = retry
+        self.keyspace = keyspace
+        self.prefetch = prefetch
+        self.listener = listener
+        self.label_cache: Optional[LRUCache[str, str]] = LRUCache(label_cache_size) if label_cache_size > 0 else None
+        self.result_cache: Optional[LRUCache[Tuple, Any]] = \
+            LRUCache(result_cache_size, result_cache_ttl) if result_cache_size > 0 else None
+
+    def open(self, *, timeout: Optional[float] = None, tx_type: str = 'write',
+             multiplexed: bool = False) -> GraknTxContext:
         """Open a transaction
 
+        :param timeout: seconds before the transaction is abandoned, instead of the timeout of the client
+        :param tx_type: 'read', 'write' or 'batch'. Queries in a read transaction cannot write, and are not committed
+        :param multiplexed: open a MultiplexedGraknTx, which many threads can use at once
         :return: a GraknTxContext that can be opened using a `with` statement
+
+        :raises: ValueError if `tx_type` is not a type of transaction
         """
-        return GraknTxContext(self.keyspace, self._stub, timeout=self._timeout)
+        if self._connecting is not None:
+            self._wait_until_connected()
+
+        return GraknTxContext(self.keyspace, self._stub, timeout=timeout if timeout is not None else self._timeout,
+                              label_cache=self.label_cache, prefetch=self.prefetch, result_cache=self.result_cache,
+                              tx_type=tx_type, listener=self.listener, channel_options=self.channel_options,
+                              multiplexed=multiplexed)
+
+    def _wait_until_connected(self) -> None:
+        """Wait for the channel of a lazily connected client to connect, until the deadline of its first connection"""
+        ready, deadline = self._connecting
+
+        try:
+            ready.result(max(0.0, deadline - time.monotonic()))
+        except grpc.FutureTimeoutError as e:
+            raise ConnectionError from e
+
+        self._connecting = None
+
+    def _before_retry(self) -> None:
+        self._reconnect()
+
+    def _reconnect(self) -> None:
+        """Replace the channel of the client if it does not become ready within the connect timeout of the policy
+
+        Transactions still open on the old channel fail once it is closed.
+        """
+        ready = grpc.channel_ready_future(self._channel)
+        try:
+            ready.result(self.retry.connect_timeout)
+            return
+        except grpc.FutureTimeoutError:
+            pass
+
+        old_channel = self._channel
+        old_connecting = self._connecting
+        self._connecting = None
+        self._channel = insecure_channel(self.uri, self.channel_options)
+        self._stub = grakn_pb2_grpc.GraknStub(self._channel)
+        close_channel(old_channel, ready, old_connecting[0] if old_connecting is not None else None)
+        self.retry.record_reconnect()
 
 
 class GraknError(Exception):
@@ -204,8 +1023,10 @@ class GraknError(Exception):
 
 
 def _raise_grpc_error(error: grpc.RpcError) -> Any:
-    """Convert an error message from gRPC into a GraknError or a ConnectionError"""
-    assert isinstance(error, grpc.Call)
+    """Convert an error message from gRPC into a GraknError or a ConnectionError
+
+    The error may come from a blocking call or from a call on an asyncio channel.
+    """
     error_type = next((value for (key, value) in error.trailing_metadata() if key == 'errortype'), None)
     if error_type is not None:
         raise GraknError(error.details()) from error
@@ -0,0 +1,285 @@
+"""Routing of transactions across several Grakn servers that serve the same knowledge base."""
+import threading
+import time
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import grpc
+
+import grakn_pb2_grpc
+from grakn.cache import LRUCache
+from grakn.channel import ChannelOptions, close_channel, insecure_channel
+from grakn.client import Client, GraknTx, GraknTxContext, _BaseClient
+from grakn.instrumentation import Listener
+from grakn.retry import RetryPolicy
+
+# how to choose the node of a new transaction
+LEAST_OUTSTANDING = 'least_outstanding'
+LATENCY = 'latency'
+_ROUTINGS = {LEAST_OUTSTANDING, LATENCY}
+
+# the weight of the newest sample in the moving averages of latency and error rate
+_DECAY = 0.1
+
+
+class NodeStats(NamedTuple):
+    """The state of one node of a cluster, as seen by the client
+
+    `latency` is a moving average of the seconds taken to open a transaction, or None before the first is opened.
+    `error_rate` is a moving average of the fraction of transactions that failed with a ConnectionError.
+    """
+    uri: str
+    healthy: bool
+    outstanding: int
+    transactions: int
+    latency: Optional[float]
+    error_rate: float
+
+
+class _Node:
+    """A server of a cluster, and the channel to it"""
+
+    def __init__(self, uri: str, options: ChannelOptions, probe_interval: float) -> None:
+        self.uri = uri
+        self.channel = insecure_channel(uri, options)
+        self.stub = grakn_pb2_grpc.GraknStub(self.channel)
+        self.probe_interval = probe_interval
+        self.probe: Optional[grpc.Future] = None
+        self.probe_after = 0.0
+        self.healthy = True
+        self.outstanding = 0
+        self.transactions = 0
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+
+    def stats(self) -> NodeStats:
+        return NodeStats(self.uri, self.healthy, self.outstanding, self.transactions, self.latency, self.error_rate)
+
+    def check(self, ready: grpc.Future, timeout: float) -> bool:
+        """Wait for the channel to be connected, returning whether it is healthy"""
+        try:
+            ready.result(timeout)
+            self.recovered()
+        except grpc.FutureTimeoutError:
+            ready.cancel()
+            self.failed()
+        return self.healthy
+
+    def failed(self) -> None:
+        """Take the node out of rotation, until a probe finds it connected"""
+        self.healthy = False
+        self.probe_after = time.monotonic() + self.probe_interval
+
+    def recovered(self) -> None:
+        self.healthy = True
+        self.error_rate = 0.0
+        if self.probe is not None:
+            self.probe.cancel()
+            self.probe = None
+
+    def reprobe(self, now: float) -> None:
+        """Put the node back into rotation if its probe has connected, or start a probe if it is time to
+
+        Probes do not block: a probe connects in the background, and is looked at by the next call.
+        """
+        if self.healthy:
+            return
+
+        if self.probe is None:
+            if now >= self.probe_after:
+                self.probe = grpc.channel_ready_future(self.channel)
+        elif self.probe.done():
+            connected = not self.probe.cancelled()
+            self.probe = None
+            if connected:
+                self.recovered()
+            else:
+                self.probe_after = now + self.probe_interval
+
+    def opened(self, seconds: float) -> None:
+        self.latency = seconds if self.latency is None else self.latency + _DECAY * (seconds - self.latency)
+
+    def finished(self, failed: bool, max_error_rate: float) -> None:
+        self.outstanding -= 1
+        self.transactions += 1
+        self.error_rate += _DECAY * (failed - self.error_rate)
+        if self.error_rate > max_error_rate and self.healthy:
+            self.failed()
+
+    def close(self) -> None:
+        close_channel(self.channel, self.probe)
+
+
+class _ClusterTxContext:
+    """Contains a GraknTx on a node of a cluster. The node's statistics are updated when the context closes."""
+
+    def __init__(self, cluster: 'ClusterClient', node: _Node, tx_context: GraknTxContext) -> None:
+        self._cluster = cluster
+        self._node = node
+        self._tx_context = tx_context
+
+    def __enter__(self) -> GraknTx:
+        return self._tx_context.__enter__()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        failed = exc_type is not None and issubclass(exc_type, ConnectionError)
+        try:
+            self._tx_context.__exit__(exc_type, exc_val, exc_tb)
+        except ConnectionError:
+            failed = True
+            raise
+        finally:
+            self._cluster._finished(self._node, failed)
+
+
+class ClusterClient(_BaseClient):
+    """Client to a Grakn knowledge base served by several nodes, identified by their uris and a keyspace.
+
+    Each new transaction is opened on a healthy node chosen by `routing`:
+
+    - 'least_outstanding' chooses the node with the fewest open transactions
+    - 'latency' chooses the node with the lowest average time to open a transaction, weighted by its open transactions
+
+    If a `primary` uri is given, every write and batch transaction is opened on it, so only reads are spread across
+    the nodes. Queries that cannot write, such as `match ... get`, are executed in read transactions by default. While
+    the primary is out of rotation, opening a write or batch transaction fails at once with a ConnectionError.
+
+    A node is taken out of rotation when a transaction fails to open on it, or when the moving average of its rate of
+    ConnectionErrors passes `max_error_rate`. After `probe_interval` seconds, a node out of rotation is probed in the
+    background, and is put back into rotation by the next transaction opened once it is connected. `check_health`
+    waits for nodes to connect and puts them back at once, and is called before each retry if a `retry` policy is
+    given.
+
+    The label and result caches, the `listener` and the `channel_options` are shared by every node, and behave as they
+    do for a `Client`.
+    """
+
+    def __init__(self, uris: Sequence[str], keyspace: str = Client.DEFAULT_KEYSPACE, *,
+                 timeout: int = Client.DEFAULT_TIMEOUT, routing: str = LEAST_OUTSTANDING, primary: Optional[str] = None,
+                 max_error_rate: float = 0.5, probe_interval: float = 1, label_cache_size: int = 0, prefetch: int = 1,
+                 result_cache_size: int = 0, result_cache_ttl: Optional[float] = None,
+                 listener: Optional[Listener] = None, retry: Optional[RetryPolicy] = None,
+                 channel_options: Optional[ChannelOptions] = None) -> None:
+        if not uris:
+            raise ValueError('a cluster needs at least one uri')
+        if routing not in _ROUTINGS:
+            raise ValueError(f'routing must be one of {", ".join(sorted(_ROUTINGS))}, but was {routing!r}')
+        if primary is not None and primary not in uris:
+            raise ValueError(f'primary {primary!r} is not one of the uris')
+
+        self.channel_options = channel_options if channel_options is not None else ChannelOptions()
+        self._nodes = [_Node(uri, self.channel_options, probe_interval) for uri in uris]
+        self._primary = next((node for node in self._nodes if node.uri == primary), None)
+        self._lock = threading.Lock()
+        self._next_node = 0
+        self._timeout = timeout
+        self.routing = routing
+        self.max_error_rate = max_error_rate
+        self.keyspace = keyspace
+        self.prefetch = prefetch
+        self.listener = listener
+        self.retry = retry
+        self.label_cache: Optional[LRUCache[str, str]] = LRUCache(label_cache_size) if label_cache_size > 0 else None
+        self.result_cache: Optional[LRUCache[Tuple, Any]] = \
+            LRUCache(result_cache_size, result_cache_ttl) if result_cache_size > 0 else None
+
+        if not self.check_health(timeout):
+            self.close()
+            raise ConnectionError('no node of the cluster is connected')
+
+    def __enter__(self) -> 'ClusterClient':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    @property
+    def nodes(self) -> List[NodeStats]:
+        """The state of each node"""
+        with self._lock:
+            return [node.stats() for node in self._nodes]
+
+    def open(self, *, timeout: Optional[float] = None, tx_type: str = 'write') -> _ClusterTxContext:
+        """Open a transaction on the primary if it can write and there is one, or else on the node chosen by routing
+
+        :param timeout: seconds before the transaction is abandoned, instead of the timeout of the cluster
+        :param tx_type: 'read', 'write' or 'batch'. Queries in a read transaction cannot write, and are not committed
+        :return: a context that can be opened using a `with` statement
+
+        :raises: ConnectionError if no node is healthy, if the transaction can write and the primary is not healthy, or
+            if the transaction fails to open
+        :raises: ValueError if `tx_type` is not a type of transaction
+        """
+        node = self._choose_node(tx_type)
+        start = time.perf_counter()
+
+        try:
+            tx_context = GraknTxContext(self.keyspace, node.stub, timeout if timeout is not None else self._timeout,
+                                        self.label_cache, self.prefetch, self.result_cache, tx_type, self.listener,
+                                        self.channel_options)
+        except ConnectionError:
+            with self._lock:
+                node.failed()
+            self._finished(node, True)
+            raise
+        except BaseException:
+            self._finished(node, False)
+            raise
+
+        with self._lock:
+            node.opened(time.perf_counter() - start)
+
+        return _ClusterTxContext(self, node, tx_context)
+
+    def check_health(self, timeout: float = 1) -> int:
+        """Wait for each node to be connected, putting those that are back into rotation
+
+        :return: the number of healthy nodes
+        """
+        # every node is asked to connect before waiting for any, so waiting takes no longer than the slowest of them
+        ready = [grpc.channel_ready_future(node.channel) for node in self._nodes]
+        deadline = time.monotonic() + timeout
+        return sum(node.check(future, max(0.0, deadline - time.monotonic()))
+                   for node, future in zip(self._nodes, ready))
+
+    def close(self) -> None:
+        """Close the channel to every node"""
+        for node in self._nodes:
+            node.close()
+
+    def _before_retry(self) -> None:
+        self.check_health(self.retry.connect_timeout)
+
+    def _choose_node(self, tx_type: str) -> _Node:
+        with self._lock:
+            if self._primary is not None and tx_type != 'read':
+                node = self._primary
+                node.reprobe(time.monotonic())
+                if not node.healthy:
+                    raise ConnectionError(f'primary {node.uri} is unavailable')
+            else:
+                node = self._route()
+            node.outstanding += 1
+            return node
+
+    def _route(self) -> _Node:
+        # starting from a different node each time spreads out transactions between nodes that are tied
+        start = self._next_node
+        self._next_node = (self._next_node + 1) % len(self._nodes)
+        now = time.monotonic()
+        for node in self._nodes:
+            node.reprobe(now)
+
+        healthy = [node for node in self._nodes[start:] + self._nodes[:start] if node.healthy]
+
+        if not healthy:
+            raise ConnectionError('no healthy node in cluster')
+
+        if self.routing == LATENCY:
+            # nodes without a latency are tried first, so that every node is measured
+            return min(healthy, key=lambda node: (node.latency or 0) * (node.outstanding + 1))
+
+        return min(healthy, key=lambda node: node.outstanding)
+
+    def _finished(self, node: _Node, failed: bool) -> None:
+        with self._lock:
+            node.finished(failed, self.max_error_rate)
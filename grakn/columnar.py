@@ -0,0 +1,113 @@
+"""Columnar representation of the answers to a query, for analysis with NumPy or pandas."""
+from typing import Any, Dict, List, Optional, Tuple
+
+import grakn_pb2 as grpc_grakn
+
+
+class Columns:
+    """The answers to a query as columns. Each variable `x` has a column `x.id` of concept ids, and columns `x.label`
+    and `x.value` if any of its concepts have a label or a value. Rows without a label or a value hold None.
+    """
+
+    def __init__(self, header: Tuple[str, ...], columns: Dict[str, List[Any]], rows: int) -> None:
+        self.header = header
+        self.columns = columns
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def __repr__(self) -> str:
+        return f'Columns({list(self.columns)}, rows={self.rows})'
+
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """Return the columns by name, which `pandas.DataFrame` accepts without copying each row"""
+        return dict(self.columns)
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Return the columns by name as NumPy arrays
+
+        A value column has the dtype of its values: bool for booleans, int64 for integers, longs and dates, float64
+        for floats and doubles. Columns of strings, or with missing or mixed values, have the object dtype.
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError('Columns.to_numpy requires numpy') from e
+
+        return {name: numpy.array(column, dtype=_dtype(column)) for name, column in self.columns.items()}
+
+    def to_pandas(self) -> Any:
+        """Return the columns as a pandas DataFrame"""
+        try:
+            import pandas
+        except ImportError as e:
+            raise ImportError('Columns.to_pandas requires pandas') from e
+
+        return pandas.DataFrame(self.to_numpy(), copy=False)
+
+
+class ColumnBuilder:
+    """Appends pages of query results to columns, without building an object for each answer"""
+
+    def __init__(self) -> None:
+        self._header: Optional[Tuple[str, ...]] = None
+        self._ids: List[List[str]] = []
+        self._labels: List[List[Optional[str]]] = []
+        self._values: List[List[Any]] = []
+        self._rows = 0
+
+    def parse_page(self, results: List[grpc_grakn.QueryResult], labels: Dict[str, str],
+                   values: Dict[str, Any]) -> List[Any]:
+        """Append a page of query results to the columns
+
+        :return: an empty list, as there is nothing to return for each answer
+        """
+        for result in results:
+            if not result.HasField('answer'):
+                raise ValueError('only queries that return answers can be converted to columns')
+
+            answer = result.answer.answer
+
+            if self._header is None:
+                self._header = tuple(answer)
+                self._ids = [[] for _ in self._header]
+                self._labels = [[] for _ in self._header]
+                self._values = [[] for _ in self._header]
+
+            for var, ids, var_labels, var_values in zip(self._header, self._ids, self._labels, self._values):
+                cid = answer[var].id.value
+                ids.append(cid)
+                var_labels.append(labels.get(cid))
+                var_values.append(values.get(cid))
+
+        self._rows += len(results)
+        return []
+
+    def build(self) -> Columns:
+        columns = {}
+
+        for var, ids, var_labels, var_values in zip(self._header or (), self._ids, self._labels, self._values):
+            columns[f'{var}.id'] = ids
+            if any(label is not None for label in var_labels):
+                columns[f'{var}.label'] = var_labels
+            if any(value is not None for value in var_values):
+                columns[f'{var}.value'] = var_values
+
+        return Columns(self._header or (), columns, self._rows)
+
+
+def _dtype(column: List[Any]) -> str:
+    types = {type(value) for value in column}
+
+    if types == {bool}:
+        return 'bool'
+    elif types == {int}:
+        return 'int64'
+    elif types and types <= {int, float}:
+        return 'float64'
+    else:
+        return 'object'
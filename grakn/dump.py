@@ -0,0 +1,501 @@
+"""Export of a keyspace to compressed files, and import of those files into another keyspace.
+
+`grakn-dump` exports a keyspace in two passes. The first writes its schema as a Graql `define` query. The second
+streams the instances of each type into a partition of their own, as a gzipped file of one JSON record per line:
+
+- attribute types, as the id and value of each attribute
+- entity types, as the id of each entity
+- relationship types, as the id and role players of each relationship
+- the ownership of each attribute type, as the ids of each owner and attribute
+
+`grakn-load` defines the schema, then inserts the partitions in that order, as the instances of each kind can refer to
+those of the kinds before. Records are inserted in batches of `batch_size`, each committed in its own write
+transaction, with up to `workers` transactions at once. Each record is renamed to the id it is given by the new
+keyspace. The new ids of each batch are appended to a progress file once it commits, so a load that is stopped can be
+run again and only loads the batches that were not committed.
+
+Rules cannot be read through the client, so they are not exported; their labels are listed in the manifest.
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from concurrent import futures
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from grakn.loader import _batches
+from grakn.template import literal
+
+ATTRIBUTE, ENTITY, RELATIONSHIP, HAS = 'attribute', 'entity', 'relationship', 'has'
+
+# the kinds of partition, in the order they are loaded
+KINDS = (ATTRIBUTE, ENTITY, RELATIONSHIP, HAS)
+
+SCHEMA_FILE = 'schema.gql'
+MANIFEST_FILE = 'manifest.json'
+
+_DATATYPES = ('string', 'long', 'double', 'boolean', 'date')
+_META_TYPES = {'thing', 'entity', 'relationship', 'attribute', 'role', 'rule'}
+
+# implicit roles played by the owners of an attribute type, from which `has` and `key` are read
+_IMPLICIT_OWNER_ROLES = (('@has-', '-owner', 'has'), ('@key-', '-owner', 'key'))
+
+
+class SchemaType:
+    """A type, role or rule of a schema, with the properties that `grakn-dump` can export"""
+
+    def __init__(self, label: str, kind: str, supertypes: Set[str]) -> None:
+        self.label = label
+        self.kind = kind
+        self.supertypes = supertypes
+        self.supertype: Optional[str] = None
+        self.subtypes: List[str] = []
+        self.abstract = False
+        self.datatype: Optional[str] = None
+        self.relates: List[str] = []
+        self.plays: List[str] = []
+        self.has: List[str] = []
+        self.keys: List[str] = []
+
+    def __repr__(self) -> str:
+        return f'SchemaType({self.label!r}, {self.kind!r})'
+
+    def statement(self) -> str:
+        """Return the Graql statement that defines the type"""
+        properties = [f'sub {self.supertype}']
+        if self.abstract:
+            properties.append('is-abstract')
+        if self.datatype is not None:
+            properties.append(f'datatype {self.datatype}')
+        properties += [f'relates {role}' for role in self.relates]
+        properties += [f'plays {role}' for role in self.plays]
+        properties += [f'has {attribute}' for attribute in self.has]
+        properties += [f'key {attribute}' for attribute in self.keys]
+        return f'{self.label} {", ".join(properties)};'
+
+
+class Partition(NamedTuple):
+    """The instances of one type, or the ownerships of one attribute type, in a file of their own"""
+    kind: str
+    label: str
+    file: str
+    records: int = 0
+
+
+def read_schema(client: Any) -> Dict[str, SchemaType]:
+    """Read the types, roles and rules of a keyspace, keyed by label"""
+    supertypes: Dict[str, Set[str]] = {}
+    for answer in client.execute('match $x sub $y; get;'):
+        supertypes.setdefault(answer['x']['label'], set()).add(answer['y']['label'])
+
+    schema = {}
+    for label, supers in supertypes.items():
+        supers.discard(label)
+        kind = next((meta for meta in ('attribute', 'entity', 'relationship', 'role', 'rule') if meta in supers), None)
+        if label in _META_TYPES or label.startswith('@') or kind is None:
+            continue
+        schema[label] = SchemaType(label, kind, supers)
+
+    for schema_type in schema.values():
+        # the direct supertype is the one with the most supertypes of its own
+        schema_type.supertype = max(schema_type.supertypes, key=lambda label: len(supertypes.get(label, ())))
+        if schema_type.supertype in schema:
+            schema[schema_type.supertype].subtypes.append(schema_type.label)
+
+    for answer in client.execute('match $x sub thing, is-abstract; get;') or []:
+        if answer['x']['label'] in schema:
+            schema[answer['x']['label']].abstract = True
+
+    for datatype in _DATATYPES:
+        for answer in client.execute(f'match $x sub attribute, datatype {datatype}; get;') or []:
+            if answer['x']['label'] in schema:
+                schema[answer['x']['label']].datatype = datatype
+
+    for answer in client.execute('match $x relates $y; get;') or []:
+        if answer['x']['label'] in schema and answer['y']['label'] in schema:
+            schema[answer['x']['label']].relates.append(answer['y']['label'])
+
+    for answer in client.execute('match $x plays $y; get;') or []:
+        player, role = answer['x']['label'], answer['y']['label']
+        if player not in schema:
+            continue
+        if role in schema:
+            schema[player].plays.append(role)
+        for prefix, suffix, ownership in _IMPLICIT_OWNER_ROLES:
+            if role.startswith(prefix) and role.endswith(suffix):
+                owned = getattr(schema[player], 'keys' if ownership == 'key' else 'has')
+                owned.append(role[len(prefix):-len(suffix)])
+
+    # properties are only defined on the type that declares them, not repeated on its subtypes
+    for schema_type in schema.values():
+        inherited = [schema[label] for label in schema_type.supertypes if label in schema]
+        for name in ('relates', 'plays', 'has', 'keys'):
+            declared = {value for supertype in inherited for value in getattr(supertype, name)}
+            setattr(schema_type, name, sorted(set(getattr(schema_type, name)) - declared))
+
+    return schema
+
+
+def schema_query(schema: Dict[str, SchemaType]) -> str:
+    """Return a `define` query for the types and roles of a schema, with each supertype before its subtypes"""
+    types = sorted((schema_type for schema_type in schema.values() if schema_type.kind != 'rule'),
+                   key=lambda schema_type: (len(schema_type.supertypes), schema_type.label))
+    return 'define\n' + '\n'.join(schema_type.statement() for schema_type in types) + '\n'
+
+
+def dump(client: Any, directory: str, *, workers: int = 4, page_size: int = 1000,
+         log: Optional[Any] = None) -> List[Partition]:
+    """Export the schema and every instance of a keyspace into a directory
+
+    Partitions whose file already exists are not exported again, so an export that was stopped can be resumed.
+
+    :param client: a Client or ClusterClient of the keyspace to export
+    :param directory: where to write the schema, the partitions and the manifest
+    :param workers: how many partitions to export at once
+    :param page_size: how many answers to receive at a time
+    :param log: a file to report progress to
+    :return: the partitions that were written
+    """
+    os.makedirs(directory, exist_ok=True)
+    schema = read_schema(client)
+
+    with open(os.path.join(directory, SCHEMA_FILE), 'w') as schema_file:
+        schema_file.write(schema_query(schema))
+
+    partitions = [Partition(kind, label, f'{kind}-{label}.ndjson.gz')
+                  for kind in KINDS for label in sorted(_partition_labels(schema, kind))]
+
+    def export(partition: Partition) -> Partition:
+        path = os.path.join(directory, partition.file)
+        if os.path.exists(path):
+            with gzip.open(path, 'rt') as existing:
+                return partition._replace(records=sum(1 for _ in existing))
+
+        start = time.perf_counter()
+        records = 0
+
+        # written to a temporary file first, so only finished partitions are skipped when resuming
+        with gzip.open(path + '.partial', 'wt') as output:
+            for record in _export_records(client, schema, partition, page_size):
+                output.write(json.dumps(record, separators=(',', ':')) + '\n')
+                records += 1
+
+        os.replace(path + '.partial', path)
+        _report(log, f'exported {records} records of {partition.kind} {partition.label} '
+                     f'in {time.perf_counter() - start:.1f}s')
+        return partition._replace(records=records)
+
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        partitions = list(executor.map(export, partitions))
+
+    manifest = {
+        'partitions': [partition._asdict() for partition in partitions],
+        'skipped_rules': sorted(label for label, schema_type in schema.items() if schema_type.kind == 'rule'),
+    }
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    return partitions
+
+
+def _partition_labels(schema: Dict[str, SchemaType], kind: str) -> Iterable[str]:
+    if kind == HAS:
+        return {attribute for schema_type in schema.values() for attribute in schema_type.has + schema_type.keys}
+    return [label for label, schema_type in schema.items() if schema_type.kind == kind and not schema_type.abstract]
+
+
+def _export_records(client: Any, schema: Dict[str, SchemaType], partition: Partition,
+                    page_size: int) -> Iterator[Dict[str, Any]]:
+    label = partition.label
+
+    def answers(query: str, lazy: bool = True) -> Iterator[Dict[str, Any]]:
+        return client.execute_iter(query, page_size=page_size, prefetch=page_size, lazy=lazy, tx_type='read')
+
+    # `isa!` only matches direct instances, as those of subtypes are exported in the partitions of the subtypes
+    if partition.kind == ATTRIBUTE:
+        for answer in answers(f'match $x isa! {label}; get;', lazy=False):
+            yield {'id': answer['x']['id'], 'value': answer['x']['value']}
+
+    elif partition.kind == ENTITY:
+        for answer in answers(f'match $x isa! {label}; get;'):
+            yield {'id': answer['x'].id}
+
+    elif partition.kind == RELATIONSHIP:
+        roles = _roles(schema, label)
+        # the role players of each relationship are read in a second transaction as the relationships are received
+        with client.open(tx_type='read') as tx:
+            for answer in answers(f'match $r isa! {label}; get;'):
+                relationship_id = answer['r'].id
+                players = [(role, player['p'].id) for role in roles
+                           for player in tx.execute(f'match $r id {relationship_id}; $r ({role}: $p); get;',
+                                                    lazy=True) or []]
+                if players:
+                    yield {'id': relationship_id, 'roleplayers': players}
+
+    elif partition.kind == HAS:
+        for answer in answers(f'match $o has {label} $a; $a isa! {label}; get;'):
+            yield {'owner': answer['o'].id, 'attribute': answer['a'].id}
+
+
+def _roles(schema: Dict[str, SchemaType], label: str) -> List[str]:
+    """Return the roles related by a relationship type, including those it inherits"""
+    labels = [label] + sorted(schema[label].supertypes)
+    return sorted({role for relationship in labels if relationship in schema for role in schema[relationship].relates})
+
+
+class _NotLoaded(LookupError):
+    """Raised for a record that refers to a concept that has not been loaded yet"""
+
+
+class _Progress:
+    """The new ids of the records of a partition, appended to a file as each batch commits"""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self.batches: Set[int] = set()
+        self.ids: Dict[str, str] = {}
+
+        if os.path.exists(path):
+            with gzip.open(path, 'rt') as progress_file:
+                for line in progress_file:
+                    entry = json.loads(line)
+                    self.batches.add(entry['batch'])
+                    self.ids.update(entry['ids'])
+
+    def committed(self, batch: int, ids: Dict[str, str]) -> None:
+        with self._lock:
+            # gzip members can be appended to, and are read back as one stream
+            with gzip.open(self._path, 'at') as progress_file:
+                progress_file.write(json.dumps({'batch': batch, 'ids': ids}, separators=(',', ':')) + '\n')
+            self.batches.add(batch)
+
+
+class LoadResult(NamedTuple):
+    """The outcome of loading one batch of a partition"""
+    partition: Partition
+    batch: int
+    records: int
+    seconds: float
+    error: Optional[Exception]
+
+
+def load(client: Any, directory: str, *, workers: int = 4, batch_size: int = 1000, per_query: int = 50,
+         log: Optional[Any] = None) -> List[LoadResult]:
+    """Import a keyspace exported by `dump` into the keyspace of a client
+
+    :param client: a Client, ClientPool or ClusterClient of the keyspace to import into
+    :param directory: where the export was written, and where progress is recorded
+    :param workers: how many batches to load at once
+    :param batch_size: how many records to commit in each transaction
+    :param per_query: how many records to insert with each query
+    :param log: a file to report progress to
+    :return: the outcome of each batch loaded by this run
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    schema_done = os.path.join(directory, SCHEMA_FILE + '.loaded')
+    if not os.path.exists(schema_done):
+        with open(os.path.join(directory, SCHEMA_FILE)) as schema_file:
+            client.execute(schema_file.read())
+        open(schema_done, 'w').close()
+
+    partitions = [Partition(**partition) for partition in manifest['partitions']]
+    progress = {partition.file: _Progress(os.path.join(directory, partition.file + '.progress.gz'))
+                for partition in partitions}
+    ids = {old: new for partition_progress in progress.values() for old, new in partition_progress.ids.items()}
+    datatypes = _datatypes(directory)
+    results: List[LoadResult] = []
+
+    for kind in KINDS:
+        start = time.perf_counter()
+        batches = ((partition, index, records)
+                   for partition in partitions if partition.kind == kind
+                   for index, records in enumerate(_batches(_read_records(os.path.join(directory, partition.file)),
+                                                             batch_size))
+                   if index not in progress[partition.file].batches)
+
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit(partition: Partition, index: int, records: List[Dict[str, Any]]) -> futures.Future:
+                return executor.submit(_load_batch, client, partition, index, records, per_query, ids,
+                                       datatypes.get(partition.label), progress[partition.file])
+
+            phase, waiting = _run_batches(submit, batches, 2 * workers)
+
+            # relationships can be role players of other relationships, which may not have been loaded yet
+            previous = None
+            while waiting and (previous is None or len(waiting) < previous):
+                previous = len(waiting)
+                retried, waiting = _run_batches(submit, ((result.partition, result.batch, records)
+                                                         for result, records in waiting), 2 * workers)
+                phase = [result for result in phase if not isinstance(result.error, _NotLoaded)] + retried
+
+        results += phase
+        loaded = sum(result.records for result in phase if result.error is None)
+        _report(log, f'loaded {loaded} {kind} records in {time.perf_counter() - start:.1f}s')
+
+    return results
+
+
+def _run_batches(submit: Any, batches: Iterable[Tuple[Partition, int, List[Dict[str, Any]]]],
+                 read_ahead: int) -> Tuple[List[LoadResult], List[Tuple[LoadResult, List[Dict[str, Any]]]]]:
+    """Load batches, returning the outcome of each and the batches that refer to concepts not loaded yet"""
+    results: List[LoadResult] = []
+    waiting: List[Tuple[LoadResult, List[Dict[str, Any]]]] = []
+    pending: Dict[futures.Future, List[Dict[str, Any]]] = {}
+
+    def collect(done: Iterable[futures.Future]) -> None:
+        for future in done:
+            result = future.result()
+            results.append(result)
+            if isinstance(result.error, _NotLoaded):
+                waiting.append((result, pending[future]))
+            del pending[future]
+
+    for partition, index, records in batches:
+        # bound the number of batches read ahead of the transactions loading them
+        if len(pending) >= read_ahead:
+            collect(futures.wait(pending, return_when=futures.FIRST_COMPLETED).done)
+        pending[submit(partition, index, records)] = records
+
+    collect(futures.as_completed(list(pending)))
+    return results, waiting
+
+
+def _load_batch(client: Any, partition: Partition, index: int, records: List[Dict[str, Any]], per_query: int,
+                ids: Dict[str, str], datatype: Optional[str], progress: _Progress) -> LoadResult:
+    start = time.perf_counter()
+    new_ids: Dict[str, str] = {}
+
+    try:
+        with client.open() as tx:
+            for chunk in _batches(records, per_query):
+                query = _insert_query(partition, chunk, ids, datatype)
+                if partition.kind == HAS:
+                    tx.execute_batch([query])
+                    continue
+
+                answer = tx.execute(query, lazy=True)[0]
+                new_ids.update((record['id'], answer[f'x{i}'].id) for i, record in enumerate(chunk))
+            tx.commit()
+    except Exception as e:
+        return LoadResult(partition, index, len(records), time.perf_counter() - start, e)
+
+    progress.committed(index, new_ids)
+    ids.update(new_ids)
+    return LoadResult(partition, index, len(records), time.perf_counter() - start, None)
+
+
+def _insert_query(partition: Partition, records: List[Dict[str, Any]], ids: Dict[str, str],
+                  datatype: Optional[str]) -> str:
+    """Return one query that inserts every record, naming the new concept of the i-th record `$x{i}`"""
+    label = partition.label
+
+    if partition.kind == ATTRIBUTE:
+        statements = [f'$x{i} val {literal(_value(record["value"], datatype))} isa {label};'
+                      for i, record in enumerate(records)]
+        return 'insert ' + ' '.join(statements)
+
+    if partition.kind == ENTITY:
+        return 'insert ' + ' '.join(f'$x{i} isa {label};' for i in range(len(records)))
+
+    matches: Dict[str, str] = {}
+
+    def match(old_id: str) -> str:
+        if old_id not in ids:
+            raise _NotLoaded(f'{old_id} has not been loaded')
+        if old_id not in matches:
+            matches[old_id] = f'$m{len(matches)}'
+        return matches[old_id]
+
+    if partition.kind == RELATIONSHIP:
+        statements = []
+        for i, record in enumerate(records):
+            players = ', '.join(f'{role}: {match(player)}' for role, player in record['roleplayers'])
+            statements.append(f'$x{i} ({players}) isa {label};')
+    else:
+        statements = [f'{match(record["owner"])} has {label} {match(record["attribute"])};' for record in records]
+
+    patterns = ' '.join(f'{var} id {ids[old_id]};' for old_id, var in matches.items())
+    return f'match {patterns} insert ' + ' '.join(statements)
+
+
+def _value(value: Any, datatype: Optional[str]) -> Any:
+    # dates are exported as milliseconds since the epoch
+    if datatype == 'date':
+        return datetime.datetime.utcfromtimestamp(value / 1000)
+    return value
+
+
+def _datatypes(directory: str) -> Dict[str, str]:
+    """Read the datatype of each attribute type from the exported schema"""
+    datatypes = {}
+    with open(os.path.join(directory, SCHEMA_FILE)) as schema_file:
+        for line in schema_file:
+            words = line.rstrip(';\n').replace(',', ' ').split()
+            if 'datatype' in words:
+                datatypes[words[0]] = words[words.index('datatype') + 1]
+    return datatypes
+
+
+def _read_records(path: str) -> Iterator[Dict[str, Any]]:
+    with gzip.open(path, 'rt') as records:
+        for line in records:
+            yield json.loads(line)
+
+
+def _report(log: Optional[Any], message: str) -> None:
+    if log is not None:
+        print(message, file=log, flush=True)
+
+
+def _arguments(description: str, directory_help: str) -> argparse.ArgumentParser:
+    from grakn.client import Client
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('directory', help=directory_help)
+    parser.add_argument('--uri', default=Client.DEFAULT_URI, help='uri of the Grakn server')
+    parser.add_argument('--keyspace', default=Client.DEFAULT_KEYSPACE, help='keyspace to use')
+    parser.add_argument('--workers', type=int, default=4, help='transactions to run at once')
+    parser.add_argument('--timeout', type=int, default=Client.DEFAULT_TIMEOUT, help='seconds to wait for the server')
+    return parser
+
+
+def dump_main() -> None:
+    """The `grakn-dump` console entry point"""
+    from grakn.client import Client
+
+    parser = _arguments('Export a Grakn keyspace to a directory', 'directory to write the export to')
+    parser.add_argument('--page-size', type=int, default=1000, help='answers to receive at a time')
+    args = parser.parse_args()
+
+    client = Client(uri=args.uri, keyspace=args.keyspace, timeout=args.timeout)
+    partitions = dump(client, args.directory, workers=args.workers, page_size=args.page_size, log=sys.stderr)
+    print(f'exported {sum(partition.records for partition in partitions)} records in {len(partitions)} partitions',
+          file=sys.stderr)
+
+
+def load_main() -> None:
+    """The `grakn-load` console entry point"""
+    from grakn.client import Client
+
+    parser = _arguments('Import a directory written by grakn-dump into a Grakn keyspace', 'directory of the export')
+    parser.add_argument('--batch-size', type=int, default=1000, help='records to commit in each transaction')
+    parser.add_argument('--per-query', type=int, default=50, help='records to insert with each query')
+    args = parser.parse_args()
+
+    client = Client(uri=args.uri, keyspace=args.keyspace, timeout=args.timeout)
+    results = load(client, args.directory, workers=args.workers, batch_size=args.batch_size,
+                   per_query=args.per_query, log=sys.stderr)
+
+    failed = [result for result in results if result.error is not None]
+    for result in failed:
+        print(f'batch {result.batch} of {result.partition.file} failed: {result.error!r}', file=sys.stderr)
+    if failed:
+        print('run grakn-load again to retry the failed batches', file=sys.stderr)
+        sys.exit(1)
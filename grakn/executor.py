@@ -0,0 +1,75 @@
+"""Concurrent execution of independent Graql queries against a Grakn knowledge base."""
+from collections import deque
+from concurrent import futures
+from typing import Any, Deque, Iterable, Iterator, NamedTuple, Optional
+
+from grakn.client import GraknError
+
+
+class ExecutedQuery(NamedTuple):
+    """The outcome of one query: its position in the input, and either its result or the error it raised"""
+    index: int
+    query: str
+    result: Any
+    error: Optional[Exception]
+
+
+def execute_all(client: Any, queries: Iterable[str], *, concurrency: int = 4, ordered: bool = True,
+                max_in_flight: Optional[int] = None, infer: Optional[bool] = None,
+                timeout: Optional[float] = None) -> Iterator[ExecutedQuery]:
+    """Execute and commit many independent Graql queries at once, each in its own transaction
+
+    Up to `concurrency` queries run at once. Queries are only read from `queries` once there are fewer than
+    `max_in_flight` (by default, twice `concurrency`) waiting or running. An error in one query is returned in
+    its ExecutedQuery rather than raised, so the other queries carry on. If the returned iterator is closed early,
+    queries that have not started are cancelled.
+
+    :param client: a Client, ClientPool or ClusterClient to execute the queries with. A ClientPool spreads them over
+        its channels, and a ClusterClient over its nodes
+    :param queries: the Graql query strings to execute against the knowledge base
+    :param concurrency: how many queries to run at once
+    :param ordered: whether to return the outcomes in the order of `queries`, rather than as they finish
+    :param max_in_flight: how many queries can be waiting or running at once
+    :param infer: enable inference
+    :param timeout: seconds before each query is abandoned, instead of the timeout of the client
+    :return: an iterator of the outcome of each query
+    """
+    max_in_flight = max_in_flight or 2 * concurrency
+    queries = enumerate(queries)
+    executor = futures.ThreadPoolExecutor(max_workers=concurrency)
+    pending: Deque[futures.Future] = deque()
+
+    def submit() -> bool:
+        for index, query in queries:
+            pending.append(executor.submit(_execute, client, index, query, infer, timeout))
+            return True
+        return False
+
+    try:
+        while len(pending) < max_in_flight and submit():
+            pass
+
+        while pending:
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield future.result()
+
+            while len(pending) < max_in_flight and submit():
+                pass
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _execute(client: Any, index: int, query: str, infer: Optional[bool], timeout: Optional[float]) -> ExecutedQuery:
+    try:
+        result = client.execute(query, infer=infer, timeout=timeout)
+    except (GraknError, ConnectionError, TimeoutError) as e:
+        return ExecutedQuery(index, query, None, e)
+
+    return ExecutedQuery(index, query, result, None)
@@ -0,0 +1,205 @@
+"""Timing of the requests a transaction makes to a Grakn knowledge base."""
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+import concept_pb2 as grpc_concept
+from grakn_pb2 import TxRequest, TxResponse
+
+_REQUEST_ONEOF = TxRequest.DESCRIPTOR.oneofs[0].name
+_CONCEPT_METHOD_ONEOF = grpc_concept.ConceptMethod.DESCRIPTOR.oneofs[0].name
+
+# the stage of parsing answers locally, which makes no request
+PARSE = 'parse'
+
+
+class Event(NamedTuple):
+    """One stage of a transaction: a request and its response, or the parsing of a page of answers
+
+    `stage` is the kind of request, such as 'open', 'execQuery', 'next', 'getLabel', 'getValue' or 'commit', or
+    'parse'. `seconds` runs from sending the request to receiving its response, so includes the time spent
+    waiting behind other pipelined requests.
+    """
+    stage: str
+    seconds: float
+    request_bytes: int
+    response_bytes: int
+
+
+class TransactionEvent(NamedTuple):
+    """The totals of one transaction, from sending its open request to closing it"""
+    keyspace: str
+    tx_type: str
+    seconds: float
+    requests: Dict[str, int]
+    request_bytes: int
+    response_bytes: int
+    parse_seconds: float
+
+    @property
+    def round_trips(self) -> int:
+        """The number of requests sent, each of which has one response"""
+        return sum(self.requests.values())
+
+
+class Listener:
+    """Receives the events of transactions. Subclasses override the methods for the events they need.
+
+    Events are delivered on the thread making the requests, so listeners should return quickly.
+    """
+
+    def on_event(self, event: Event) -> None:
+        pass
+
+    def on_transaction(self, event: TransactionEvent) -> None:
+        pass
+
+
+class _Summary:
+    """The count, totals and a uniform sample of the latencies of one stage"""
+
+    __slots__ = ('count', 'seconds', 'request_bytes', 'response_bytes', 'samples')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.samples: List[float] = []
+
+
+def _percentile(samples: List[float], percent: float) -> Optional[float]:
+    """Return the sample below which `percent` of the sorted samples fall, or None if there are none"""
+    if not samples:
+        return None
+
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+class Stats(Listener):
+    """A listener that aggregates events in memory, with percentiles of the latency of each stage
+
+    Percentiles are estimated from a uniform sample of at most `samples` latencies per stage, so memory use does not
+    grow with the number of events.
+
+    :param samples: how many latencies to keep for each stage
+    """
+
+    def __init__(self, samples: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _Summary] = {}
+        self._random = random.Random()
+        self.max_samples = samples
+        self.transactions = 0
+        self.round_trips = 0
+
+    def on_event(self, event: Event) -> None:
+        with self._lock:
+            summary = self._stages.get(event.stage)
+            if summary is None:
+                summary = self._stages[event.stage] = _Summary()
+
+            summary.count += 1
+            summary.seconds += event.seconds
+            summary.request_bytes += event.request_bytes
+            summary.response_bytes += event.response_bytes
+
+            # reservoir sampling keeps every latency seen equally likely to be in the sample
+            if len(summary.samples) < self.max_samples:
+                summary.samples.append(event.seconds)
+            else:
+                index = self._random.randrange(summary.count)
+                if index < self.max_samples:
+                    summary.samples[index] = event.seconds
+
+    def on_transaction(self, event: TransactionEvent) -> None:
+        with self._lock:
+            self.transactions += 1
+            self.round_trips += event.round_trips
+
+    def percentile(self, stage: str, percent: float) -> Optional[float]:
+        """Return the latency in seconds below which `percent` of the events of a stage fall, or None if there were
+        no events of that stage"""
+        with self._lock:
+            summary = self._stages.get(stage)
+            samples = sorted(summary.samples) if summary is not None else []
+
+        return _percentile(samples, percent)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return the count, total and mean seconds, 50th, 90th and 99th percentile seconds and bytes sent and
+        received of each stage"""
+        # a copy of each stage, as events may be added or forgotten while the percentiles are computed
+        with self._lock:
+            stages = [(stage, summary.count, summary.seconds, summary.request_bytes, summary.response_bytes,
+                       sorted(summary.samples)) for stage, summary in self._stages.items()]
+
+        return {stage: {
+            'count': count,
+            'seconds': seconds,
+            'mean': seconds / count,
+            'p50': _percentile(samples, 50),
+            'p90': _percentile(samples, 90),
+            'p99': _percentile(samples, 99),
+            'request_bytes': request_bytes,
+            'response_bytes': response_bytes,
+        } for stage, count, seconds, request_bytes, response_bytes, samples in stages}
+
+    def reset(self) -> None:
+        """Forget every event"""
+        with self._lock:
+            self._stages.clear()
+            self.transactions = 0
+            self.round_trips = 0
+
+
+class TxRecorder:
+    """Times the requests of one transaction for a listener
+
+    The server answers the requests of a transaction in the order they were sent, so each response is matched to
+    the oldest request without one.
+    """
+
+    def __init__(self, listener: Listener, keyspace: str, tx_type: str) -> None:
+        self._listener = listener
+        self._keyspace = keyspace
+        self._tx_type = tx_type
+        self._sent: Deque[Tuple[str, float, int]] = deque()
+        self._start = time.perf_counter()
+        self._requests: Dict[str, int] = {}
+        self._request_bytes = 0
+        self._response_bytes = 0
+        self._parse_seconds = 0.0
+        self._closed = False
+
+    def sent(self, request: TxRequest) -> None:
+        stage = request.WhichOneof(_REQUEST_ONEOF)
+        if stage == 'runConceptMethod':
+            stage = request.runConceptMethod.conceptMethod.WhichOneof(_CONCEPT_METHOD_ONEOF)
+
+        size = request.ByteSize()
+        self._sent.append((stage, time.perf_counter(), size))
+        self._requests[stage] = self._requests.get(stage, 0) + 1
+        self._request_bytes += size
+
+    def received(self, response: TxResponse) -> None:
+        stage, sent_at, request_bytes = self._sent.popleft()
+        size = response.ByteSize()
+        self._response_bytes += size
+        self._listener.on_event(Event(stage, time.perf_counter() - sent_at, request_bytes, size))
+
+    def parsed(self, seconds: float) -> None:
+        self._parse_seconds += seconds
+        self._listener.on_event(Event(PARSE, seconds, 0, 0))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        seconds = time.perf_counter() - self._start
+        self._listener.on_transaction(TransactionEvent(self._keyspace, self._tx_type, seconds, self._requests,
+                                                       self._request_bytes, self._response_bytes,
+                                                       self._parse_seconds))
@@ -0,0 +1,113 @@
+"""Bulk loading of Graql queries into a Grakn knowledge base."""
+import itertools
+import time
+from concurrent import futures
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from grakn.client import GraknError
+
+
+class BatchResult(NamedTuple):
+    """The outcome of executing and committing one batch of queries in its own transaction"""
+    index: int
+    size: int
+    answers: int
+    seconds: float
+    error: Optional[Exception]
+    failed_queries: List[str]
+
+    @property
+    def throughput(self) -> float:
+        """Queries loaded per second"""
+        return self.size / self.seconds if self.seconds > 0 and self.error is None else 0.0
+
+
+class LoadReport:
+    """The outcome of loading queries, with a BatchResult for each batch in the order they were read"""
+
+    def __init__(self, batches: List[BatchResult], seconds: float) -> None:
+        self.batches = batches
+        self.seconds = seconds
+
+    @property
+    def loaded(self) -> int:
+        """The number of queries that were committed"""
+        return sum(batch.size for batch in self.batches if batch.error is None)
+
+    @property
+    def failed(self) -> List[BatchResult]:
+        """The batches that were not committed"""
+        return [batch for batch in self.batches if batch.error is not None]
+
+    @property
+    def throughput(self) -> float:
+        """Queries committed per second, across all batches"""
+        return self.loaded / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return f'LoadReport(loaded={self.loaded}, failed={len(self.failed)}, seconds={self.seconds:.3f})'
+
+
+def load(client: Any, queries: Iterable[str], *, batch_size: int = 1000, concurrency: int = 1,
+         infer: Optional[bool] = None, on_batch: Optional[Callable[[BatchResult], None]] = None) -> LoadReport:
+    """Execute and commit many Graql queries, in batches that each have their own transaction
+
+    The queries of a batch are pipelined with `GraknTx.execute_batch`. Up to `concurrency` batches are loaded at
+    once, and queries are only read from `queries` shortly before they are needed. A batch that fails is not
+    committed and does not stop the others from loading; its queries are kept in the report so they can be retried.
+
+    :param client: a Client, ClientPool or ClusterClient to open the transactions with
+    :param queries: the Graql query strings to execute against the knowledge base
+    :param batch_size: how many queries to commit in each transaction
+    :param concurrency: how many transactions to load at once
+    :param infer: enable inference
+    :param on_batch: called with the result of each batch as soon as it finishes
+    :return: a report of the throughput and failures of every batch
+    """
+    start = time.perf_counter()
+    results: List[BatchResult] = []
+
+    def finish(done: Iterable[futures.Future]) -> None:
+        for future in done:
+            result = future.result()
+            results.append(result)
+            if on_batch is not None:
+                on_batch(result)
+
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = set()
+
+        for index, batch in enumerate(_batches(queries, batch_size)):
+            # bound the number of batches read ahead of the transactions loading them
+            if len(pending) >= 2 * concurrency:
+                done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                finish(done)
+
+            pending.add(executor.submit(_load_batch, client, index, batch, infer))
+
+        finish(futures.as_completed(pending))
+
+    results.sort(key=lambda result: result.index)
+    return LoadReport(results, time.perf_counter() - start)
+
+
+def _batches(queries: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    queries = iter(queries)
+    while True:
+        batch = list(itertools.islice(queries, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _load_batch(client: Any, index: int, batch: List[str], infer: Optional[bool]) -> BatchResult:
+    start = time.perf_counter()
+
+    try:
+        with client.open() as tx:
+            answers = tx.execute_batch(batch, infer=infer)
+            tx.commit()
+    except (GraknError, ConnectionError) as e:
+        return BatchResult(index, len(batch), 0, time.perf_counter() - start, e, batch)
+
+    return BatchResult(index, len(batch), answers, time.perf_counter() - start, None, [])
@@ -0,0 +1,348 @@
+"""Pooling of channels and pre-opened transactions to a Grakn knowledge base."""
+import threading
+import time
+from collections import deque
+from concurrent import futures
+from typing import Any, Deque, List, Optional, Tuple
+
+import grpc
+
+import grakn_pb2_grpc
+from grakn.cache import LRUCache
+from grakn.channel import ChannelOptions, close_channel, insecure_channel
+from grakn.client import Client, GraknTx, GraknTxContext, GraknError, _BaseClient, _TX_TYPES
+from grakn.instrumentation import Listener
+from grakn.retry import RetryPolicy
+
+_UNHEALTHY_STATES = {grpc.ChannelConnectivity.TRANSIENT_FAILURE, grpc.ChannelConnectivity.SHUTDOWN}
+
+
+class _PooledChannel:
+    """A channel in a pool, which is unhealthy from when a transaction fails to open on it until it is found connected
+    by a check or a probe"""
+
+    def __init__(self, uri: str, timeout: int, options: ChannelOptions, probe_interval: float) -> None:
+        # a local subchannel pool gives every channel its own connection, instead of sharing one per uri
+        self.channel = insecure_channel(uri, options, [('grpc.use_local_subchannel_pool', 1)])
+
+        ready = grpc.channel_ready_future(self.channel)
+        try:
+            ready.result(timeout)
+        except grpc.FutureTimeoutError as e:
+            close_channel(self.channel, ready)
+            raise ConnectionError from e
+
+        self.stub = grakn_pb2_grpc.GraknStub(self.channel)
+        self.state = grpc.ChannelConnectivity.READY
+        self.probe_interval = probe_interval
+        self.probe: Optional[grpc.Future] = None
+        self.probe_after = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.state not in _UNHEALTHY_STATES
+
+    def check(self, timeout: float) -> bool:
+        """Wait for the channel to be connected, returning whether it is healthy"""
+        ready = grpc.channel_ready_future(self.channel)
+        try:
+            ready.result(timeout)
+            self.recovered()
+        except grpc.FutureTimeoutError:
+            ready.cancel()
+            self.failed()
+        return self.healthy
+
+    def failed(self) -> None:
+        """Take the channel out of rotation, until a check or a probe finds it connected"""
+        self.state = grpc.ChannelConnectivity.TRANSIENT_FAILURE
+        self.probe_after = time.monotonic() + self.probe_interval
+
+    def recovered(self) -> None:
+        self.state = grpc.ChannelConnectivity.READY
+        if self.probe is not None:
+            self.probe.cancel()
+            self.probe = None
+
+    def reprobe(self, now: float) -> None:
+        """Put the channel back into rotation if its probe has connected, or start a probe if it is time to
+
+        Probes do not block: a probe connects in the background, and is looked at by the next call.
+        """
+        if self.healthy:
+            return
+
+        if self.probe is None:
+            if now >= self.probe_after:
+                self.probe = grpc.channel_ready_future(self.channel)
+        elif self.probe.done():
+            connected = not self.probe.cancelled()
+            self.probe = None
+            if connected:
+                self.recovered()
+            else:
+                self.probe_after = now + self.probe_interval
+
+    def close(self) -> None:
+        close_channel(self.channel, self.probe)
+
+
+class _PooledTxContext:
+    """Contains a GraknTx from a ClientPool. The transaction is returned to the pool when the context closes."""
+
+    def __init__(self, pool: 'ClientPool', tx_context: GraknTxContext) -> None:
+        self._pool = pool
+        self._tx_context = tx_context
+
+    def __enter__(self) -> GraknTx:
+        return self._tx_context.__enter__()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        try:
+            self._tx_context.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._pool._release()
+
+
+class ClientPool(_BaseClient):
+    """A pool of channels to a Grakn knowledge base, identified by a uri and a keyspace.
+
+    Transactions are opened on each healthy channel in turn, and at most `max_size` of them can be open at once.
+    Opening a transaction waits up to `acquire_timeout` seconds (by default, `timeout`) for another to be released.
+    Up to `warm` of those transactions are opened ahead of use, so that opening a transaction from the pool skips
+    the `open` round trip. Warm transactions are of type `warm_tx_type`, by default 'read' as `execute` runs queries
+    that cannot write in read transactions. Warm transactions that go unused for `idle_timeout` seconds are closed.
+    The deadline of a warm transaction runs from when it is opened, so `idle_timeout` is less than `timeout`, by
+    default half of it, and a warm transaction is handed out with at least `timeout - idle_timeout` seconds left.
+
+    A channel is left out of rotation after a transaction fails to open on it. After `probe_interval` seconds, it is
+    probed in the background, and is put back into rotation by the next transaction opened once it is connected.
+    `check_health` waits for channels to connect and puts them back at once.
+
+    The label and result caches, and the `listener`, are shared by every transaction of the pool, as they are by
+    those of a `Client`.
+
+    `channel_options` apply to every channel of the pool, as they do to the channel of a `Client`.
+
+    A `retry` policy retries queries as it does for a `Client`, but checks the health of every channel before each
+    retry instead of replacing a channel, so that the retry is opened on a channel that is connected.
+    """
+
+    def __init__(self, uri: str = Client.DEFAULT_URI, keyspace: str = Client.DEFAULT_KEYSPACE, *,
+                 timeout: int = Client.DEFAULT_TIMEOUT, channels: int = 2, max_size: int = 16, warm: int = 0,
+                 warm_tx_type: str = 'read', idle_timeout: Optional[float] = None, probe_interval: float = 1,
+                 acquire_timeout: Optional[float] = None, label_cache_size: int = 0, prefetch: int = 1,
+                 result_cache_size: int = 0, result_cache_ttl: Optional[float] = None,
+                 listener: Optional[Listener] = None, retry: Optional[RetryPolicy] = None,
+                 channel_options: Optional[ChannelOptions] = None) -> None:
+        if not 0 <= warm <= max_size:
+            raise ValueError(f'warm must be between 0 and max_size, but was {warm}')
+        if idle_timeout is not None and not 0 <= idle_timeout < timeout:
+            raise ValueError(f'idle_timeout must be at least 0 and less than timeout, but was {idle_timeout}')
+        if warm_tx_type not in _TX_TYPES:
+            raise ValueError(f'warm_tx_type must be one of {", ".join(_TX_TYPES)}, but was {warm_tx_type!r}')
+
+        self.channel_options = channel_options if channel_options is not None else ChannelOptions()
+        self._channels: List[_PooledChannel] = []
+        try:
+            for _ in range(channels):
+                self._channels.append(_PooledChannel(uri, timeout, self.channel_options, probe_interval))
+        except BaseException:
+            for channel in self._channels:
+                channel.close()
+            raise
+        self._next_channel = 0
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._warm: Deque[Tuple[GraknTxContext, _PooledChannel, float]] = deque()
+        self._lock = threading.Lock()
+        self._warmer = futures.ThreadPoolExecutor(max_workers=1)
+        self._warm_size = warm
+        self.warm_tx_type = warm_tx_type
+        self._closed = False
+        self._timeout = timeout
+        self.acquire_timeout = acquire_timeout if acquire_timeout is not None else timeout
+        self.idle_timeout = idle_timeout if idle_timeout is not None else timeout / 2
+        self.prefetch = prefetch
+        self.listener = listener
+        self.retry = retry
+        self.uri = uri
+        self.keyspace = keyspace
+        self.label_cache: Optional[LRUCache[str, str]] = LRUCache(label_cache_size) if label_cache_size > 0 else None
+        self.result_cache: Optional[LRUCache[Tuple, Any]] = \
+            LRUCache(result_cache_size, result_cache_ttl) if result_cache_size > 0 else None
+
+        self._fill()
+
+    def __enter__(self) -> 'ClientPool':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    @property
+    def warm_transactions(self) -> int:
+        """The number of transactions that are open and waiting to be used"""
+        return len(self._warm)
+
+    def open(self, *, timeout: Optional[float] = None, tx_type: str = 'write') -> _PooledTxContext:
+        """Open a transaction, using a warm transaction if there is one
+
+        Warm transactions are of type `warm_tx_type` and opened with the timeout of the pool, so they are not used if
+        `timeout` or another `tx_type` is given.
+
+        :param timeout: seconds before the transaction is abandoned, instead of the timeout of the pool
+        :param tx_type: 'read', 'write' or 'batch'. Queries in a read transaction cannot write, and are not committed
+        :return: a context that can be opened using a `with` statement
+
+        :raises: TimeoutError if `max_size` transactions stay open for longer than `acquire_timeout`
+        :raises: ValueError if `tx_type` is not a type of transaction
+        """
+        if self._closed:
+            raise ValueError('pool is closed')
+
+        self.evict_idle()
+
+        tx_context = self._take_warm() if timeout is None and tx_type == self.warm_tx_type else None
+
+        if tx_context is None:
+            if not self._slots.acquire(timeout=self.acquire_timeout):
+                raise TimeoutError(f'no transaction was released within {self.acquire_timeout} seconds')
+            try:
+                tx_context, _ = self._open_tx(timeout if timeout is not None else self._timeout, tx_type)
+            except BaseException:
+                self._slots.release()
+                raise
+
+        self._refill()
+        return _PooledTxContext(self, tx_context)
+
+    def evict_idle(self) -> int:
+        """Close the warm transactions that have been unused for longer than `idle_timeout`
+
+        :return: the number of transactions closed
+        """
+        idle_since = time.monotonic() - self.idle_timeout
+
+        with self._lock:
+            idle = [warm for warm in self._warm if warm[2] <= idle_since]
+            for warm in idle:
+                self._warm.remove(warm)
+
+        # evicted transactions are not replaced until the pool is used again
+        for tx_context, _, _ in idle:
+            self._discard(tx_context, refill=False)
+
+        return len(idle)
+
+    def check_health(self, timeout: float = 1) -> int:
+        """Wait for each channel to be connected, closing warm transactions on channels that are not
+
+        :return: the number of healthy channels
+        """
+        healthy = sum(channel.check(timeout) for channel in self._channels)
+
+        with self._lock:
+            unhealthy = [warm for warm in self._warm if not warm[1].healthy]
+            for warm in unhealthy:
+                self._warm.remove(warm)
+
+        for tx_context, _, _ in unhealthy:
+            self._discard(tx_context)
+
+        return healthy
+
+    def close(self) -> None:
+        """Close every warm transaction and channel in the pool"""
+        with self._lock:
+            self._closed = True
+        self._warmer.shutdown(wait=True)
+
+        with self._lock:
+            warm, self._warm = list(self._warm), deque()
+
+        for tx_context, _, _ in warm:
+            self._discard(tx_context)
+
+        for channel in self._channels:
+            channel.close()
+
+    def _before_retry(self) -> None:
+        self.check_health(self.retry.connect_timeout)
+
+    def _take_warm(self) -> Optional[GraknTxContext]:
+        tx_context = None
+        unusable = []
+        # a transaction opened before then has too little of its deadline left
+        opened_after = time.monotonic() - self.idle_timeout
+
+        with self._lock:
+            while self._warm and tx_context is None:
+                warm_context, channel, opened_at = self._warm.popleft()
+                if channel.healthy and opened_at > opened_after:
+                    tx_context = warm_context
+                else:
+                    unusable.append(warm_context)
+
+        for warm_context in unusable:
+            self._discard(warm_context)
+
+        return tx_context
+
+    def _open_tx(self, timeout: float, tx_type: str = 'write') -> Tuple[GraknTxContext, _PooledChannel]:
+        channel = self._choose_channel()
+
+        try:
+            tx_context = GraknTxContext(self.keyspace, channel.stub, timeout, self.label_cache, self.prefetch,
+                                        self.result_cache, tx_type, self.listener, self.channel_options)
+        except ConnectionError:
+            with self._lock:
+                channel.failed()
+            raise
+
+        return tx_context, channel
+
+    def _choose_channel(self) -> _PooledChannel:
+        with self._lock:
+            now = time.monotonic()
+            for channel in self._channels:
+                channel.reprobe(now)
+
+            for _ in range(len(self._channels)):
+                channel = self._channels[self._next_channel]
+                self._next_channel = (self._next_channel + 1) % len(self._channels)
+                if channel.healthy:
+                    return channel
+
+        raise ConnectionError('no healthy channel in pool')
+
+    def _fill(self) -> None:
+        """Open transactions until there are `warm` of them, or the pool is full"""
+        while not self._closed and len(self._warm) < self._warm_size and self._slots.acquire(blocking=False):
+            try:
+                tx_context, channel = self._open_tx(self._timeout, self.warm_tx_type)
+            except (ConnectionError, GraknError):
+                self._slots.release()
+                return
+
+            with self._lock:
+                self._warm.append((tx_context, channel, time.monotonic()))
+
+    def _discard(self, tx_context: GraknTxContext, refill: bool = True) -> None:
+        try:
+            tx_context.__exit__(None, None, None)
+        except (ConnectionError, GraknError):
+            pass
+        finally:
+            self._release(refill)
+
+    def _release(self, refill: bool = True) -> None:
+        self._slots.release()
+        if refill:
+            self._refill()
+
+    def _refill(self) -> None:
+        """Replace used warm transactions in the background"""
+        # the warmer is shut down once the pool is closed
+        with self._lock:
+            if self._warm_size > 0 and not self._closed:
+                self._warmer.submit(self._fill)
@@ -0,0 +1,117 @@
+"""Retrying operations on a Grakn knowledge base after the connection to it fails."""
+import random
+import threading
+import time
+from typing import Any, Callable, ContextManager, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class RetryPolicy:
+    """When and how often to retry an operation that failed with a ConnectionError
+
+    The wait before each retry grows exponentially from `initial_backoff` up to `max_backoff`, and a random part of
+    it is skipped so that clients that failed together do not retry together. A GraknError is never retried, as
+    the server rejected the operation rather than failing to answer it.
+
+    The counters record every operation run with the policy, across every client that shares it.
+
+    :param attempts: the most times to try an operation, including the first
+    :param initial_backoff: the longest wait in seconds before the first retry
+    :param max_backoff: the longest wait in seconds before any retry
+    :param multiplier: how much the longest wait grows after each retry
+    :param connect_timeout: seconds to wait for a failed connection to recover before retrying over a new one
+    """
+
+    def __init__(self, attempts: int = 3, *, initial_backoff: float = 0.1, max_backoff: float = 5.0,
+                 multiplier: float = 2.0, connect_timeout: float = 1.0) -> None:
+        if attempts < 1:
+            raise ValueError(f'attempts must be at least 1, but was {attempts}')
+
+        self.attempts = attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.connect_timeout = connect_timeout
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.reconnects = 0
+
+    def __repr__(self) -> str:
+        return f'RetryPolicy(attempts={self.attempts}, calls={self.calls}, retries={self.retries}, ' \
+               f'failures={self.failures}, reconnects={self.reconnects})'
+
+    def backoff(self, retry: int) -> float:
+        """Return the seconds to wait before a retry, counting the first retry as 0"""
+        longest = min(self.max_backoff, self.initial_backoff * self.multiplier ** retry)
+        return self._random.uniform(0, longest)
+
+    def run(self, operation: Callable[[], T], *, retryable: Callable[[ConnectionError], bool] = lambda e: True,
+            before_retry: Optional[Callable[[], None]] = None) -> T:
+        """Run an operation, retrying it while it fails with a ConnectionError and attempts remain
+
+        :param operation: the operation to run
+        :param retryable: whether the operation can be retried after failing with the given error. An operation that
+            may have taken effect before failing, such as a commit, must not be retried
+        :param before_retry: called after waiting and before each retry, to repair the connection
+        :return: the result of the operation
+        """
+        with self._lock:
+            self.calls += 1
+
+        retry = 0
+
+        while True:
+            try:
+                return operation()
+            except ConnectionError as e:
+                if retry == self.attempts - 1 or not retryable(e):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+
+            time.sleep(self.backoff(retry))
+            retry += 1
+
+            with self._lock:
+                self.retries += 1
+
+            if before_retry is not None:
+                before_retry()
+
+    def record_reconnect(self) -> None:
+        """Count a connection that was replaced before a retry"""
+        with self._lock:
+            self.reconnects += 1
+
+
+def run_in_transaction(policy: Optional[RetryPolicy], open_tx: Callable[[], ContextManager[Any]],
+                       operation: Callable[[Any], T], *, before_retry: Optional[Callable[[], None]] = None) -> T:
+    """Run an operation in a new transaction and commit it, retrying under the policy if the connection fails
+
+    An attempt is only retried if its commit was not sent, as the commit may have taken effect. A read transaction
+    sends no commit, so reads are retried whenever they fail.
+
+    :param policy: how to retry, or None to run the operation once
+    :param open_tx: opens a transaction, returning a context that can be opened using a `with` statement
+    :param operation: the operation to run in the transaction
+    :param before_retry: called after waiting and before each retry, to repair the connection
+    :return: the result of the operation
+    """
+    commit_sent = False
+
+    def attempt() -> T:
+        nonlocal commit_sent
+        with open_tx() as tx:
+            result = operation(tx)
+            commit_sent = tx.tx_type != 'read'
+            tx.commit()
+        return result
+
+    if policy is None:
+        return attempt()
+
+    return policy.run(attempt, retryable=lambda e: not commit_sent, before_retry=before_retry)
@@ -0,0 +1,182 @@
+"""Graql query templates, with parameters bound as correctly escaped literals."""
+import datetime
+import decimal
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+# a string literal of the template, which is left as it is, a parameter, such as `<name>`, or a variable, such as
+# `$person`
+_TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|<(?P<parameter>[A-Za-z_][A-Za-z0-9_]*)>|'
+                            r'\$(?P<variable>[A-Za-z0-9_-]+)')
+
+_LITERAL, _VARIABLE, _PARAMETER = range(3)
+
+
+def literal(value: Any) -> str:
+    """Convert a value to a Graql literal of the datatype of the value
+
+    Strings are quoted and escaped. Booleans, integers and floats are written as Graql booleans, longs and doubles,
+    and dates and datetimes as Graql dates. Datetimes with a timezone are converted to UTC.
+
+    :raises: TypeError if the value has no Graql datatype, ValueError if it is a float that is not finite
+    """
+    convert = _LITERALS.get(type(value))
+    if convert is not None:
+        return convert(value)
+
+    # a subclass of a datatype, checked in order so that booleans are not taken for integers
+    for datatype, convert in _LITERALS.items():
+        if isinstance(value, datatype):
+            return convert(value)
+
+    raise TypeError(f'{type(value).__name__} has no Graql datatype')
+
+
+def _string_literal(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _double_literal(value: float) -> str:
+    if not math.isfinite(value):
+        raise ValueError(f'{value} cannot be written in Graql')
+
+    # Graql doubles have no exponent, so the shortest representation of the value is written out in full
+    digits = format(decimal.Decimal(repr(value)), 'f')
+    return digits if '.' in digits else digits + '.0'
+
+
+def _datetime_literal(value: datetime.datetime) -> str:
+    if value.utcoffset() is not None:
+        value = value.astimezone(datetime.timezone.utc)
+    return f'{value.year:04}-{value.month:02}-{value.day:02}T{value.hour:02}:{value.minute:02}:{value.second:02}.' \
+           f'{value.microsecond // 1000:03}'
+
+
+_LITERALS: Dict[type, Callable[[Any], str]] = {
+    str: _string_literal,
+    bool: lambda value: 'true' if value else 'false',
+    int: str,
+    float: _double_literal,
+    datetime.datetime: _datetime_literal,
+    datetime.date: lambda value: f'{value.year:04}-{value.month:02}-{value.day:02}',
+}
+
+
+class Template:
+    """A Graql query with parameters written as `<name>`, parsed once so it can be rendered many times
+
+    Parameters are replaced by the literal of the value bound to them, so their values never need quoting or escaping
+    by the caller:
+
+    >>> template = Template('insert $p isa person, has name <name>, has age <age>;')
+    >>> template.render(name='Alice "Al" Smith', age=42)
+    'insert $p isa person, has name "Alice \\\\"Al\\\\" Smith", has age 42;'
+
+    Rendered queries can be loaded with `Client.load`, or executed in one transaction with `GraknTx.execute_batch`:
+
+    >>> client.load(template.render_all(rows, per_query=50))
+    """
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self._parts = _parse(template)
+        # without renaming, variables are literal text, so each literal between parameters can be joined up front
+        self._unrenamed_parts = _join_literals([(_LITERAL, f'${value}') if kind == _VARIABLE else (kind, value)
+                                                for kind, value in self._parts])
+        self.parameters = tuple(dict.fromkeys(value for kind, value in self._parts if kind == _PARAMETER))
+
+    def __repr__(self) -> str:
+        return f'Template({self.template!r})'
+
+    def render(self, values: Mapping[str, Any] = None, **kwargs: Any) -> str:
+        """Render the query with the given values bound to its parameters
+
+        :raises: KeyError if a parameter has no value, TypeError or ValueError if a value cannot be written in Graql
+        """
+        return self._render({**(values or {}), **kwargs})
+
+    def render_all(self, rows: Iterable[Mapping[str, Any]], *, per_query: int = 1) -> Iterator[str]:
+        """Render a query for each row of values, as the queries are consumed
+
+        If `per_query` is more than one, that many rows are coalesced into each query, so they are executed in a single
+        request. Only `insert` queries can be coalesced. The variables of each row are renamed apart, so the rows do not
+        refer to each other's concepts.
+
+        :param rows: the values to bind to the parameters of each query
+        :param per_query: how many rows to render into each query
+        :return: an iterator of Graql query strings
+
+        :raises: ValueError if `per_query` is more than one and the template is not an `insert` query
+        """
+        if per_query <= 1:
+            return (self._render(values) for values in rows)
+
+        if not self.template.lstrip().startswith('insert'):
+            raise ValueError('only insert queries can be coalesced')
+
+        return self._coalesce(rows, per_query)
+
+    def _coalesce(self, rows: Iterable[Mapping[str, Any]], per_query: int) -> Iterator[str]:
+        statements: List[str] = []
+
+        for values in rows:
+            if not statements:
+                statements.append(self._render(values))
+            else:
+                # every row after the first drops the `insert` keyword and renames its variables
+                statement = self._render_renamed(values, f'-{len(statements)}')
+                statements.append(statement.lstrip()[len('insert'):])
+
+            if len(statements) == per_query:
+                yield ''.join(statements)
+                statements = []
+
+        if statements:
+            yield ''.join(statements)
+
+    def _render(self, values: Mapping[str, Any]) -> str:
+        return ''.join([value if kind == _LITERAL else literal(values[value]) for kind, value in self._unrenamed_parts])
+
+    def _render_renamed(self, values: Mapping[str, Any], suffix: str) -> str:
+        rendered = []
+
+        for kind, value in self._parts:
+            if kind == _LITERAL:
+                rendered.append(value)
+            elif kind == _VARIABLE:
+                rendered.append(f'${value}{suffix}')
+            else:
+                rendered.append(literal(values[value]))
+
+        return ''.join(rendered)
+
+
+def _parse(template: str) -> List[Tuple[int, str]]:
+    """Split a template into literal text, variables and parameters. String literals are always literal text."""
+    parts = []
+    position = 0
+
+    for token in _TOKEN_PATTERN.finditer(template):
+        if token.group('parameter') is not None:
+            parts += [(_LITERAL, template[position:token.start()]), (_PARAMETER, token.group('parameter'))]
+        elif token.group('variable') is not None:
+            parts += [(_LITERAL, template[position:token.start()]), (_VARIABLE, token.group('variable'))]
+        else:
+            continue
+        position = token.end()
+
+    parts.append((_LITERAL, template[position:]))
+    return [part for part in parts if part[1]]
+
+
+def _join_literals(parts: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    joined: List[Tuple[int, str]] = []
+
+    for kind, value in parts:
+        if kind == _LITERAL and joined and joined[-1][0] == _LITERAL:
+            joined[-1] = (_LITERAL, joined[-1][1] + value)
+        else:
+            joined.append((kind, value))
+
+    return joined
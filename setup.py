@@ -1,4 +1,4 @@
-from distutils.core import setup
+from setuptools import setup
 
 setup(
     name='grakn',
@@ -14,5 +14,11 @@ setup(
     classifiers=[
         'Development Status :: 5 - Production/Stable'
     ],
-    install_requires=['grpcio']
+    install_requires=['grpcio>=1.32', 'protobuf'],
+    entry_points={
+        'console_scripts': [
+            'grakn-dump=grakn.dump:dump_main',
+            'grakn-load=grakn.dump:load_main',
+        ]
+    }
 )
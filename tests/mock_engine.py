@@ -1,6 +1,14 @@
+import contextlib
+import itertools
 import json
+import queue
+import re
+import socket
+import threading
+import time
+from collections import defaultdict, deque
 from concurrent import futures
-from typing import Callable, Optional, Iterator, List, Union, Any
+from typing import Callable, Optional, Iterator, List, Union, Any, Deque, Dict, Tuple
 
 import grpc
 
@@ -33,9 +41,51 @@ grpc_responses = [QueryResult(answer=grpc_answer) for grpc_answer in grpc_answer
 
 error_message: str = 'sorry we changed the syntax again'
 
+_LIMIT_PATTERN = re.compile(r'\blimit\s+(\d+)\s*;')
 
-def eq(tx_request: TxRequest):
-    return lambda other: other == tx_request
+_THING_BASE_TYPES = {concept_pb2.Entity, concept_pb2.Relationship, concept_pb2.Attribute}
+
+# answers with only an entity, which need no concept methods to resolve
+ID_ONLY = {'x': concept_pb2.Entity}
+
+# answers with an entity, its type and an attribute, which need a label and a value resolved
+RESOLUTION_HEAVY = {'x': concept_pb2.Entity, 't': concept_pb2.EntityType, 'n': concept_pb2.Attribute}
+
+
+def eq(tx_request: TxRequest) -> '_Equals':
+    return _Equals(tx_request)
+
+
+def exec_query(query_string: str) -> '_ExecQuery':
+    return _ExecQuery(query_string)
+
+
+class _Equals:
+    """Matches requests equal to a given request. These matchers are found by the bytes of the request"""
+
+    def __init__(self, tx_request: TxRequest):
+        self.request = tx_request
+        self.key = ('request', tx_request.SerializeToString(deterministic=True))
+
+    def __call__(self, other: TxRequest) -> bool:
+        return other == self.request
+
+
+class _ExecQuery:
+    """Matches requests to execute a given query. These matchers are found by the query"""
+
+    def __init__(self, query_string: str):
+        self.key = ('execQuery', query_string)
+
+    def __call__(self, other: TxRequest) -> bool:
+        return other.execQuery.query.value == self.key[1]
+
+
+def _keys(request: TxRequest) -> List[Tuple[str, Any]]:
+    keys = [('request', request.SerializeToString(deterministic=True))]
+    if request.HasField('execQuery'):
+        keys.append(('execQuery', request.execQuery.query.value))
+    return keys
 
 
 class MockResponse:
@@ -52,6 +102,11 @@ class MockResponse:
         self._response = response
         self._error = error
 
+    @property
+    def key(self) -> Optional[Tuple[str, Any]]:
+        """The key requests matching this response are found by, if the matcher has one"""
+        return getattr(self._request_matcher, 'key', None)
+
     def test(self, request: TxRequest) -> Optional[TxResponse]:
         if self._request_matcher(request):
             if self._response is not None:
@@ -62,50 +117,224 @@ class MockResponse:
             return None
 
 
+class _Script:
+    """Mocked responses, each used once, in the order they were given among those matching a request
+
+    Responses made with `eq` or `exec_query` are found by the request, so a long script does not need to be scanned.
+    """
+
+    def __init__(self, responses: List[MockResponse]):
+        self._indexed: Dict[Tuple[str, Any], Deque[Tuple[int, MockResponse]]] = defaultdict(deque)
+        self._unindexed: List[Tuple[int, MockResponse]] = []
+        self._remaining = len(responses)
+        self._lock = threading.Lock()
+
+        for position, mock_response in enumerate(responses):
+            key = mock_response.key
+            if key is not None:
+                self._indexed[key].append((position, mock_response))
+            else:
+                self._unindexed.append((position, mock_response))
+
+    def take(self, request: TxRequest) -> Union[TxResponse, str, None]:
+        """Use up the first response matching the request, returning it or its error message"""
+        if not self._remaining:
+            return None
+
+        with self._lock:
+            candidates = [self._indexed[key] for key in _keys(request) if self._indexed.get(key)]
+            first = min(candidates, key=lambda responses: responses[0][0], default=None)
+
+            for index, (position, mock_response) in enumerate(self._unindexed):
+                if first is not None and position > first[0][0]:
+                    break
+                if mock_response.test(request) is not None:
+                    self._remaining -= 1
+                    return self._unindexed.pop(index)[1].test(request)
+
+            if first is None:
+                return None
+
+            self._remaining -= 1
+            return first.popleft()[1].test(request)
+
+
+class SyntheticAnswers:
+    """Generates the answers to any query, without storing anything
+
+    The number of answers to a query is taken from its `limit`, or is one for an `insert` query. Other queries have a
+    single result. Answers are generated as they are requested, so a query can stream millions of them.
+
+    :param mix: the base type of each variable of an answer
+    :param distinct_types: how many schema concepts the schema concept variables of answers are spread over
+    :param value_size: the least number of characters in the value of each attribute
+    """
+
+    def __init__(self, mix: Optional[Dict[str, int]] = None, distinct_types: int = 10, value_size: int = 0):
+        self.mix = mix if mix is not None else ID_ONLY
+        self.distinct_types = distinct_types
+        self.value_size = value_size
+        self._counter = itertools.count()
+
+    def respond(self, request: TxRequest, iterators: Dict[int, Iterator[QueryResult]]) -> TxResponse:
+        if request.HasField('execQuery'):
+            query_string = request.execQuery.query.value
+            limit = _LIMIT_PATTERN.search(query_string)
+
+            if limit is not None:
+                count = int(limit.group(1))
+            elif query_string.lstrip().startswith('insert'):
+                count = 1
+            else:
+                # an aggregate or other query with a single result
+                return TxResponse(queryResult=QueryResult(otherResult='1'))
+
+            iterator_id = len(iterators) + 1
+            while iterator_id in iterators:
+                iterator_id += 1
+            iterators[iterator_id] = self._answers(count)
+            return TxResponse(iteratorId=IteratorId(id=iterator_id))
+        elif request.HasField('next'):
+            answers = iterators.get(request.next.iteratorId.id)
+            result = next(answers, None) if answers is not None else None
+            return TxResponse(queryResult=result) if result is not None else DONE
+        elif request.HasField('stop'):
+            iterators.pop(request.stop.iteratorId.id, None)
+            return DONE
+        elif request.HasField('runConceptMethod'):
+            cid = request.runConceptMethod.id.value
+            if request.runConceptMethod.conceptMethod.HasField('getLabel'):
+                return TxResponse(conceptResponse=ConceptResponse(label=Label(value=f'label-{cid}')))
+            else:
+                text = f'value-{cid}'
+                if len(text) < self.value_size:
+                    text = ' '.join([text] * (self.value_size // (len(text) + 1) + 1))
+                value = concept_pb2.AttributeValue(string=text)
+                return TxResponse(conceptResponse=ConceptResponse(attributeValue=value))
+        else:
+            return DONE
+
+    def _answers(self, count: int) -> Iterator[QueryResult]:
+        for _ in range(count):
+            i = next(self._counter)
+            concepts = {}
+
+            for var, base_type in self.mix.items():
+                if base_type in _THING_BASE_TYPES:
+                    cid = f'{var.upper()}{i}'
+                else:
+                    cid = f'T{i % self.distinct_types}'
+                concepts[var] = Concept(id=ConceptId(value=cid), baseType=base_type)
+
+            yield QueryResult(answer=Answer(answer=concepts))
+
+
 class MockGraknServicer(GraknServicer):
-    """A mock implementation of GraknServicer that has a set of mocked responses that can be set."""
+    """A mock implementation of GraknServicer that has a set of mocked responses that can be set.
 
-    def __init__(self):
-        self._responses = []
-        self._requests = None
+    Requests without a mocked response are answered by `answers` if given, and otherwise with DONE. Each `Tx` stream
+    has its own iterators, so concurrent transactions do not affect each other.
+
+    :param answers: generates responses to requests that have no mocked response
+    :param latency: seconds between receiving a request and sending its response. Pipelined requests wait for
+        their latency at the same time, as they would over a network
+    :param log: print every request and response
+    :param record: keep every request, so it can be verified
+    """
+
+    def __init__(self, answers: Optional[SyntheticAnswers] = None, latency: float = 0, log: bool = False,
+                 record: bool = True):
+        self.answers = answers
+        self.latency = latency
+        self.log = log
+        self.record = record
+        self._script = _Script([])
+        self._streams: List[List[TxRequest]] = []
+        self._lock = threading.Lock()
 
     @property
     def requests(self) -> List[TxRequest]:
-        return list(self._requests)
+        """Every request received, one stream after another"""
+        with self._lock:
+            return [request for stream in self._streams for request in stream]
+
+    @property
+    def streams(self) -> List[List[TxRequest]]:
+        """The requests received on each stream, in the order the streams were opened"""
+        with self._lock:
+            return [list(stream) for stream in self._streams]
 
-    def init(self, responses: List[TxResponse]):
-        self._responses = list(responses)
-        self._requests = None
+    def init(self, responses: List[MockResponse]):
+        self._script = _Script(responses)
+        with self._lock:
+            self._streams = []
 
     def Tx(self, request_iterator: Iterator[TxRequest], context: grpc.ServicerContext) -> Iterator[TxResponse]:
-        self._requests = []
+        requests: List[TxRequest] = []
+        iterators: Dict[int, Iterator[QueryResult]] = {}
 
-        for request in request_iterator:
-            print(f"REQUEST: {request}")
-            self._requests.append(request)
+        if self.record:
+            with self._lock:
+                self._streams.append(requests)
 
-            for mock_response in self._responses:
-                tx_response = mock_response.test(request)
-                if tx_response is not None:
-                    print(f"RESPONSE: {tx_response}")
-                    self._responses.remove(mock_response)
+        for request, received_at in self._receive(request_iterator):
+            if self.log:
+                print(f"REQUEST: {request}")
+            if self.record:
+                requests.append(request)
 
-                    if isinstance(tx_response, TxResponse):
-                        yield tx_response
-                    else:
-                        # return an error message
-                        context.set_trailing_metadata([("ErrorType", error_type)])
-                        context.abort(grpc.StatusCode.UNKNOWN, tx_response)
+            tx_response = self._script.take(request)
+            if tx_response is None:
+                tx_response = self.answers.respond(request, iterators) if self.answers is not None else DONE
 
-                    break
+            if self.latency > 0:
+                time.sleep(max(0.0, received_at + self.latency - time.monotonic()))
+
+            if self.log:
+                print(f"RESPONSE: {tx_response}")
+
+            if isinstance(tx_response, TxResponse):
+                yield tx_response
             else:
-                print(f"RESPONSE: {DONE}")
-                yield DONE
+                # return an error message
+                context.set_trailing_metadata([("ErrorType", error_type)])
+                context.abort(grpc.StatusCode.UNKNOWN, tx_response)
+
+    def _receive(self, request_iterator: Iterator[TxRequest]) -> Iterator[Tuple[TxRequest, float]]:
+        """Read requests on another thread if there is latency, so each is timed from when it arrived"""
+        if self.latency <= 0:
+            for request in request_iterator:
+                yield request, 0.0
+            return
+
+        received: queue.Queue = queue.Queue()
+
+        def read() -> None:
+            try:
+                for request in request_iterator:
+                    received.put((request, time.monotonic()))
+            except grpc.RpcError:
+                # the client cancelled the call
+                pass
+            finally:
+                received.put(None)
+
+        threading.Thread(target=read, daemon=True).start()
+        yield from iter(received.get, None)
 
     def Delete(self, request, context):
         raise NotImplementedError
 
 
+def free_ports(count: int) -> List[int]:
+    """Return distinct ports that no server is listening on"""
+    with contextlib.ExitStack() as stack:
+        sockets = [stack.enter_context(socket.socket(socket.AF_INET6, socket.SOCK_STREAM)) for _ in range(count)]
+        for sock in sockets:
+            sock.bind(('::', 0))
+        return [sock.getsockname()[1] for sock in sockets]
+
+
 class GrpcServer:
     """A gRPCs server containing a MockGraknServicer"""
 
@@ -113,13 +342,20 @@ class GrpcServer:
     def requests(self) -> List[TxRequest]:
         return list(self._servicer.requests)
 
-    def __init__(self):
-        servicer = MockGraknServicer()
+    @property
+    def streams(self) -> List[List[TxRequest]]:
+        return self._servicer.streams
+
+    def __init__(self, servicer: GraknServicer = None, port: int = 48556,
+                 compression: Optional[grpc.Compression] = None):
+        servicer = servicer if servicer is not None else MockGraknServicer()
 
         thread_pool = futures.ThreadPoolExecutor()
-        server = grpc.server(thread_pool)
+        # without port reuse, a server left on the port fails this one, rather than silently answering its clients
+        server = grpc.server(thread_pool, compression=compression, options=[('grpc.so_reuseport', 0)])
         grakn_pb2_grpc.add_GraknServicer_to_server(servicer, server)
-        server.add_insecure_port('[::]:48556')
+        if not server.add_insecure_port(f'[::]:{port}'):
+            raise RuntimeError(f'port {port} is in use')
         server.start()
 
         self._servicer = servicer
@@ -129,10 +365,19 @@ class GrpcServer:
         self._servicer.init(responses)
 
     def stop(self):
-        self._server.stop(False)
+        # the port is reused, so the server must be gone before another starts on it
+        self._server.stop(None).wait()
 
 
 class MockEngine:
+    @property
+    def requests(self) -> List[TxRequest]:
+        return self._server.requests
+
+    @property
+    def streams(self) -> List[List[TxRequest]]:
+        return self._server.streams
+
     def verify(self, predicate: Union[TxRequest, Callable[[TxRequest], bool]]):
         """Assert that a TxRequest has been sent matching the given predicate"""
         assert self._test_tx_request(predicate), f"Expected {predicate}"
@@ -175,34 +420,53 @@ def _mock_value_response(cid: str, value: concept_pb2.AttributeValue) -> MockRes
     return MockResponse(eq(request), TxResponse(conceptResponse=concept_response))
 
 
-def engine_responding_to_streaming_query() -> MockEngine:
-    # respond with an iterator to execQuery request
-    mock_responses = [MockResponse(_is_exec_query, ITERATOR_RESPONSE)]
+def engine_responding_to_streaming_query(times: int = 1) -> MockEngine:
+    mock_responses = []
 
-    # respond with a bunch of query results each time NEXT is called
-    mock_responses += [MockResponse(eq(NEXT), TxResponse(queryResult=grpc_response)) for grpc_response in
-                       grpc_responses]
+    for _ in range(times):
+        # respond with an iterator to execQuery request
+        mock_responses.append(MockResponse(exec_query(query), ITERATOR_RESPONSE))
 
-    # the last time NEXT is called, return DONE
-    mock_responses.append(MockResponse(eq(NEXT), DONE))
+        # respond with a bunch of query results each time NEXT is called
+        mock_responses += [MockResponse(eq(NEXT), TxResponse(queryResult=grpc_response)) for grpc_response in
+                           grpc_responses]
+
+        # the last time NEXT is called, return DONE
+        mock_responses.append(MockResponse(eq(NEXT), DONE))
 
-    # return the correct labels and other properties for each concept
+        # return the correct value for each attribute
+        mock_responses.append(_mock_value_response('b', concept_pb2.AttributeValue(long=100)))
+
+    # return the correct labels for each schema concept, which can be cached between queries
     mock_responses += [
         _mock_label_response('a', 'concept'),
-        _mock_value_response('b', concept_pb2.AttributeValue(long=100)),
         _mock_label_response('c', 'resource')
     ]
 
     return MockEngine(mock_responses)
 
 
+def engine_responding_with_repeated_concept() -> MockEngine:
+    repeated_answer = Answer(answer={'x': Concept(id=ConceptId(value='a'), baseType=concept_pb2.MetaType)})
+
+    mock_responses = [MockResponse(exec_query(query), ITERATOR_RESPONSE)]
+    mock_responses += [MockResponse(eq(NEXT), TxResponse(queryResult=QueryResult(answer=repeated_answer)))] * 2
+    mock_responses.append(MockResponse(eq(NEXT), DONE))
+
+    # the label is only available once, so asking for it twice would return an empty label
+    mock_responses.append(_mock_label_response('a', 'concept'))
+
+    return MockEngine(mock_responses)
+
+
 def engine_responding_to_single_answer_query(answer: Any) -> MockEngine:
-    mock_responses = [MockResponse(_is_exec_query, TxResponse(queryResult=QueryResult(otherResult=json.dumps(answer))))]
+    single_answer = TxResponse(queryResult=QueryResult(otherResult=json.dumps(answer)))
+    mock_responses = [MockResponse(exec_query(query), single_answer)]
     return MockEngine(mock_responses)
 
 
 def engine_responding_to_void_query() -> MockEngine:
-    mock_responses = [MockResponse(_is_exec_query, DONE)]
+    mock_responses = [MockResponse(exec_query(query), DONE)]
     return MockEngine(mock_responses)
 
 
@@ -214,6 +478,3 @@ def engine_responding_bad_request() -> MockEngine:
     error_response = MockResponse(lambda req: req.HasField('execQuery'), error=error_message)
     return MockEngine([error_response])
 
-
-def _is_exec_query(request: TxRequest) -> bool:
-    return request.execQuery.query.value == query
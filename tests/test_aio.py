@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from typing import Any, Awaitable
+
+from grakn.aio import AsyncClient
+from grakn.client import GraknError
+from grakn_pb2 import TxRequest, Keyspace, Open, Read, Write, Commit
+from iterator_pb2 import Stop
+from tests.mock_engine import query, ITERATOR_ID, engine_responding_to_streaming_query, \
+    engine_responding_with_nothing, engine_responding_to_void_query, engine_responding_to_single_answer_query, \
+    GrpcServer, MockGraknServicer, SyntheticAnswers
+from tests.test_grakn import expected_response, mock_uri, mock_uri_to_no_server, keyspace
+
+
+class TestAsyncExecute(unittest.TestCase):
+    def test_valid_query_returns_expected_response(self) -> None:
+        async def execute():
+            async with client() as grakn_client:
+                return await grakn_client.execute(query)
+
+        with engine_responding_to_streaming_query():
+            self.assertEqual(run(execute()), expected_response)
+
+    def test_sends_open_and_commit_requests(self) -> None:
+        async def execute():
+            async with client() as grakn_client:
+                await grakn_client.execute(query, tx_type='write')
+
+        with engine_responding_to_streaming_query() as engine:
+            run(execute())
+            engine.verify(TxRequest(open=Open(keyspace=Keyspace(value=keyspace), txType=Write)))
+            engine.verify(TxRequest(commit=Commit()))
+
+    def test_executes_read_query_in_read_transaction_without_commit(self) -> None:
+        async def execute():
+            async with client() as grakn_client:
+                await grakn_client.execute(query)
+
+        with engine_responding_to_streaming_query() as engine:
+            run(execute())
+            engine.verify(TxRequest(open=Open(keyspace=Keyspace(value=keyspace), txType=Read)))
+            self.assertFalse(any(request.HasField('commit') for request in engine.requests))
+
+    def test_valid_query_with_prefetch_returns_expected_response(self) -> None:
+        async def execute():
+            async with client(prefetch=3) as grakn_client:
+                return await grakn_client.execute(query)
+
+        with engine_responding_to_streaming_query():
+            self.assertEqual(run(execute()), expected_response)
+
+    def test_throws_without_server(self) -> None:
+        async def execute():
+            grakn_client = AsyncClient(uri=mock_uri_to_no_server, keyspace=keyspace, timeout=0)
+            async with grakn_client:
+                await grakn_client.execute(query)
+
+        with self.assertRaises(ConnectionError):
+            run(execute())
+
+
+class TestAsyncExecuteOnTx(unittest.TestCase):
+    def test_valid_query_with_one_result_returns_expected_response(self) -> None:
+        async def execute():
+            async with client() as grakn_client, grakn_client.open() as tx:
+                return await tx.execute(query)
+
+        with engine_responding_to_single_answer_query(100):
+            self.assertEqual(run(execute()), 100)
+
+    def test_valid_query_with_no_results_returns_expected_response(self) -> None:
+        async def execute():
+            async with client() as grakn_client, grakn_client.open() as tx:
+                return await tx.execute(query)
+
+        with engine_responding_to_void_query():
+            self.assertIsNone(run(execute()))
+
+    def test_valid_query_yields_expected_response(self) -> None:
+        async def execute():
+            async with client() as grakn_client, grakn_client.open() as tx:
+                return [result async for result in tx.execute_iter(query, page_size=2)]
+
+        with engine_responding_to_streaming_query():
+            self.assertEqual(run(execute()), expected_response)
+
+    def test_stops_iterator_when_closed_early(self) -> None:
+        async def execute():
+            async with client() as grakn_client, grakn_client.open() as tx:
+                results = tx.execute_iter(query)
+                await results.__anext__()
+                await results.aclose()
+
+        with engine_responding_to_streaming_query() as engine:
+            run(execute())
+            engine.verify(TxRequest(stop=Stop(iteratorId=ITERATOR_ID)))
+
+    def test_concurrent_queries_on_one_transaction_return_expected_response(self) -> None:
+        async def execute():
+            async with client() as grakn_client, grakn_client.open() as tx:
+                return await asyncio.gather(tx.execute(query), tx.commit())
+
+        with engine_responding_to_streaming_query():
+            self.assertEqual(run(execute()), [expected_response, None])
+
+    def test_closes_transaction_when_exchange_is_cancelled(self) -> None:
+        async def execute():
+            async with client() as grakn_client, grakn_client.open() as tx:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(tx.execute('match $x isa person; limit 5; get;'), 0.01)
+                await tx.execute('match $x isa person; limit 5; get;')
+
+        server = GrpcServer(MockGraknServicer(SyntheticAnswers(), latency=0.05))
+        try:
+            with self.assertRaises(GraknError):
+                run(execute())
+        finally:
+            server.stop()
+
+
+class TestAsyncExecuteIter(unittest.TestCase):
+    def test_valid_query_yields_expected_response(self) -> None:
+        async def execute():
+            async with client() as grakn_client:
+                return [result async for result in grakn_client.execute_iter(query)]
+
+        with engine_responding_to_streaming_query():
+            self.assertEqual(run(execute()), expected_response)
+
+
+def client(**kwargs) -> AsyncClient:
+    return AsyncClient(uri=mock_uri, keyspace=keyspace, timeout=5, **kwargs)
+
+
+def run(coroutine: Awaitable) -> Any:
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
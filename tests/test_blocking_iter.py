@@ -0,0 +1,35 @@
+import threading
+import unittest
+
+from grakn.blocking_iter import BlockingIter
+
+
+class TestBlockingIter(unittest.TestCase):
+    def test_yields_added_elements_in_order_until_closed(self) -> None:
+        elems = BlockingIter()
+        elems.add(1)
+        elems.add(2)
+        elems.close()
+        self.assertEqual(list(elems), [1, 2])
+
+    def test_rejects_none(self) -> None:
+        with self.assertRaises(ValueError):
+            BlockingIter().add(None)
+
+    def test_blocks_until_element_is_added_from_another_thread(self) -> None:
+        elems = BlockingIter()
+        threading.Timer(0.05, lambda: (elems.add('a'), elems.close())).start()
+        self.assertEqual(list(elems), ['a'])
+
+    def test_bounded_iter_blocks_producer_when_full(self) -> None:
+        elems = BlockingIter(maxsize=1)
+        elems.add(1)
+        producer = threading.Thread(target=elems.add, args=(2,))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.is_alive())
+
+        self.assertEqual(next(elems), 1)
+        producer.join(1)
+        self.assertFalse(producer.is_alive())
+        self.assertEqual(next(elems), 2)
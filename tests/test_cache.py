@@ -0,0 +1,46 @@
+import unittest
+
+from grakn.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_counts_hits_and_misses(self) -> None:
+        cache = LRUCache()
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used_entry(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_clear_removes_entries(self) -> None:
+        cache = LRUCache()
+        cache.put('a', 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_expired_entries_are_misses(self) -> None:
+        cache = LRUCache(ttl=0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual((cache.misses, cache.evictions, len(cache)), (1, 1, 0))
+
+    def test_entries_are_kept_until_they_expire(self) -> None:
+        cache = LRUCache(ttl=60)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_put_is_ignored_after_clear_since_generation(self) -> None:
+        cache = LRUCache()
+        generation = cache.generation
+        cache.clear()
+        cache.put('a', 1, generation)
+        self.assertEqual(len(cache), 0)
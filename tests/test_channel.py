@@ -0,0 +1,103 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+import grpc
+
+import grakn
+from grakn.channel import CallWatchdog, ChannelOptions, cancel_call, close_channel, insecure_channel
+from tests.mock_engine import GrpcServer, MockGraknServicer, RESOLUTION_HEAVY, SyntheticAnswers, \
+    engine_responding_to_streaming_query, engine_responding_with_nothing, query
+
+mock_uri: str = 'localhost:48556'
+keyspace: str = 'somesortofkeyspace'
+
+
+class TestChannelOptions(unittest.TestCase):
+    def test_has_no_grpc_options_by_default(self) -> None:
+        self.assertEqual(ChannelOptions().grpc_options(), [])
+        self.assertEqual(ChannelOptions().grpc_compression(), grpc.Compression.NoCompression)
+
+    def test_converts_options_to_grpc_options(self) -> None:
+        options = ChannelOptions(max_send_message_length=1, max_receive_message_length=2, keepalive_time=30,
+                                 keepalive_timeout=0.5, keepalive_without_calls=True)
+        self.assertEqual(dict(options.grpc_options()), {
+            'grpc.max_send_message_length': 1,
+            'grpc.max_receive_message_length': 2,
+            'grpc.keepalive_time_ms': 30000,
+            'grpc.keepalive_timeout_ms': 500,
+            'grpc.keepalive_permit_without_calls': 1,
+        })
+
+    def test_converts_compression_to_grpc_compression(self) -> None:
+        self.assertEqual(ChannelOptions(compression='gzip').grpc_compression(), grpc.Compression.Gzip)
+
+    def test_rejects_unknown_compression(self) -> None:
+        with self.assertRaises(ValueError):
+            ChannelOptions(compression='zstd').grpc_compression()
+
+
+class TestCloseChannel(unittest.TestCase):
+    def test_closes_channel_once_its_state_is_no_longer_watched(self) -> None:
+        with engine_responding_with_nothing():
+            channel = insecure_channel(mock_uri, ChannelOptions())
+            grpc.channel_ready_future(channel).result(5)
+            probe = grpc.channel_ready_future(channel)
+
+            close_channel(channel, probe)
+
+        self.assertTrue(probe.done())
+        self.assertFalse(channel._connectivity_state.polling)
+
+
+class FakeCall:
+    def __init__(self, has_status: bool = False) -> None:
+        self.cancelled = threading.Event()
+        self.has_status = has_status
+        self._call = SimpleNamespace(cancel=lambda code, details: self.cancelled.set())
+
+    def cancel(self) -> bool:
+        if self.has_status:
+            return False
+        self.cancelled.set()
+        return True
+
+
+class TestCallWatchdog(unittest.TestCase):
+    def test_cancels_call_still_watched_after_its_deadline(self) -> None:
+        watchdog = CallWatchdog(grace=0.05)
+        late, answered = FakeCall(), FakeCall()
+        watchdog.watch(late, 0.05)
+        watchdog.unwatch(watchdog.watch(answered, 0.05))
+
+        self.assertTrue(late.cancelled.wait(5))
+        self.assertFalse(answered.cancelled.is_set())
+
+    def test_cancels_operations_of_call_that_has_its_status(self) -> None:
+        call = FakeCall(has_status=True)
+        cancel_call(call)
+        self.assertTrue(call.cancelled.is_set())
+
+
+class TestClientChannelOptions(unittest.TestCase):
+    def test_executes_query_with_options(self) -> None:
+        options = ChannelOptions(keepalive_time=60, compression='gzip', wait_for_ready=True)
+        with engine_responding_to_streaming_query():
+            client = grakn.Client(uri=mock_uri, keyspace=keyspace, channel_options=options)
+            self.assertEqual(len(client.execute(query)), 3)
+
+    def test_receives_compressed_responses(self) -> None:
+        answers = SyntheticAnswers(RESOLUTION_HEAVY, value_size=1000)
+        server = GrpcServer(MockGraknServicer(answers), compression=grpc.Compression.Gzip)
+        try:
+            client = grakn.Client(uri=mock_uri, keyspace=keyspace, channel_options=ChannelOptions(compression='gzip'))
+            result = client.execute('match $x isa person; limit 10; get;')
+            self.assertEqual(len(result), 10)
+            self.assertTrue(all(len(answer['n']['value']) >= 1000 for answer in result))
+        finally:
+            server.stop()
+
+    def test_fails_to_receive_message_over_size_limit(self) -> None:
+        options = ChannelOptions(max_receive_message_length=10)
+        with engine_responding_to_streaming_query(), self.assertRaises(ConnectionError):
+            grakn.Client(uri=mock_uri, keyspace=keyspace, channel_options=options).execute(query)
@@ -0,0 +1,112 @@
+import contextlib
+import time
+import unittest
+from contextlib import ExitStack
+
+import grakn
+from grakn.cluster import ClusterClient
+from tests.mock_engine import GrpcServer, MockGraknServicer, SyntheticAnswers, free_ports
+
+keyspace: str = 'somesortofkeyspace'
+uri_to_no_server: str = 'localhost:9999'
+read_query: str = 'match $x isa person; limit 2; get;'
+write_query: str = 'insert $x isa person;'
+
+
+class TestClusterClient(unittest.TestCase):
+    def setUp(self) -> None:
+        # each test has its own ports, so a node that is stopped cannot be answered by a server of another test
+        self.ports = free_ports(2)
+        self.uris = [f'localhost:{port}' for port in self.ports]
+        self._servers = ExitStack()
+        self.servers = [GrpcServer(MockGraknServicer(SyntheticAnswers()), port) for port in self.ports]
+        for server in self.servers:
+            self._servers.callback(server.stop)
+
+    def tearDown(self) -> None:
+        self._servers.close()
+
+    def test_executes_query(self) -> None:
+        with ClusterClient(self.uris, keyspace) as cluster:
+            self.assertEqual(len(cluster.execute(read_query)), 2)
+
+    def test_opens_concurrent_transactions_on_least_busy_nodes(self) -> None:
+        with ClusterClient(self.uris, keyspace) as cluster, cluster.open(tx_type='read'), cluster.open(tx_type='read'):
+            self.assertEqual([node.outstanding for node in cluster.nodes], [1, 1])
+
+    def test_spreads_reads_across_nodes(self) -> None:
+        with ClusterClient(self.uris, keyspace, timeout=2, routing='latency') as cluster:
+            for _ in range(10):
+                cluster.execute(read_query)
+            self.assertEqual([node.outstanding for node in cluster.nodes], [0, 0])
+
+        self.assertTrue(all(server.streams for server in self.servers))
+
+    def test_pins_writes_to_primary(self) -> None:
+        with ClusterClient(self.uris, keyspace, primary=self.uris[1]) as cluster:
+            for _ in range(4):
+                cluster.execute(write_query)
+
+        self.assertEqual([len(server.streams) for server in self.servers], [0, 4])
+
+    def test_routes_around_node_without_server(self) -> None:
+        with ClusterClient([uri_to_no_server, self.uris[0]], keyspace, timeout=1) as cluster:
+            self.assertEqual([node.healthy for node in cluster.nodes], [False, True])
+            for _ in range(3):
+                cluster.execute(read_query)
+            self.assertEqual(cluster.check_health(0.1), 1)
+
+        self.assertEqual(len(self.servers[0].streams), 3)
+
+    def test_takes_node_out_of_rotation_after_errors(self) -> None:
+        with ClusterClient(self.uris, keyspace, timeout=2, primary=self.uris[0]) as cluster:
+            self.servers[0].stop()
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    cluster.execute(write_query)
+
+            self.assertEqual([node.healthy for node in cluster.nodes], [False, True])
+            self.assertEqual(len(cluster.execute(read_query)), 2)
+
+    def test_fails_writes_at_once_while_primary_is_out_of_rotation(self) -> None:
+        with ClusterClient(self.uris, keyspace, timeout=2, primary=self.uris[0]) as cluster:
+            self.servers[0].stop()
+            with self.assertRaises(ConnectionError):
+                cluster.execute(write_query)
+
+            with self.assertRaisesRegex(ConnectionError, 'primary .* is unavailable'):
+                cluster.open(tx_type='write')
+            self.assertEqual([node.outstanding for node in cluster.nodes], [0, 0])
+
+    def test_puts_nodes_back_into_rotation_once_they_recover(self) -> None:
+        with ClusterClient(self.uris[:1], keyspace, timeout=2, probe_interval=0) as cluster:
+            self.servers[0].stop()
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    cluster.execute(read_query)
+
+            self.servers[0] = GrpcServer(MockGraknServicer(SyntheticAnswers()), self.ports[0])
+            self._servers.callback(self.servers[0].stop)
+
+            deadline = time.monotonic() + 5
+            while not cluster.nodes[0].healthy and time.monotonic() < deadline:
+                with contextlib.suppress(ConnectionError):
+                    cluster.execute(read_query)
+                time.sleep(0.05)
+
+            self.assertEqual(len(cluster.execute(read_query)), 2)
+
+    def test_throws_without_any_server(self) -> None:
+        with self.assertRaises(ConnectionError):
+            ClusterClient([uri_to_no_server], keyspace, timeout=0)
+
+    def test_rejects_primary_that_is_not_a_node(self) -> None:
+        with self.assertRaises(ValueError):
+            ClusterClient(self.uris, keyspace, primary=uri_to_no_server)
+
+    def test_rejects_unknown_routing(self) -> None:
+        with self.assertRaises(ValueError):
+            ClusterClient(self.uris, keyspace, routing='random')
+
+    def test_is_exported(self) -> None:
+        self.assertIs(grakn.ClusterClient, ClusterClient)
@@ -0,0 +1,36 @@
+import unittest
+
+import concept_pb2
+from concept_pb2 import Concept, ConceptId
+from grakn.columnar import ColumnBuilder
+from grakn_pb2 import Answer, QueryResult
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def answer(cid: str, base_type: int) -> QueryResult:
+    return QueryResult(answer=Answer(answer={'x': Concept(id=ConceptId(value=cid), baseType=base_type)}))
+
+
+class TestColumnBuilder(unittest.TestCase):
+    def test_appends_pages_to_columns(self) -> None:
+        builder = ColumnBuilder()
+        builder.parse_page([answer('a', concept_pb2.Attribute)], {}, {'a': 1})
+        builder.parse_page([answer('b', concept_pb2.Attribute)], {}, {'b': 2})
+        self.assertEqual(builder.build().to_dict(), {'x.id': ['a', 'b'], 'x.value': [1, 2]})
+
+    def test_rejects_results_that_are_not_answers(self) -> None:
+        with self.assertRaises(ValueError):
+            ColumnBuilder().parse_page([QueryResult(otherResult='100')], {}, {})
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_value_columns_have_dtype_of_their_values(self) -> None:
+        builder = ColumnBuilder()
+        builder.parse_page([answer('a', concept_pb2.Attribute), answer('b', concept_pb2.Attribute)], {},
+                           {'a': 1.5, 'b': 2})
+        arrays = builder.build().to_numpy()
+        self.assertEqual(arrays['x.value'].dtype, numpy.float64)
+        self.assertEqual(arrays['x.id'].dtype, object)
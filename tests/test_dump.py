@@ -0,0 +1,213 @@
+import gzip
+import json
+import os
+import re
+import tempfile
+import unittest
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+
+from grakn.dump import dump, load, read_schema, schema_query, _export_records, MANIFEST_FILE, RELATIONSHIP, Partition
+
+# each type of the schema, with its supertypes from the nearest to the furthest
+supertypes = {
+    'thing': [],
+    'entity': ['thing'],
+    'attribute': ['thing'],
+    'relationship': ['thing'],
+    'role': [],
+    'person': ['entity', 'thing'],
+    'employee': ['person', 'entity', 'thing'],
+    'name': ['attribute', 'thing'],
+    'marriage': ['relationship', 'thing'],
+    'spouse': ['role'],
+    '@has-name-owner': ['role'],
+}
+
+schema_answers = {
+    'match $x sub $y; get;': [(label, supertype) for label, supers in supertypes.items() for supertype in supers] + [
+        (label, label) for label in supertypes],
+    'match $x sub attribute, datatype string; get;': [('name',)],
+    'match $x relates $y; get;': [('marriage', 'spouse')],
+    'match $x plays $y; get;': [('person', 'spouse'), ('person', '@has-name-owner'), ('employee', 'spouse'),
+                                ('employee', '@has-name-owner')],
+}
+
+instances = {
+    'match $x isa! person; get;': ['V1', 'V2'],
+    'match $x isa! employee; get;': ['V3'],
+    'match $x isa! name; get;': ['V4'],
+}
+
+relationships = {
+    'match $r isa! marriage; get;': ['V5'],
+}
+
+role_players = {
+    'match $r id V5; $r (spouse: $p); get;': ['V1', 'V2'],
+}
+
+ownerships = {
+    'match $o has name $a; $a isa! name; get;': [('V1', 'V4')],
+}
+
+
+class FakeTx:
+    def __init__(self, keyspace: 'FakeKeyspace') -> None:
+        self._keyspace = keyspace
+        self._queries: List[str] = []
+
+    def __enter__(self) -> 'FakeTx':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def execute(self, query: str, *, lazy: bool = False) -> List[Dict[str, Any]]:
+        if query in role_players:
+            self._keyspace.read.append(query)
+            return [{'p': SimpleNamespace(id=player)} for player in role_players[query]]
+
+        for old_id in re.findall(r'id (V\w+);', query):
+            if old_id not in self._keyspace.created:
+                raise ValueError(f'{old_id} does not exist')
+        self._queries.append(query)
+        answer = {}
+        for var in re.findall(r'\$(x\d+)', query):
+            self._keyspace.created.append(f'V{100 + len(self._keyspace.created)}')
+            answer[var] = SimpleNamespace(id=self._keyspace.created[-1])
+        return [answer]
+
+    def execute_batch(self, queries: List[str]) -> int:
+        for query in queries:
+            self.execute(query)
+        return 0
+
+    def commit(self) -> None:
+        if self._keyspace.fail_commits:
+            self._keyspace.fail_commits -= 1
+            raise ConnectionError('commit failed')
+        self._keyspace.committed += self._queries
+
+
+class FakeKeyspace:
+    """A client of a keyspace with the schema and instances above, which records the queries it commits"""
+
+    def __init__(self) -> None:
+        self.created: List[str] = []
+        self.committed: List[str] = []
+        self.fail_commits = 0
+        self.read: List[str] = []
+
+    def execute(self, query: str, **kwargs: Any) -> Any:
+        if query.startswith('define'):
+            self.committed.append(query)
+            return None
+        return [{var: {'id': label, 'label': label} for var, label in zip('xy', labels)}
+                for labels in schema_answers.get(query, [])]
+
+    def execute_iter(self, query: str, *, lazy: bool = False, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        self.read.append(query)
+        for concept_id in instances.get(query, []):
+            yield {'x': SimpleNamespace(id=concept_id) if lazy else {'id': concept_id, 'value': 'Alice'}}
+        for concept_id in relationships.get(query, []):
+            yield {'r': SimpleNamespace(id=concept_id)}
+        for owner, attribute in ownerships.get(query, []):
+            yield {'o': SimpleNamespace(id=owner), 'a': SimpleNamespace(id=attribute)}
+
+    def open(self, **kwargs: Any) -> FakeTx:
+        return FakeTx(self)
+
+
+def read_partition(directory: str, file: str) -> List[Dict[str, Any]]:
+    with gzip.open(os.path.join(directory, file), 'rt') as partition:
+        return [json.loads(line) for line in partition]
+
+
+class TestDump(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_reads_schema_as_define_query(self) -> None:
+        self.assertEqual(schema_query(read_schema(FakeKeyspace())), 'define\n'
+                                                                    'spouse sub role;\n'
+                                                                    'marriage sub relationship, relates spouse;\n'
+                                                                    'name sub attribute, datatype string;\n'
+                                                                    'person sub entity, plays spouse, has name;\n'
+                                                                    'employee sub person;\n')
+
+    def test_writes_instances_of_each_type_to_its_own_partition(self) -> None:
+        dump(FakeKeyspace(), self.directory, workers=2)
+
+        self.assertEqual(read_partition(self.directory, 'entity-person.ndjson.gz'), [{'id': 'V1'}, {'id': 'V2'}])
+        self.assertEqual(read_partition(self.directory, 'entity-employee.ndjson.gz'), [{'id': 'V3'}])
+        self.assertEqual(read_partition(self.directory, 'attribute-name.ndjson.gz'), [{'id': 'V4', 'value': 'Alice'}])
+        self.assertEqual(read_partition(self.directory, 'relationship-marriage.ndjson.gz'),
+                         [{'id': 'V5', 'roleplayers': [['spouse', 'V1'], ['spouse', 'V2']]}])
+        self.assertEqual(read_partition(self.directory, 'has-name.ndjson.gz'), [{'owner': 'V1', 'attribute': 'V4'}])
+
+        with open(os.path.join(self.directory, MANIFEST_FILE)) as manifest:
+            self.assertEqual(sum(partition['records'] for partition in json.load(manifest)['partitions']), 6)
+
+    def test_writes_each_relationship_once_its_role_players_are_read(self) -> None:
+        keyspace = FakeKeyspace()
+        with patch.dict(relationships, {'match $r isa! marriage; get;': ['V5', 'V6']}), \
+                patch.dict(role_players, {'match $r id V6; $r (spouse: $p); get;': ['V3']}):
+            records = _export_records(keyspace, read_schema(keyspace), Partition(RELATIONSHIP, 'marriage', ''), 10)
+
+            self.assertEqual(next(records), {'id': 'V5', 'roleplayers': [('spouse', 'V1'), ('spouse', 'V2')]})
+            self.assertNotIn('match $r id V6; $r (spouse: $p); get;', keyspace.read)
+            self.assertEqual(next(records), {'id': 'V6', 'roleplayers': [('spouse', 'V3')]})
+
+    def test_does_not_export_finished_partitions_again(self) -> None:
+        dump(FakeKeyspace(), self.directory)
+        with gzip.open(os.path.join(self.directory, 'entity-person.ndjson.gz'), 'wt') as partition:
+            partition.write('{"id":"V9"}\n')
+
+        partitions = dump(FakeKeyspace(), self.directory)
+
+        self.assertEqual(read_partition(self.directory, 'entity-person.ndjson.gz'), [{'id': 'V9'}])
+        self.assertIn(1, [partition.records for partition in partitions if partition.label == 'person'])
+
+
+class TestLoad(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        dump(FakeKeyspace(), self.directory)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_inserts_records_with_ids_of_new_keyspace(self) -> None:
+        keyspace = FakeKeyspace()
+        results = load(keyspace, self.directory, workers=1, batch_size=1)
+
+        self.assertEqual([result.error for result in results], [None] * 6)
+        self.assertTrue(keyspace.committed[0].startswith('define'))
+        self.assertIn('insert $x0 val "Alice" isa name;', keyspace.committed)
+        self.assertIn('match $m0 id V102; $m1 id V103; insert $x0 (spouse: $m0, spouse: $m1) isa marriage;',
+                      keyspace.committed)
+        self.assertEqual(keyspace.committed[-1], 'match $m0 id V102; $m1 id V100; insert $m0 has name $m1;')
+
+    def test_inserts_many_records_with_each_query(self) -> None:
+        keyspace = FakeKeyspace()
+        load(keyspace, self.directory, per_query=2)
+
+        self.assertIn('insert $x0 isa person; $x1 isa person;', keyspace.committed)
+
+    def test_resumes_from_batches_that_were_not_committed(self) -> None:
+        keyspace = FakeKeyspace()
+        keyspace.fail_commits = 1
+        results = load(keyspace, self.directory, workers=1, batch_size=1)
+        self.assertIsInstance(results[0].error, ConnectionError)
+
+        # the ownerships of the attribute in the failed batch cannot be loaded until it is
+        self.assertEqual(sum(1 for result in load(keyspace, self.directory) if result.error is None), 2)
+        self.assertEqual(load(keyspace, self.directory), [])
+        self.assertEqual(sum(1 for query in keyspace.committed if query.startswith('define')), 1)
@@ -0,0 +1,48 @@
+import unittest
+
+import grakn
+from tests.mock_engine import query, engine_responding_to_streaming_query, engine_responding_with_nothing, \
+    engine_responding_bad_request
+from tests.test_grakn import client, expected_response
+
+
+class TestExecuteAll(unittest.TestCase):
+    def test_valid_query_returns_expected_response(self) -> None:
+        with engine_responding_to_streaming_query():
+            outcomes = list(client().execute_all([query], concurrency=1))
+
+        self.assertEqual([outcome.result for outcome in outcomes], [expected_response])
+        self.assertIsNone(outcomes[0].error)
+
+    def test_returns_outcomes_in_input_order(self) -> None:
+        queries = [f'{query} # {i}' for i in range(10)]
+        with engine_responding_with_nothing():
+            outcomes = list(client().execute_all(queries, concurrency=3, max_in_flight=4))
+
+        self.assertEqual([outcome.query for outcome in outcomes], queries)
+
+    def test_returns_every_outcome_when_unordered(self) -> None:
+        with engine_responding_with_nothing():
+            outcomes = list(client().execute_all([query] * 10, concurrency=3, ordered=False))
+
+        self.assertEqual(sorted(outcome.index for outcome in outcomes), list(range(10)))
+
+    def test_returns_error_of_failed_query(self) -> None:
+        with engine_responding_bad_request():
+            outcome, = client().execute_all([query])
+
+        self.assertIsInstance(outcome.error, (grakn.GraknError, ConnectionError))
+
+    def test_reads_queries_only_when_there_is_room_in_flight(self) -> None:
+        read = []
+
+        def queries():
+            for i in range(10):
+                read.append(i)
+                yield query
+
+        with engine_responding_with_nothing():
+            outcomes = client().execute_all(queries(), concurrency=1, max_in_flight=2)
+            next(outcomes)
+            self.assertLessEqual(len(read), 3)
+            outcomes.close()
@@ -1,11 +1,19 @@
+import os
+import subprocess
+import sys
+import time
 import unittest
+from concurrent import futures
 
 import grakn
-from grakn_pb2 import TxRequest, Keyspace, Query, Open, Write, ExecQuery, \
+from grakn.instrumentation import Listener, Stats, TransactionEvent
+from grakn_pb2 import TxRequest, Keyspace, Query, Open, Read, Write, Batch, ExecQuery, \
     Commit
-from tests.mock_engine import query, engine_responding_to_streaming_query, \
+from iterator_pb2 import Stop
+from tests.mock_engine import query, ITERATOR_ID, engine_responding_to_streaming_query, \
     engine_responding_with_nothing, engine_responding_bad_request, error_message, engine_responding_to_void_query, \
-    engine_responding_to_single_answer_query
+    engine_responding_to_single_answer_query, engine_responding_with_repeated_concept, GrpcServer, \
+    MockGraknServicer, SyntheticAnswers, RESOLUTION_HEAVY
 
 expected_response = [
     {'x': {'id': 'a', 'label': 'concept'}},
@@ -26,9 +34,14 @@ class TestExecute(unittest.TestCase):
     def test_sends_open_request_with_keyspace(self) -> None:
         with engine_responding_to_streaming_query() as engine:
             client().execute(query)
-            expected_request = TxRequest(open=Open(keyspace=Keyspace(value=keyspace), txType=Write))
+            expected_request = TxRequest(open=Open(keyspace=Keyspace(value=keyspace), txType=Read))
             engine.verify(expected_request)
 
+    def test_opens_write_transaction_for_write_query(self) -> None:
+        with engine_responding_with_nothing() as engine:
+            client().execute('insert $x isa person;')
+            engine.verify(TxRequest(open=Open(keyspace=Keyspace(value=keyspace), txType=Write)))
+
     def test_sends_execute_query_request_with_parameters(self) -> None:
         with engine_responding_to_streaming_query() as engine:
             client().execute(query)
@@ -47,10 +60,15 @@ class TestExecute(unittest.TestCase):
 
     def test_sends_commit_request(self) -> None:
         with engine_responding_to_streaming_query() as engine:
-            client().execute(query)
+            client().execute(query, tx_type='write')
             expected = TxRequest(commit=Commit())
             engine.verify(expected)
 
+    def test_does_not_commit_read_query(self) -> None:
+        with engine_responding_to_streaming_query() as engine:
+            client().execute(query)
+            self.assertFalse(any(request.HasField('commit') for request in engine.requests))
+
     def test_completes_request(self) -> None:
         with engine_responding_to_streaming_query():
             client().execute(query)
@@ -81,6 +99,16 @@ class TestOpenTx(unittest.TestCase):
             tx.execute(query)
             tx.commit()
 
+    def test_sends_open_request_with_transaction_type(self) -> None:
+        with engine_responding_with_nothing() as engine, client().open(tx_type='batch'):
+            pass
+
+        engine.verify(lambda req: req.open.txType == Batch)
+
+    def test_throws_with_unknown_transaction_type(self) -> None:
+        with engine_responding_with_nothing(), self.assertRaises(ValueError):
+            client().open(tx_type='exclusive')
+
 
 class TestExecuteOnTx(unittest.TestCase):
     def test_valid_query_returns_expected_response(self) -> None:
@@ -95,6 +123,30 @@ class TestExecuteOnTx(unittest.TestCase):
         with engine_responding_to_void_query(), client().open() as tx:
             self.assertEqual(tx.execute(query), None)
 
+    def test_resolves_repeated_concept_once(self) -> None:
+        with engine_responding_with_repeated_concept(), client().open() as tx:
+            self.assertEqual(tx.execute(query), [{'x': {'id': 'a', 'label': 'concept'}}] * 2)
+
+    def test_resolves_concepts_after_receiving_all_answers(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            tx.execute(query)
+
+        requests = engine.requests
+        last_next = max(i for i, request in enumerate(requests) if request.HasField('next'))
+        first_concept_method = min(i for i, request in enumerate(requests) if request.HasField('runConceptMethod'))
+        self.assertLess(last_next, first_concept_method)
+
+    def test_sends_label_and_value_requests_before_reading_their_responses(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            exchanges = []
+            send, next_response = tx._send, tx._next_response
+            tx._send = lambda request: exchanges.append(request.HasField('runConceptMethod')) or send(request)
+            tx._next_response = lambda: exchanges.append(None) or next_response()
+            tx.execute(query)
+
+        # the requests for two labels and a value, then all their responses
+        self.assertEqual(exchanges[exchanges.index(True):], [True] * 3 + [None] * 3)
+
     def test_sends_execute_query_request_with_parameters(self) -> None:
         with engine_responding_to_streaming_query() as engine, client().open() as tx:
             tx.execute(query)
@@ -115,6 +167,302 @@ class TestExecuteOnTx(unittest.TestCase):
         engine.verify(lambda req: not req.execQuery.infer.value)
 
 
+class TestCompactExecuteOnTx(unittest.TestCase):
+    def test_valid_query_returns_answer_table(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            table = tx.execute(query, compact=True)
+
+        self.assertEqual(table.header, ('x',))
+        self.assertEqual([concept.id for concept in table.column('x')], ['a', 'b', 'c'])
+        self.assertEqual(table.to_dicts(), expected_response)
+
+    def test_repeated_concept_is_shared_between_rows(self) -> None:
+        with engine_responding_with_repeated_concept(), client().open() as tx:
+            table = tx.execute(query, compact=True)
+
+        self.assertIs(table[0][0], table[1][0])
+
+    def test_valid_query_with_one_result_returns_expected_response(self) -> None:
+        with engine_responding_to_single_answer_query(100), client().open() as tx:
+            self.assertEqual(tx.execute(query, compact=True), 100)
+
+    def test_valid_query_with_no_results_returns_expected_response(self) -> None:
+        with engine_responding_to_void_query(), client().open() as tx:
+            self.assertEqual(tx.execute(query, compact=True), None)
+
+
+class TestColumnarExecuteOnTx(unittest.TestCase):
+    def test_valid_query_returns_columns(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            columns = tx.execute_columns(query)
+
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.to_dict(), {
+            'x.id': ['a', 'b', 'c'],
+            'x.label': ['concept', None, 'resource'],
+            'x.value': [None, 100, None],
+        })
+
+    def test_valid_query_with_no_results_returns_no_columns(self) -> None:
+        with engine_responding_to_void_query(), client().open() as tx:
+            columns = tx.execute_columns(query)
+
+        self.assertEqual((len(columns), columns.to_dict()), (0, {}))
+
+
+class TestLazyExecuteOnTx(unittest.TestCase):
+    def test_does_not_fetch_labels_or_values_until_read(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            answers = tx.execute(query, lazy=True)
+
+        self.assertEqual([answer['x'].id for answer in answers], ['a', 'b', 'c'])
+        self.assertFalse(any(request.HasField('runConceptMethod') for request in engine.requests))
+
+    def test_fetches_every_unfetched_concept_on_first_read(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            answers = tx.execute(query, lazy=True)
+            self.assertEqual(answers[0]['x'].label, 'concept')
+            fetches = sum(request.HasField('runConceptMethod') for request in engine.requests)
+
+            self.assertEqual(answers[1]['x'].value, 100)
+            self.assertEqual(answers[2]['x'].label, 'resource')
+
+        self.assertEqual(fetches, 3)
+        self.assertEqual(sum(request.HasField('runConceptMethod') for request in engine.requests), 3)
+
+    def test_returns_answer_table_when_compact(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            table = tx.execute(query, compact=True, lazy=True)
+            self.assertEqual(table.to_dicts(), expected_response)
+
+    def test_yields_concepts_that_can_be_read_while_iterating(self) -> None:
+        with engine_responding_to_streaming_query():
+            answers = [{'x': answer['x'].to_dict()} for answer in client().execute_iter(query, lazy=True)]
+
+        self.assertEqual(answers, expected_response)
+
+    def test_cannot_fetch_after_transaction_closes(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            answers = tx.execute(query, lazy=True)
+
+        with self.assertRaises(grakn.GraknError):
+            answers[0]['x'].label
+
+
+class TestExecuteIterOnTx(unittest.TestCase):
+    def test_valid_query_yields_expected_response(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            self.assertEqual(list(tx.execute_iter(query)), expected_response)
+
+    def test_valid_query_with_pages_yields_expected_response(self) -> None:
+        with engine_responding_to_streaming_query(), client().open() as tx:
+            self.assertEqual(list(tx.execute_iter(query, page_size=2)), expected_response)
+
+    def test_valid_query_with_one_result_yields_expected_response(self) -> None:
+        with engine_responding_to_single_answer_query(100), client().open() as tx:
+            self.assertEqual(list(tx.execute_iter(query)), [100])
+
+    def test_valid_query_with_no_results_yields_nothing(self) -> None:
+        with engine_responding_to_void_query(), client().open() as tx:
+            self.assertEqual(list(tx.execute_iter(query)), [])
+
+    def test_sends_next_request_when_answer_is_consumed(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            results = tx.execute_iter(query)
+            next(results)
+            self.assertEqual(sum(1 for request in engine.requests if request.HasField('next')), 1)
+
+    def test_stops_iterator_when_closed_early(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            results = tx.execute_iter(query)
+            next(results)
+            results.close()
+
+        engine.verify(TxRequest(stop=Stop(iteratorId=ITERATOR_ID)))
+
+    def test_does_not_stop_exhausted_iterator(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            list(tx.execute_iter(query))
+
+        self.assertFalse(any(request.HasField('stop') for request in engine.requests))
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_valid_query_with_prefetch_returns_expected_response(self) -> None:
+        for prefetch in (2, 3, 10):
+            with self.subTest(prefetch=prefetch), engine_responding_to_streaming_query(), client().open() as tx:
+                self.assertEqual(tx.execute(query, prefetch=prefetch), expected_response)
+
+    def test_valid_query_with_prefetch_yields_expected_response(self) -> None:
+        for page_size in (1, 2, 10):
+            with self.subTest(page_size=page_size), engine_responding_to_streaming_query(), client().open() as tx:
+                self.assertEqual(list(tx.execute_iter(query, page_size=page_size, prefetch=2)), expected_response)
+
+    def test_sends_next_requests_ahead_of_consumed_answers(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            results = tx.execute_iter(query, prefetch=2)
+            next(results)
+            self.assertEqual(sum(1 for request in engine.requests if request.HasField('next')), 2)
+
+    def test_sends_next_request_as_each_answer_is_consumed(self) -> None:
+        servicer = MockGraknServicer(SyntheticAnswers())
+        server = GrpcServer(servicer)
+        try:
+            with client().open() as tx:
+                results = tx.execute_iter('match $x isa person; limit 10; get;', prefetch=2)
+                next(results)
+                next(results)
+                # the answers still in flight are received before the response to another query
+                self.assertEqual(len(tx.execute('match $x isa person; limit 3; get;')), 3)
+                self.assertEqual(sum(1 for _ in results), 8)
+        finally:
+            server.stop()
+
+        kinds = [request.WhichOneof('request') for request in servicer.requests]
+        second_query = kinds.index('execQuery', kinds.index('execQuery') + 1)
+        self.assertEqual(kinds[:second_query].count('next'), 3)
+
+    def test_iterators_of_transaction_can_be_consumed_together(self) -> None:
+        server = GrpcServer(MockGraknServicer(SyntheticAnswers()))
+        try:
+            with client().open() as tx:
+                first = tx.execute_iter('match $x isa person; limit 5; get;', prefetch=3)
+                second = tx.execute_iter('match $x isa person; limit 5; get;', prefetch=3)
+                pairs = list(zip(first, second))
+        finally:
+            server.stop()
+
+        self.assertEqual(len(pairs), 5)
+        self.assertEqual(len({answer['x']['id'] for pair in pairs for answer in pair}), 10)
+
+    def test_uses_prefetch_of_client(self) -> None:
+        with engine_responding_to_streaming_query() as engine:
+            self.assertEqual(client(prefetch=10).execute(query), expected_response)
+            self.assertGreaterEqual(sum(1 for request in engine.requests if request.HasField('next')), 10)
+
+
+class TestExecuteIter(unittest.TestCase):
+    def test_valid_query_yields_expected_response(self) -> None:
+        with engine_responding_to_streaming_query():
+            self.assertEqual(list(client().execute_iter(query)), expected_response)
+
+    def test_sends_commit_request_when_exhausted(self) -> None:
+        with engine_responding_to_streaming_query() as engine:
+            list(client().execute_iter(query, tx_type='write'))
+            engine.verify(TxRequest(commit=Commit()))
+
+
+class TestLabelCache(unittest.TestCase):
+    def test_labels_are_cached_within_transaction(self) -> None:
+        with engine_responding_to_streaming_query(times=2), client().open() as tx:
+            tx.execute(query)
+            self.assertEqual(tx.execute(query), expected_response)
+            self.assertEqual(tx.label_cache.hits, 2)
+
+    def test_labels_are_not_shared_between_transactions_by_default(self) -> None:
+        with engine_responding_to_streaming_query(times=2):
+            grakn_client = client()
+            grakn_client.execute(query)
+            self.assertIsNone(grakn_client.label_cache)
+            self.assertNotEqual(grakn_client.execute(query), expected_response)
+
+    def test_labels_are_shared_between_transactions_of_client(self) -> None:
+        with engine_responding_to_streaming_query(times=2):
+            grakn_client = client(label_cache_size=10)
+            grakn_client.execute(query)
+            self.assertEqual(grakn_client.execute(query), expected_response)
+            self.assertEqual(grakn_client.label_cache.hits, 2)
+
+    def test_shared_labels_are_invalidated_by_committing_schema_change(self) -> None:
+        with engine_responding_with_nothing():
+            grakn_client = client(label_cache_size=10)
+            grakn_client.label_cache.put('a', 'concept')
+            grakn_client.execute('define person sub entity;')
+            self.assertEqual(len(grakn_client.label_cache), 0)
+
+    def test_shared_labels_are_kept_after_data_change(self) -> None:
+        with engine_responding_with_nothing():
+            grakn_client = client(label_cache_size=10)
+            grakn_client.label_cache.put('a', 'concept')
+            grakn_client.execute('insert $x isa person;')
+            self.assertEqual(len(grakn_client.label_cache), 1)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_results_are_not_cached_by_default(self) -> None:
+        with engine_responding_to_streaming_query():
+            grakn_client = client()
+            grakn_client.execute(query)
+            self.assertIsNone(grakn_client.result_cache)
+
+    def test_repeated_query_returns_cached_result(self) -> None:
+        with engine_responding_to_streaming_query():
+            grakn_client = client(result_cache_size=10)
+            grakn_client.execute(query)
+            self.assertEqual(grakn_client.execute(query), expected_response)
+            self.assertEqual((grakn_client.result_cache.hits, grakn_client.result_cache.misses), (1, 1))
+
+    def test_results_are_cached_per_inference_setting(self) -> None:
+        with engine_responding_to_streaming_query():
+            grakn_client = client(result_cache_size=10)
+            grakn_client.execute(query)
+            self.assertIsNone(grakn_client.execute(query, infer=True))
+
+    def test_cache_can_be_bypassed(self) -> None:
+        with engine_responding_to_streaming_query():
+            grakn_client = client(result_cache_size=10)
+            grakn_client.execute(query)
+            self.assertIsNone(grakn_client.execute(query, cache=False))
+
+    def test_write_queries_are_not_cached(self) -> None:
+        with engine_responding_with_nothing():
+            grakn_client = client(result_cache_size=10)
+            grakn_client.execute('insert $x isa person;')
+            self.assertEqual(len(grakn_client.result_cache), 0)
+
+    def test_results_are_invalidated_by_committing_write(self) -> None:
+        with engine_responding_to_streaming_query():
+            grakn_client = client(result_cache_size=10)
+            grakn_client.execute(query)
+            with grakn_client.open() as tx:
+                tx.execute('match $x isa person; delete $x;')
+                tx.commit()
+            self.assertEqual(len(grakn_client.result_cache), 0)
+
+    def test_results_are_kept_when_write_is_not_committed(self) -> None:
+        with engine_responding_to_streaming_query():
+            grakn_client = client(result_cache_size=10)
+            grakn_client.execute(query)
+            with grakn_client.open() as tx:
+                tx.execute('insert $x isa person;')
+            self.assertEqual(len(grakn_client.result_cache), 1)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_listener_receives_event_for_each_stage(self) -> None:
+        stats = Stats()
+        with engine_responding_to_streaming_query():
+            client(listener=stats).execute(query)
+
+        self.assertEqual(set(stats.summary()), {'open', 'execQuery', 'next', 'getLabel', 'getValue', 'parse'})
+        self.assertEqual(stats.summary()['next']['count'], 4)
+        self.assertGreater(stats.summary()['execQuery']['request_bytes'], len(query))
+
+    def test_listener_receives_totals_of_transaction(self) -> None:
+        transactions = []
+
+        class Recorder(Listener):
+            def on_transaction(self, event: TransactionEvent) -> None:
+                transactions.append(event)
+
+        with engine_responding_to_streaming_query() as engine:
+            client(listener=Recorder()).execute(query)
+
+        [transaction] = transactions
+        self.assertEqual((transaction.keyspace, transaction.tx_type), (keyspace, 'read'))
+        self.assertEqual(transaction.round_trips, len(engine.requests))
+
+
 class TestCommit(unittest.TestCase):
     def test_sends_commit_request(self) -> None:
         with engine_responding_to_streaming_query() as engine, client().open() as tx:
@@ -124,6 +472,88 @@ class TestCommit(unittest.TestCase):
         expected = TxRequest(commit=Commit())
         engine.verify(expected)
 
+    def test_does_not_send_commit_request_in_read_transaction(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open(tx_type='read') as tx:
+            tx.execute(query)
+            tx.commit()
+
+        self.assertFalse(any(request.HasField('commit') for request in engine.requests))
+
+
+class TestMultiplexedTx(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = GrpcServer(MockGraknServicer(SyntheticAnswers(RESOLUTION_HEAVY), latency=0.005))
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_threads_receive_answers_to_their_own_queries(self) -> None:
+        limits = range(1, 17)
+
+        with client().open(multiplexed=True) as tx, futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda limit: tx.execute(f'match $x isa person; limit {limit}; get;'), limits))
+
+        self.assertEqual([len(answers) for answers in results], list(limits))
+        self.assertTrue(all(answer['t']['label'] == f'label-{answer["t"]["id"]}'
+                            for answers in results for answer in answers))
+        self.assertEqual(len(self.server.streams), 1)
+
+    def test_threads_iterate_and_fetch_lazy_concepts_at_once(self) -> None:
+        def labels(limit: int) -> list:
+            return [answer['t'].label for answer in tx.execute_iter(f'match $x isa person; limit {limit}; get;',
+                                                                    page_size=2, lazy=True)]
+
+        with client().open(multiplexed=True) as tx, futures.ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(labels, [5] * 8))
+
+        self.assertEqual([len(result) for result in results], [5] * 8)
+        self.assertTrue(all(label.startswith('label-T') for result in results for label in result))
+
+    def test_fails_queries_after_transaction_closes(self) -> None:
+        with client().open(multiplexed=True) as tx:
+            tx.execute('match $x isa person; limit 1; get;')
+
+        with self.assertRaises(grakn.GraknError):
+            tx.execute('match $x isa person; limit 1; get;')
+
+
+class TestMultiplexedTxErrors(unittest.TestCase):
+    def test_fails_every_query_after_server_error(self) -> None:
+        # the mock engine cannot send the error type, so its errors are raised as connection errors
+        with engine_responding_bad_request(), client().open(multiplexed=True) as tx:
+            with self.assertRaises(ConnectionError):
+                tx.execute(query)
+            with self.assertRaises(ConnectionError):
+                tx.execute(query)
+
+
+class TestLazyConnect(unittest.TestCase):
+    def test_does_not_wait_for_connection(self) -> None:
+        start = time.monotonic()
+        grakn.Client(uri=mock_uri_to_no_server, keyspace=keyspace, timeout=5, lazy_connect=True)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_first_transaction_waits_for_connection(self) -> None:
+        with engine_responding_to_streaming_query():
+            self.assertEqual(client(lazy_connect=True).execute(query), expected_response)
+
+    def test_throws_without_server(self) -> None:
+        client_to_no_server = grakn.Client(uri=mock_uri_to_no_server, keyspace=keyspace, timeout=0, lazy_connect=True)
+        with self.assertRaises(ConnectionError):
+            client_to_no_server.execute(query)
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_importing_package_does_not_load_grpc(self) -> None:
+        code = 'import sys, grakn; assert "grpc" not in sys.modules; grakn.Client; assert "grpc" in sys.modules'
+        environment = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+        subprocess.run([sys.executable, '-c', code], env=environment, check=True)
+
+    def test_submodules_are_imported_on_first_use(self) -> None:
+        code = 'import sys, grakn; assert "grakn.client" not in sys.modules; grakn.client.Client; grakn.dump.dump'
+        environment = {**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)}
+        subprocess.run([sys.executable, '-c', code], env=environment, check=True)
+
 
-def client() -> grakn.Client:
-    return grakn.Client(uri=mock_uri, keyspace=keyspace, timeout=5)
+def client(**kwargs) -> grakn.Client:
+    return grakn.Client(uri=mock_uri, keyspace=keyspace, timeout=5, **kwargs)
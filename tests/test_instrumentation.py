@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from grakn.instrumentation import Event, Stats, TransactionEvent
+
+
+class TestStats(unittest.TestCase):
+    def test_aggregates_events_by_stage(self) -> None:
+        stats = Stats()
+        stats.on_event(Event('next', 0.5, 10, 20))
+        stats.on_event(Event('next', 1.5, 10, 30))
+
+        summary = stats.summary()['next']
+        self.assertEqual((summary['count'], summary['seconds'], summary['mean']), (2, 2.0, 1.0))
+        self.assertEqual((summary['request_bytes'], summary['response_bytes']), (20, 50))
+
+    def test_percentiles_of_latency(self) -> None:
+        stats = Stats()
+        for millis in range(1, 101):
+            stats.on_event(Event('next', millis / 1000, 0, 0))
+
+        self.assertEqual(stats.percentile('next', 50), 0.051)
+        self.assertEqual(stats.percentile('next', 100), 0.1)
+        self.assertIsNone(stats.percentile('commit', 50))
+
+    def test_keeps_bounded_sample(self) -> None:
+        stats = Stats(samples=10)
+        for _ in range(1000):
+            stats.on_event(Event('next', 1.0, 0, 0))
+
+        self.assertEqual(len(stats._stages['next'].samples), 10)
+        self.assertEqual(stats.summary()['next']['count'], 1000)
+
+    def test_counts_transactions_and_round_trips(self) -> None:
+        stats = Stats()
+        stats.on_transaction(TransactionEvent('keyspace', 'read', 1.0, {'open': 1, 'execQuery': 1}, 0, 0, 0.0))
+        self.assertEqual((stats.transactions, stats.round_trips), (1, 2))
+
+    def test_reset_forgets_events(self) -> None:
+        stats = Stats()
+        stats.on_event(Event('next', 1.0, 0, 0))
+        stats.reset()
+        self.assertEqual(stats.summary(), {})
+
+    def test_summarises_while_events_are_reset(self) -> None:
+        stats = Stats()
+        done = threading.Event()
+
+        def record() -> None:
+            while not done.is_set():
+                for stage in ('open', 'next', 'commit'):
+                    stats.on_event(Event(stage, 1.0, 0, 0))
+                stats.reset()
+
+        thread = threading.Thread(target=record)
+        thread.start()
+        try:
+            for _ in range(10000):
+                for summary in stats.summary().values():
+                    self.assertEqual(summary['p50'], 1.0)
+        finally:
+            done.set()
+            thread.join()
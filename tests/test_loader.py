@@ -0,0 +1,54 @@
+import unittest
+
+import grakn
+from grakn_pb2 import TxRequest, Commit
+from tests.mock_engine import query, NEXT, engine_responding_to_streaming_query, engine_responding_with_nothing, \
+    engine_responding_bad_request
+from tests.test_grakn import client
+
+
+class TestExecuteBatchOnTx(unittest.TestCase):
+    def test_exhausts_iterators_of_all_queries(self) -> None:
+        with engine_responding_to_streaming_query() as engine, client().open() as tx:
+            self.assertEqual(tx.execute_batch([query, query]), 3)
+
+        engine.verify(NEXT)
+
+    def test_sends_every_query_before_receiving_responses(self) -> None:
+        with engine_responding_with_nothing() as engine, client().open() as tx:
+            self.assertEqual(tx.execute_batch([query] * 3), 0)
+
+        self.assertEqual(sum(1 for request in engine.requests if request.HasField('execQuery')), 3)
+
+
+class TestLoad(unittest.TestCase):
+    def test_loads_queries_in_batches(self) -> None:
+        with engine_responding_with_nothing():
+            report = client().load([query] * 10, batch_size=3, concurrency=2)
+
+        self.assertEqual([batch.size for batch in report.batches], [3, 3, 3, 1])
+        self.assertEqual(report.loaded, 10)
+        self.assertEqual(report.failed, [])
+
+    def test_commits_each_batch(self) -> None:
+        with engine_responding_to_streaming_query() as engine:
+            report = client().load([query])
+            engine.verify(TxRequest(commit=Commit()))
+
+        self.assertEqual(report.batches[0].answers, 3)
+
+    def test_reports_each_batch_as_it_finishes(self) -> None:
+        reported = []
+        with engine_responding_with_nothing():
+            client().load([query] * 4, batch_size=2, on_batch=reported.append)
+
+        self.assertEqual(sorted(batch.index for batch in reported), [0, 1])
+
+    def test_reports_failed_batch_with_its_queries(self) -> None:
+        with engine_responding_bad_request():
+            report = client().load([query], batch_size=1)
+
+        self.assertEqual(report.loaded, 0)
+        self.assertEqual(len(report.failed), 1)
+        self.assertIsInstance(report.failed[0].error, (grakn.GraknError, ConnectionError))
+        self.assertEqual(report.failed[0].failed_queries, [query])
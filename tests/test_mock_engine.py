@@ -0,0 +1,53 @@
+import unittest
+
+import grakn
+from grakn_pb2 import TxRequest, TxResponse, Commit, ExecQuery, Query, QueryResult
+from tests.mock_engine import DONE, NEXT, MockResponse, MockGraknServicer, GrpcServer, SyntheticAnswers, \
+    RESOLUTION_HEAVY, eq, exec_query, _Script, engine_responding_with_nothing
+from tests.test_grakn import client, mock_uri, keyspace
+
+
+class TestScript(unittest.TestCase):
+    def test_uses_each_response_once_in_order(self) -> None:
+        first = TxResponse(queryResult=QueryResult(otherResult='1'))
+        second = TxResponse(queryResult=QueryResult(otherResult='2'))
+        script = _Script([MockResponse(eq(NEXT), first), MockResponse(eq(NEXT), second)])
+
+        self.assertEqual([script.take(NEXT), script.take(NEXT), script.take(NEXT)], [first, second, None])
+
+    def test_prefers_earlier_response_whether_or_not_it_is_indexed(self) -> None:
+        first = TxResponse(queryResult=QueryResult(otherResult='1'))
+        script = _Script([MockResponse(lambda request: request.HasField('next'), first), MockResponse(eq(NEXT), DONE)])
+
+        self.assertEqual([script.take(NEXT), script.take(NEXT)], [first, DONE])
+
+    def test_finds_response_by_query(self) -> None:
+        answer = TxResponse(queryResult=QueryResult(otherResult='1'))
+        request = TxRequest(execQuery=ExecQuery(query=Query(value='match $x; get;')))
+        script = _Script([MockResponse(exec_query('match $y; get;'), DONE),
+                          MockResponse(exec_query('match $x; get;'), answer)])
+
+        self.assertEqual(script.take(request), answer)
+
+
+class TestMockEngine(unittest.TestCase):
+    def test_records_requests_of_each_stream(self) -> None:
+        with engine_responding_with_nothing() as engine:
+            grakn_client = client()
+            with grakn_client.open(), grakn_client.open() as tx:
+                tx.commit()
+
+            self.assertEqual(len(engine.streams), 2)
+            engine.verify(TxRequest(commit=Commit()))
+
+    def test_synthetic_answers_stream_limit_of_query(self) -> None:
+        server = GrpcServer(MockGraknServicer(SyntheticAnswers(RESOLUTION_HEAVY), record=False))
+        try:
+            grakn_client = grakn.Client(uri=mock_uri, keyspace=keyspace, timeout=5)
+            answers = grakn_client.execute('match $x isa person; limit 5; get;')
+        finally:
+            server.stop()
+
+        self.assertEqual(len(answers), 5)
+        self.assertEqual(answers[0]['t']['label'], 'label-T0')
+        self.assertEqual(answers[0]['n']['value'], 'value-N0')
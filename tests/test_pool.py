@@ -0,0 +1,134 @@
+import contextlib
+import time
+import unittest
+from typing import Any
+
+import grakn
+import grakn.pool
+from grakn.pool import _PooledChannel
+from grakn_pb2 import Write
+from tests.mock_engine import query, engine_responding_to_streaming_query, engine_responding_with_nothing, \
+    MockEngine, GrpcServer, MockGraknServicer, SyntheticAnswers
+from tests.test_grakn import expected_response, mock_uri, keyspace
+
+read_query: str = 'match $x isa person; limit 2; get;'
+
+
+class TestClientPool(unittest.TestCase):
+    def test_valid_query_returns_expected_response(self) -> None:
+        with engine_responding_to_streaming_query(), pool() as client_pool:
+            self.assertEqual(client_pool.execute(query), expected_response)
+
+    def test_iterates_over_results_of_valid_query(self) -> None:
+        with engine_responding_to_streaming_query(), pool() as client_pool:
+            self.assertEqual(list(client_pool.execute_iter(query)), expected_response)
+
+    def test_valid_query_on_warm_transaction_returns_expected_response(self) -> None:
+        with engine_responding_to_streaming_query(), pool(warm=1) as client_pool:
+            self.assertEqual(client_pool.warm_transactions, 1)
+            self.assertEqual(client_pool.execute(query), expected_response)
+
+    def test_executes_read_query_on_warm_transaction(self) -> None:
+        with engine_responding_with_nothing() as engine, pool(warm=2) as client_pool:
+            client_pool.execute('match $x isa person; get;')
+
+        self.assertIn(query_stream(engine, 'match $x isa person; get;'), [0, 1])
+
+    def test_opens_warm_transactions_of_warm_tx_type(self) -> None:
+        with engine_responding_with_nothing() as engine, pool(warm=1, warm_tx_type='write') as client_pool:
+            client_pool.execute('insert $x isa person;')
+
+        self.assertEqual(engine.streams[0][0].open.txType, Write)
+        self.assertEqual(query_stream(engine, 'insert $x isa person;'), 0)
+
+    def test_opens_warm_transactions_up_to_max_size(self) -> None:
+        with engine_responding_with_nothing(), pool(max_size=2, warm=2) as client_pool:
+            self.assertEqual(client_pool.warm_transactions, 2)
+
+    def test_rejects_more_warm_transactions_than_max_size(self) -> None:
+        with engine_responding_with_nothing(), self.assertRaises(ValueError):
+            pool(max_size=1, warm=2)
+
+    def test_throws_when_no_transaction_is_released(self) -> None:
+        with engine_responding_with_nothing(), pool(max_size=1, acquire_timeout=0.1) as client_pool, client_pool.open():
+            with self.assertRaises(TimeoutError):
+                client_pool.open()
+
+    def test_evicts_idle_warm_transactions(self) -> None:
+        with engine_responding_with_nothing(), pool(warm=2, idle_timeout=0) as client_pool:
+            self.assertEqual(client_pool.evict_idle(), 2)
+            self.assertEqual(client_pool.warm_transactions, 0)
+
+    def test_does_not_use_warm_transaction_near_its_deadline(self) -> None:
+        with engine_responding_with_nothing() as engine, pool(timeout=1, warm=1) as client_pool:
+            time.sleep(1.2)
+            client_pool.execute('match $x isa person; get;')
+
+        self.assertEqual(query_stream(engine, 'match $x isa person; get;'), 1)
+
+    def test_rejects_idle_timeout_not_less_than_timeout(self) -> None:
+        with engine_responding_with_nothing(), self.assertRaises(ValueError):
+            pool(timeout=5, idle_timeout=5)
+
+    def test_puts_channels_back_into_rotation_once_they_recover(self) -> None:
+        server = GrpcServer(MockGraknServicer(SyntheticAnswers()))
+        with pool(channels=1, timeout=2, probe_interval=0) as client_pool:
+            server.stop()
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    client_pool.execute(read_query)
+
+            server = GrpcServer(MockGraknServicer(SyntheticAnswers()))
+            try:
+                deadline = time.monotonic() + 5
+                while not client_pool._channels[0].healthy and time.monotonic() < deadline:
+                    with contextlib.suppress(ConnectionError):
+                        client_pool.execute(read_query)
+                    time.sleep(0.05)
+
+                self.assertEqual(len(client_pool.execute(read_query)), 2)
+            finally:
+                server.stop()
+
+    def test_reports_healthy_channels(self) -> None:
+        with engine_responding_with_nothing(), pool(channels=3) as client_pool:
+            self.assertEqual(client_pool.check_health(), 3)
+
+    def test_closes_connected_channels_when_another_fails_to_connect(self) -> None:
+        connected = []
+
+        class SecondChannelFails(_PooledChannel):
+            def __init__(self, *args: Any) -> None:
+                if connected:
+                    raise ConnectionError()
+                super().__init__(*args)
+                self.closed = False
+                connected.append(self)
+
+            def close(self) -> None:
+                self.closed = True
+                super().close()
+
+        grakn.pool._PooledChannel = SecondChannelFails
+        try:
+            with engine_responding_with_nothing(), self.assertRaises(ConnectionError):
+                pool(channels=2)
+        finally:
+            grakn.pool._PooledChannel = _PooledChannel
+
+        self.assertEqual([channel.closed for channel in connected], [True])
+
+    def test_throws_without_server(self) -> None:
+        with self.assertRaises(ConnectionError):
+            grakn.ClientPool(uri='localhost:9999', keyspace=keyspace, timeout=0)
+
+
+def query_stream(engine: MockEngine, query_string: str) -> int:
+    """Return the index of the stream a query was executed on, in the order the streams were opened"""
+    return next(i for i, stream in enumerate(engine.streams)
+                if any(request.execQuery.query.value == query_string for request in stream))
+
+
+def pool(**kwargs) -> grakn.ClientPool:
+    kwargs.setdefault('timeout', 5)
+    return grakn.ClientPool(uri=mock_uri, keyspace=keyspace, **kwargs)
@@ -0,0 +1,151 @@
+import unittest
+from typing import Any, List
+
+import grakn
+from grakn.retry import RetryPolicy, run_in_transaction
+from tests.mock_engine import engine_responding_to_streaming_query, query
+
+mock_uri: str = 'localhost:48556'
+keyspace: str = 'somesortofkeyspace'
+
+
+def policy(attempts: int = 3) -> RetryPolicy:
+    return RetryPolicy(attempts, initial_backoff=0, connect_timeout=0.1)
+
+
+class _FakeTx:
+    def __init__(self, tx_type: str, fail_on_commit: bool) -> None:
+        self.tx_type = tx_type
+        self._fail_on_commit = fail_on_commit
+
+    def commit(self) -> None:
+        if self._fail_on_commit:
+            raise ConnectionError
+
+
+class _FakeTxContext:
+    def __init__(self, tx: _FakeTx) -> None:
+        self._tx = tx
+
+    def __enter__(self) -> _FakeTx:
+        return self._tx
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_returns_result_of_operation(self) -> None:
+        retry = policy()
+        self.assertEqual(retry.run(lambda: 'result'), 'result')
+        self.assertEqual((retry.calls, retry.retries, retry.failures), (1, 0, 0))
+
+    def test_retries_until_operation_succeeds(self) -> None:
+        outcomes: List[Any] = [ConnectionError(), ConnectionError(), 'result']
+
+        def operation() -> str:
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        retry = policy()
+        self.assertEqual(retry.run(operation), 'result')
+        self.assertEqual((retry.retries, retry.failures), (2, 0))
+
+    def test_raises_once_attempts_are_used_up(self) -> None:
+        attempts = []
+
+        def operation() -> None:
+            attempts.append(None)
+            raise ConnectionError
+
+        retry = policy(attempts=3)
+        with self.assertRaises(ConnectionError):
+            retry.run(operation)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual((retry.retries, retry.failures), (2, 1))
+
+    def test_does_not_retry_grakn_error(self) -> None:
+        retry = policy()
+
+        def operation() -> None:
+            raise grakn.GraknError('invalid query')
+
+        with self.assertRaises(grakn.GraknError):
+            retry.run(operation)
+        self.assertEqual(retry.retries, 0)
+
+    def test_does_not_retry_error_that_is_not_retryable(self) -> None:
+        retry = policy()
+
+        def operation() -> None:
+            raise ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            retry.run(operation, retryable=lambda e: False)
+        self.assertEqual((retry.retries, retry.failures), (0, 1))
+
+    def test_calls_hook_before_each_retry(self) -> None:
+        retry = policy(attempts=3)
+        hooks = []
+
+        def operation() -> None:
+            raise ConnectionError
+
+        with self.assertRaises(ConnectionError):
+            retry.run(operation, before_retry=lambda: hooks.append(None))
+        self.assertEqual(len(hooks), 2)
+
+    def test_backoff_is_bounded(self) -> None:
+        retry = RetryPolicy(initial_backoff=0.1, max_backoff=1, multiplier=2)
+        for attempt in range(10):
+            self.assertTrue(0 <= retry.backoff(attempt) <= min(1, 0.1 * 2 ** attempt))
+
+    def test_needs_an_attempt(self) -> None:
+        with self.assertRaises(ValueError):
+            RetryPolicy(attempts=0)
+
+
+class TestRunInTransaction(unittest.TestCase):
+    def test_retries_write_that_failed_before_commit(self) -> None:
+        attempts = []
+
+        def operation(tx: _FakeTx) -> str:
+            attempts.append(None)
+            if len(attempts) == 1:
+                raise ConnectionError
+            return 'result'
+
+        result = run_in_transaction(policy(), lambda: _FakeTxContext(_FakeTx('write', False)), operation)
+        self.assertEqual(result, 'result')
+        self.assertEqual(len(attempts), 2)
+
+    def test_does_not_retry_write_that_failed_during_commit(self) -> None:
+        retry = policy()
+        with self.assertRaises(ConnectionError):
+            run_in_transaction(retry, lambda: _FakeTxContext(_FakeTx('write', True)), lambda tx: 'result')
+        self.assertEqual(retry.retries, 0)
+
+    def test_retries_read_that_failed_at_any_point(self) -> None:
+        retry = policy(attempts=2)
+        with self.assertRaises(ConnectionError):
+            run_in_transaction(retry, lambda: _FakeTxContext(_FakeTx('read', True)), lambda tx: 'result')
+        self.assertEqual(retry.retries, 1)
+
+
+class TestClientRetry(unittest.TestCase):
+    def test_executes_query_with_retry_policy(self) -> None:
+        with engine_responding_to_streaming_query():
+            client = grakn.Client(uri=mock_uri, keyspace=keyspace, retry=policy())
+            self.assertEqual(len(client.execute(query)), 3)
+        self.assertEqual((client.retry.calls, client.retry.retries), (1, 0))
+
+    def test_reconnects_before_retrying_after_server_stops(self) -> None:
+        with engine_responding_to_streaming_query():
+            client = grakn.Client(uri=mock_uri, keyspace=keyspace, timeout=2, retry=policy(attempts=3))
+
+        with self.assertRaises(ConnectionError):
+            client.execute(query)
+
+        self.assertEqual((client.retry.retries, client.retry.failures, client.retry.reconnects), (2, 1, 2))
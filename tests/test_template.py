@@ -0,0 +1,73 @@
+import datetime
+import unittest
+
+from grakn.template import Template, literal
+
+
+class TestLiteral(unittest.TestCase):
+    def test_strings_are_quoted_and_escaped(self) -> None:
+        self.assertEqual(literal('say "hi" \\o/'), '"say \\"hi\\" \\\\o/"')
+
+    def test_values_are_written_with_their_datatype(self) -> None:
+        self.assertEqual(literal(True), 'true')
+        self.assertEqual(literal(42), '42')
+        self.assertEqual(literal(2.5), '2.5')
+        self.assertEqual(literal(datetime.date(2018, 1, 2)), '2018-01-02')
+        self.assertEqual(literal(datetime.datetime(2018, 1, 2, 3, 4, 5, 6000)), '2018-01-02T03:04:05.006')
+
+    def test_doubles_are_written_without_exponent(self) -> None:
+        self.assertEqual(literal(1e16), '10000000000000000.0')
+        self.assertEqual(literal(2.5e-7), '0.00000025')
+        self.assertEqual(literal(-3.0), '-3.0')
+
+    def test_datetimes_with_timezone_are_written_in_utc(self) -> None:
+        offset = datetime.timezone(datetime.timedelta(hours=2))
+        self.assertEqual(literal(datetime.datetime(2018, 1, 2, 3, 4, 5, tzinfo=offset)), '2018-01-02T01:04:05.000')
+
+    def test_throws_with_value_without_datatype(self) -> None:
+        with self.assertRaises(TypeError):
+            literal(None)
+
+        with self.assertRaises(ValueError):
+            literal(float('nan'))
+
+
+class TestTemplate(unittest.TestCase):
+    template = Template('insert $p isa person, has name <name>, has age <age>;')
+
+    def test_finds_parameters(self) -> None:
+        self.assertEqual(self.template.parameters, ('name', 'age'))
+
+    def test_renders_bound_values(self) -> None:
+        self.assertEqual(self.template.render(name='Bob "B"', age=30),
+                         'insert $p isa person, has name "Bob \\"B\\"", has age 30;')
+
+    def test_throws_with_missing_value(self) -> None:
+        with self.assertRaises(KeyError):
+            self.template.render(name='Bob')
+
+    def test_renders_query_for_each_row(self) -> None:
+        queries = self.template.render_all([{'name': 'a', 'age': 1}, {'name': 'b', 'age': 2}])
+        self.assertEqual(list(queries), ['insert $p isa person, has name "a", has age 1;',
+                                         'insert $p isa person, has name "b", has age 2;'])
+
+    def test_coalesces_rows_with_variables_renamed_apart(self) -> None:
+        rows = [{'name': name, 'age': 1} for name in 'abc']
+        queries = list(self.template.render_all(rows, per_query=2))
+
+        self.assertEqual(queries, [
+            'insert $p isa person, has name "a", has age 1; $p-1 isa person, has name "b", has age 1;',
+            'insert $p isa person, has name "c", has age 1;'
+        ])
+
+    def test_leaves_variables_and_parameters_in_strings_as_they_are(self) -> None:
+        template = Template('insert $p isa product, has sku "$12", has note \'<b>\', has name <name>;')
+        queries = list(template.render_all([{'name': 'a'}, {'name': 'b'}], per_query=2))
+
+        self.assertEqual(template.parameters, ('name',))
+        self.assertEqual(queries, ['insert $p isa product, has sku "$12", has note \'<b>\', has name "a"; '
+                                   '$p-1 isa product, has sku "$12", has note \'<b>\', has name "b";'])
+
+    def test_only_coalesces_insert_queries(self) -> None:
+        with self.assertRaises(ValueError):
+            Template('match $p has name <name>; get;').render_all([], per_query=2)